@@ -4,11 +4,13 @@ This file contains celery tasks for contentstore views
 
 import asyncio
 import base64
+import hashlib
 import json
 import os
 import re
 import shutil
 import tarfile
+import time
 from datetime import datetime, timezone
 from importlib.metadata import entry_points
 from tempfile import NamedTemporaryFile, mkdtemp
@@ -20,6 +22,7 @@ from celery import shared_task
 from celery.utils.log import get_task_logger
 from django.conf import settings
 from django.contrib.auth import get_user_model
+from django.core.cache import cache
 from django.core.exceptions import SuspiciousOperation
 from django.core.files import File
 from django.test import RequestFactory
@@ -58,7 +61,6 @@ from cms.djangoapps.contentstore.utils import (
     reverse_usage_url,
     translation_language,
 )
-from cms.djangoapps.contentstore.xblock_storage_handlers.view_handlers import get_block_info
 from cms.djangoapps.models.settings.course_metadata import CourseMetadata
 from common.djangoapps.course_action_state.models import CourseRerunState
 from common.djangoapps.static_replace import replace_static_urls
@@ -95,6 +97,11 @@ User = get_user_model()
 LOGGER = get_task_logger(__name__)
 FILE_READ_CHUNK = 1024  # bytes
 FULL_COURSE_REINDEX_THRESHOLD = 1
+# Maximum number of connections opened by a link check, in total and to each host.
+LINK_CHECK_MAX_CONNECTIONS = 100
+LINK_CHECK_MAX_CONNECTIONS_PER_HOST = 10
+LINK_CHECK_BLOCK_URLS_CACHE_KEY = 'contentstore.link_check.block_urls.{}'
+LINK_CHECK_URL_STATUS_CACHE_KEY = 'contentstore.link_check.url_status.{}'
 ALL_ALLOWED_XBLOCKS = frozenset(
     [entry_point.name for entry_point in entry_points(group="xblock.v1")]
 )
@@ -673,12 +680,16 @@ def import_olx(self, user_id, course_key_string, archive_path, archive_name, lan
         self.status.increment_completed_steps()
         LOGGER.info(f'{log_prefix}: Uploaded file extracted. Verification step started')
 
+        # Seconds spent in each stage of the import, reported as an artifact of the task.
+        stage_timings = {}
+        verify_start = time.monotonic()
         dirpath = verify_root_name_exists(course_dir, root_name)
         if not dirpath:
             return
 
         if not validate_course_olx(courselike_key, dirpath, self.status):
             return
+        stage_timings['verify'] = time.monotonic() - verify_start
 
         dirpath = os.path.relpath(dirpath, data_root)
 
@@ -694,11 +705,18 @@ def import_olx(self, user_id, course_key_string, archive_path, archive_name, lan
             static_content_store=contentstore(),
             target_id=courselike_key,
             verbose=True,
+            stage_timings=stage_timings,
         )
 
         new_location = courselike_items[0].location
         LOGGER.debug('new course at %s', new_location)
 
+        UserTaskArtifact.objects.create(
+            status=self.status,
+            name='IMPORT_STAGE_TIMINGS',
+            text=json.dumps({stage: round(seconds, 3) for stage, seconds in stage_timings.items()}),
+        )
+
         LOGGER.info(f'{log_prefix}: Course import successful')
         set_custom_attribute('course_import_completed', True)
     except (CourseImportException, InvalidProctoringProvider, DuplicateCourseError) as known_exe:
@@ -1179,6 +1197,10 @@ def _scan_course_for_links(course_key):
     """
     Scans a course for links found in the data contents of blocks.
 
+    The links found in a block are cached for COURSE_LINK_CHECK_CACHE_TIMEOUT
+    seconds along with the version of its data, so only the blocks changed
+    since the previous check are scanned again.
+
     Returns:
         list: block id and URL pairs
 
@@ -1200,20 +1222,51 @@ def _scan_course_for_links(course_key):
     for vertical in verticals:
         blocks.extend(vertical.get_children())
 
+    # Excluding 'drag-and-drop-v2' as it contains data of object type instead of string, causing errors,
+    # and it doesn't contain user-facing links to scan.
+    blocks = [block for block in blocks if block.category != 'drag-and-drop-v2']
+
+    timeout = getattr(settings, 'COURSE_LINK_CHECK_CACHE_TIMEOUT', 0)
+    cache_keys = {block.usage_key: _block_urls_cache_key(block) for block in blocks} if timeout else {}
+    cached_urls = cache.get_many(list(cache_keys.values())) if timeout else {}
+    urls_to_cache = {}
+
     for block in blocks:
-        # Excluding 'drag-and-drop-v2' as it contains data of object type instead of string, causing errors,
-        # and it doesn't contain user-facing links to scan.
-        if block.category == 'drag-and-drop-v2':
-            continue
         block_id = str(block.usage_key)
-        block_info = get_block_info(block)
-        block_data = block_info['data']
-        url_list = _get_urls(block_data)
+        cache_key = cache_keys.get(block.usage_key)
+        url_list = cached_urls.get(cache_key)
+        if url_list is None:
+            url_list = _get_urls(_get_block_data(block))
+            if timeout:
+                urls_to_cache[cache_key] = url_list
         urls_to_validate += [[block_id, url] for url in url_list]
 
+    if urls_to_cache:
+        cache.set_many(urls_to_cache, timeout)
+
     return urls_to_validate
 
 
+def _get_block_data(block):
+    """
+    Returns the data of the given block, with its static urls replaced as
+    they are shown in Studio.
+    """
+    data = getattr(block, 'data', '')
+    if not isinstance(data, str):
+        return ''
+    return replace_static_urls(data, None, course_id=block.location.course_key)
+
+
+def _block_urls_cache_key(block):
+    """
+    Returns the key the links found in the given block are cached under,
+    which changes along with the data of the block.
+    """
+    block_version = f'{block.usage_key}@{block.scope_ids.def_id}'
+    return LINK_CHECK_BLOCK_URLS_CACHE_KEY.format(hashlib.sha1(block_version.encode('utf-8')).hexdigest())
+
+
 def _get_urls(content):
     """
     Finds and returns a list of URLs in the given content.
@@ -1235,6 +1288,9 @@ async def _validate_urls_access_in_batches(url_list, course_key, batch_size=100)
     """
     Returns the statuses of a list of URL requests.
 
+    All of the requests share a single connection pool, and each distinct URL
+    is requested once, however many blocks link to it.
+
     Arguments:
         url_list (list): block id and URL pairs
 
@@ -1244,21 +1300,76 @@ async def _validate_urls_access_in_batches(url_list, course_key, batch_size=100)
     responses = []
     url_count = len(url_list)
 
-    for i in range(0, url_count, batch_size):
-        batch = url_list[i:i + batch_size]
-        batch_results = await _validate_batch(batch, course_key)
-        responses.extend(batch_results)
-        LOGGER.debug(f'[Link Check] request batch {i // batch_size + 1} of {url_count // batch_size + 1}')
+    async with _LinkCheckSession() as session:
+        for i in range(0, url_count, batch_size):
+            batch = url_list[i:i + batch_size]
+            batch_results = await _validate_batch(batch, course_key, session)
+            responses.extend(batch_results)
+            LOGGER.debug(f'[Link Check] request batch {i // batch_size + 1} of {url_count // batch_size + 1}')
 
     return responses
 
 
-async def _validate_batch(batch, course_key):
+async def _validate_batch(batch, course_key, session):
     """Validate a batch of URLs"""
-    async with aiohttp.ClientSession() as session:
-        tasks = [_validate_url_access(session, url_data, course_key) for url_data in batch]
-        batch_results = await asyncio.gather(*tasks)
-        return batch_results
+    tasks = [_validate_url_access(session, url_data, course_key) for url_data in batch]
+    batch_results = await asyncio.gather(*tasks)
+    return batch_results
+
+
+class _LinkCheckSession:
+    """
+    HTTP session of a link check, which requests each URL at most once.
+
+    The connections are pooled, with at most LINK_CHECK_MAX_CONNECTIONS_PER_HOST
+    connections to each host.  The URLs found valid are cached for
+    COURSE_LINK_CHECK_CACHE_TIMEOUT seconds, so that later checks don't request
+    them again.  Other statuses aren't cached, so fixed links show up as soon
+    as the course is checked again.
+    """
+
+    def __init__(self):
+        self._session = None
+        # Map of each requested URL to the task requesting its status.
+        self._statuses = {}
+
+    async def __aenter__(self):
+        connector = aiohttp.TCPConnector(
+            limit=LINK_CHECK_MAX_CONNECTIONS,
+            limit_per_host=LINK_CHECK_MAX_CONNECTIONS_PER_HOST,
+        )
+        self._session = aiohttp.ClientSession(connector=connector)
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self._session.close()
+
+    async def get_status(self, url):
+        """
+        Returns the HTTP status of the given URL, or None if it couldn't be
+        requested.
+        """
+        task = self._statuses.get(url)
+        if task is None:
+            task = self._statuses[url] = asyncio.ensure_future(self._request_status(url))
+        return await task
+
+    async def _request_status(self, url):
+        """
+        Requests the given URL, unless it was found valid by a recent check.
+        """
+        timeout = getattr(settings, 'COURSE_LINK_CHECK_CACHE_TIMEOUT', 0)
+        cache_key = LINK_CHECK_URL_STATUS_CACHE_KEY.format(hashlib.sha1(url.encode('utf-8')).hexdigest())
+        if timeout:
+            status = cache.get(cache_key)
+            if status is not None:
+                return status
+
+        async with self._session.get(url, timeout=5) as response:
+            status = response.status
+        if timeout and status == 200:
+            cache.set(cache_key, status, timeout)
+        return status
 
 
 async def _validate_url_access(session, url_data, course_key):
@@ -1266,6 +1377,7 @@ async def _validate_url_access(session, url_data, course_key):
     Validates a URL.
 
     Arguments:
+        session (_LinkCheckSession): session of the link check
         url_data (list): block id and URL pairs
         course_key (str): locator id for a course
 
@@ -1284,8 +1396,7 @@ async def _validate_url_access(session, url_data, course_key):
     result = {'block_id': block_id, 'url': url}
     standardized_url = _convert_to_standard_url(url, course_key)
     try:
-        async with session.get(standardized_url, timeout=5) as response:
-            result.update({'status': response.status})
+        result.update({'status': await session.get_status(standardized_url)})
     except Exception as e:  # lint-amnesty, pylint: disable=broad-except
         result.update({'status': None})
         LOGGER.debug(f'[Link Check] Request error when validating {url}: {str(e)}')
@@ -12,6 +12,7 @@ from celery import Task
 import pytest
 from django.conf import settings
 from django.contrib.auth.models import User  # lint-amnesty, pylint: disable=imported-auth-user
+from django.core.cache import cache
 from django.test.utils import override_settings
 from edx_toggles.toggles.testutils import override_waffle_flag
 from opaque_keys.edx.keys import CourseKey
@@ -400,9 +401,8 @@ class CheckBrokenLinksTaskTest(ModuleStoreTestCase):
         _scan_course_for_links(self.test_course.id)
         self.assertEqual(len(expected_blocks), mock_get_urls.call_count)
 
-    @mock.patch('cms.djangoapps.contentstore.tasks.get_block_info', autospec=True)
     @mock.patch('cms.djangoapps.contentstore.tasks.modulestore', autospec=True)
-    def test_scan_course_excludes_drag_and_drop(self, mock_modulestore, mock_get_block_info):
+    def test_scan_course_excludes_drag_and_drop(self, mock_modulestore):
         """
         Test that `_scan_course_for_links` excludes blocks of category 'drag-and-drop-v2'.
         """
@@ -425,13 +425,6 @@ class CheckBrokenLinksTaskTest(ModuleStoreTestCase):
         mock_modulestore_instance.get_items.return_value = [vertical]
         vertical.get_children = mock.Mock(return_value=[drag_and_drop_block, text_block])
 
-        def get_block_side_effect(block):
-            block_data = getattr(block, 'data', '')
-            if isinstance(block_data, str):
-                return {'data': block_data}
-            raise TypeError("expected string or bytes-like object, got 'dict'")
-        mock_get_block_info.side_effect = get_block_side_effect
-
         urls = _scan_course_for_links(self.test_course.id)
         # The drag-and-drop block should not appear in the results
         self.assertFalse(
@@ -458,7 +451,7 @@ class CheckBrokenLinksTaskTest(ModuleStoreTestCase):
         course_key = 'course-v1:edX+DemoX+Demo_Course'
         batch_size = 2
         with patch("cms.djangoapps.contentstore.tasks._validate_batch", new_callable=AsyncMock) as mock_validate_batch:
-            mock_validate_batch.side_effect = lambda x, y: x
+            mock_validate_batch.side_effect = lambda batch, course_key, session: batch
             validated_urls = await _validate_urls_access_in_batches(url_list, course_key, batch_size)
             mock_validate_batch.assert_called()
             assert mock_validate_batch.call_count == 3  # two full batches and one partial batch
@@ -483,6 +476,58 @@ class CheckBrokenLinksTaskTest(ModuleStoreTestCase):
             for i in range(1, len(url_list) + 1):
                 assert str(i) in urls, f'{i} not supplied as a url for validation in batches function'
 
+    @pytest.mark.asyncio
+    async def test_each_url_requested_once(self):
+        """
+        A URL linked to by several blocks is requested once, and its status is
+        reported for each of the blocks.
+        """
+        url_list = [
+            ['block_1', 'https://example.com/shared'],
+            ['block_2', 'https://example.com/shared'],
+            ['block_2', 'https://example.com/other'],
+        ]
+        course_key = 'course-v1:edX+DemoX+Demo_Course'
+        with patch(
+            "cms.djangoapps.contentstore.tasks._LinkCheckSession._request_status", new_callable=AsyncMock
+        ) as mock_request_status:
+            mock_request_status.return_value = 404
+            results = await _validate_urls_access_in_batches(url_list, course_key, batch_size=2)
+
+        assert mock_request_status.call_count == 2
+        assert [(result['block_id'], result['status']) for result in results] == [
+            ('block_1', 404), ('block_2', 404), ('block_2', 404)
+        ]
+
+    @override_settings(COURSE_LINK_CHECK_CACHE_TIMEOUT=60)
+    def test_unchanged_blocks_not_scanned_again(self):
+        """
+        The links of a block are only searched again once its data changed.
+        """
+        vertical = BlockFactory.create(category='vertical', parent_location=self.test_course.location)
+        html_block = BlockFactory.create(
+            category='html',
+            parent_location=vertical.location,
+            data='<a href="http://example.com/first">First</a>',
+        )
+        store = modulestore()
+        store.publish(vertical.location, ModuleStoreEnum.UserID.test)
+        cache.clear()
+
+        expected_urls = [[str(html_block.usage_key), 'http://example.com/first']]
+        with patch('cms.djangoapps.contentstore.tasks._get_urls', wraps=_get_urls) as mock_get_urls:
+            assert _scan_course_for_links(self.test_course.id) == expected_urls
+            assert _scan_course_for_links(self.test_course.id) == expected_urls
+            assert mock_get_urls.call_count == 1
+
+            html_block.data = '<a href="http://example.com/second">Second</a>'
+            store.update_item(html_block, ModuleStoreEnum.UserID.test)
+            store.publish(vertical.location, ModuleStoreEnum.UserID.test)
+            assert _scan_course_for_links(self.test_course.id) == [
+                [str(html_block.usage_key), 'http://example.com/second']
+            ]
+            assert mock_get_urls.call_count == 2
+
     def test_no_retries_on_403_access_denied_links(self):
         '''
         No mocking required here. Will populate "filtering_input" with simulated results for link checks where
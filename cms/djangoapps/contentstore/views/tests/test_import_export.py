@@ -28,7 +28,7 @@ from milestones.tests.utils import MilestonesTestCaseMixin
 from opaque_keys.edx.locator import LibraryLocator
 from path import Path as path
 from storages.backends.s3boto3 import S3Boto3Storage
-from user_tasks.models import UserTaskStatus
+from user_tasks.models import UserTaskArtifact, UserTaskStatus
 
 from cms.djangoapps.contentstore import toggles
 from cms.djangoapps.contentstore import errors as import_error
@@ -284,6 +284,19 @@ class ImportTestCase(CourseTestCase):
         response = self.import_file_in_course(good_file)
         self.assertEqual(response.status_code, 200)
 
+    def test_import_stage_timings(self):
+        """
+        Check that the time spent in each stage of a successful import is
+        recorded as an artifact of the import task.
+        """
+        response = self.import_file_in_course(self.good_archives['tar'])
+        self.assertEqual(response.status_code, 200)
+
+        artifact = UserTaskArtifact.objects.get(name='IMPORT_STAGE_TIMINGS')
+        stage_timings = json.loads(artifact.text)
+        for stage in ('verify', 'parse', 'static_content', 'asset_metadata', 'structure', 'drafts', 'tags'):
+            self.assertGreaterEqual(stage_timings[stage], 0)
+
     @ddt.data('zip', 'tar')
     def test_import_in_existing_course(self, fmt):
         """
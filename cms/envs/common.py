@@ -177,6 +177,11 @@ BLOCK_STRUCTURES_SETTINGS = dict(
 
     # Maximum number of retries per task.
     TASK_MAX_RETRIES=5,
+
+    # Maximum total size, in bytes of serialized data, of the collected
+    # block structures kept in memory by each process.  Set to 0 to
+    # disable.
+    LOCAL_CACHE_MAX_BYTES=64 * 1024 * 1024,
 )
 
 ############################ FEATURE CONFIGURATION #############################
@@ -1033,6 +1038,25 @@ CONTENTSTORE = {
     'DOC_STORE_CONFIG': DOC_STORE_CONFIG
 }
 
+# .. setting_name: COURSE_ASSETS_DISK_CACHE_DIR
+# .. setting_default: None
+# .. setting_description: Directory on local disk where the contentserver caches course assets too large
+#   to be cached in memory, so that they are served from a file rather than streamed from the contentstore.
+#   None disables the disk cache.
+COURSE_ASSETS_DISK_CACHE_DIR = None
+# .. setting_name: COURSE_ASSETS_DISK_CACHE_MAX_BYTES
+# .. setting_default: 1073741824
+# .. setting_description: Maximum total size of the files in COURSE_ASSETS_DISK_CACHE_DIR. The least
+#   recently used files are removed beyond it.
+COURSE_ASSETS_DISK_CACHE_MAX_BYTES = 1024 ** 3
+
+# .. setting_name: COURSE_LINK_CHECK_CACHE_TIMEOUT
+# .. setting_default: 0
+# .. setting_description: Number of seconds the results of the broken link check of courses are cached for:
+#   the links found in each block (along with the version of its data, so changed blocks are scanned again)
+#   and the links found valid. 0 disables the cache, so every check scans and requests all of the links.
+COURSE_LINK_CHECK_CACHE_TIMEOUT = 0
+
 MODULESTORE_BRANCH = 'draft-preferred'
 
 MODULESTORE = {
@@ -1250,6 +1274,18 @@ STATICFILES_DIRS = [
     XMODULE_ROOT / "static",
 ]
 
+# .. setting_name: STATIC_REPLACE_CACHE_TIMEOUT
+# .. setting_default: 0
+# .. setting_description: Number of seconds the course asset urls and the rewritten HTML of static url
+#   replacement are cached in memory of each process. Changes to assets, like locking one or uploading a
+#   new version, show up in rendered content once the entries expire. 0 disables the caches.
+STATIC_REPLACE_CACHE_TIMEOUT = 0
+# .. setting_name: STATIC_REPLACE_CACHE_MAX_ENTRIES
+# .. setting_default: 1000
+# .. setting_description: Maximum number of entries in each of the in-memory caches of static url
+#   replacement, see STATIC_REPLACE_CACHE_TIMEOUT.
+STATIC_REPLACE_CACHE_MAX_ENTRIES = 1000
+
 # Locale/Internationalization
 CELERY_TIMEZONE = 'UTC'
 TIME_ZONE = 'UTC'
@@ -1729,6 +1765,11 @@ INSTALLED_APPS = [
     'lms.djangoapps.verify_student.apps.VerifyStudentConfig',
     'completion',
 
+    # Keep LMS course search and teacher dashboard caches up to date when
+    # courses are published or course team roles change in Studio
+    'lms.djangoapps.course_search.apps.CourseSearchConfig',
+    'lms.djangoapps.teacher_dashboard.apps.TeacherDashboardConfig',
+
     # System Wide Roles
     'openedx.core.djangoapps.system_wide_roles',
 
@@ -2900,6 +2941,16 @@ LIBRARY_ENABLED_BLOCKS = [
 NOTIFICATIONS_EXPIRY = 60
 EXPIRED_NOTIFICATIONS_DELETE_BATCH_SIZE = 10000
 NOTIFICATION_CREATION_BATCH_SIZE = 76
+# .. setting_name: NOTIFICATION_FANOUT_CHUNK_SIZE
+# .. setting_default: 5000
+# .. setting_description: Notifications to more users than this are split into parallel
+#   send_notifications tasks of at most this many users each. Set to 0 to never split them.
+NOTIFICATION_FANOUT_CHUNK_SIZE = 5000
+# .. setting_name: NOTIFICATION_DIGEST_CHUNK_SIZE
+# .. setting_default: 1000
+# .. setting_description: Number of users whose daily or weekly email digests are sent by a single
+#   send_digest_email_to_users task.
+NOTIFICATION_DIGEST_CHUNK_SIZE = 1000
 NOTIFICATIONS_DEFAULT_FROM_EMAIL = "no-reply@example.com"
 NOTIFICATION_DIGEST_LOGO = DEFAULT_EMAIL_LOGO_URL
 
@@ -174,6 +174,9 @@ CACHES = {
     },
 }
 
+# Don't keep collected block structures in memory across tests.
+BLOCK_STRUCTURES_SETTINGS = dict(BLOCK_STRUCTURES_SETTINGS, LOCAL_CACHE_MAX_BYTES=0)
+
 ################################# CELERY ######################################
 
 CELERY_ALWAYS_EAGER = True
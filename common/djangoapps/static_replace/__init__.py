@@ -1,7 +1,9 @@
 # lint-amnesty, pylint: disable=missing-module-docstring
 
+import hashlib
 import logging
 import re
+from functools import lru_cache
 
 from django.conf import settings
 from django.contrib.staticfiles import finders
@@ -10,6 +12,8 @@ from opaque_keys.edx.locator import AssetLocator
 
 from xmodule.contentstore.content import StaticContent
 
+from .cache import asset_url_cache, cache_timeout, rewritten_text_cache
+
 log = logging.getLogger(__name__)
 XBLOCK_STATIC_RESOURCE_PREFIX = '/static/xblock/'
 
@@ -29,6 +33,24 @@ def _url_replace_regex(prefix):
         """.format(prefix=prefix)
 
 
+@lru_cache(maxsize=256)
+def _compiled_url_replace_regex(prefix):
+    """
+    Return the compiled regex of _url_replace_regex for the given prefix.
+    """
+    return re.compile(_url_replace_regex(prefix))
+
+
+def _static_url_prefix(data_dir):
+    """
+    Return the regex prefix of the static urls that aren't in the given data directory.
+    """
+    return '(?:{static_url}|/static/)(?!{data_dir})'.format(
+        static_url=settings.STATIC_URL,
+        data_dir=data_dir
+    )
+
+
 def try_staticfiles_lookup(path):
     """
     Try to lookup a path in staticfiles_storage.  If it fails, return
@@ -70,7 +92,7 @@ def replace_jump_to_id_urls(text, course_id, jump_to_id_base_url):  # lint-amnes
         rest = match.group('rest')
         return "".join([quote, jump_to_id_base_url + rest, quote])
 
-    return re.sub(_url_replace_regex('/jump_to_id/'), replace_jump_to_id_url, text)
+    return _compiled_url_replace_regex('/jump_to_id/').sub(replace_jump_to_id_url, text)
 
 
 def replace_course_urls(text, course_key):
@@ -90,7 +112,7 @@ def replace_course_urls(text, course_key):
         rest = match.group('rest')
         return "".join([quote, '/courses/' + course_id + '/', rest, quote])
 
-    return re.sub(_url_replace_regex('/course/'), replace_course_url, text)
+    return _compiled_url_replace_regex('/course/').sub(replace_course_url, text)
 
 
 def process_static_urls(text, replacement_function, data_dir=None):
@@ -98,6 +120,17 @@ def process_static_urls(text, replacement_function, data_dir=None):
     Run an arbitrary replacement function on any urls matching the static file
     directory
     """
+    return _compiled_url_replace_regex(_static_url_prefix(data_dir)).sub(
+        _static_url_match_replacer(replacement_function),
+        text
+    )
+
+
+def _static_url_match_replacer(replacement_function):
+    """
+    Return a function replacing a static url match with `replacement_function`,
+    leaving XBlock resource links alone.
+    """
     def wrap_part_extraction(match):
         """
         Unwraps a match group for the captures specified in _url_replace_regex
@@ -120,14 +153,7 @@ def process_static_urls(text, replacement_function, data_dir=None):
 
         return replacement_function(original, prefix, quote, rest)
 
-    return re.sub(
-        _url_replace_regex('(?:{static_url}|/static/)(?!{data_dir})'.format(
-            static_url=settings.STATIC_URL,
-            data_dir=data_dir
-        )),
-        wrap_part_extraction,
-        text
-    )
+    return wrap_part_extraction
 
 
 def make_static_urls_absolute(request, html):
@@ -173,6 +199,127 @@ def replace_static_urls(
     lookup_url_func: Lookup function which returns the correct path of the asset
     """
 
+    return process_static_urls(
+        text,
+        _static_url_replacer(data_directory, course_id, static_asset_path, static_paths_out, xblock, lookup_asset_url),
+        data_dir=static_asset_path or data_directory
+    )
+
+
+def replace_all_urls(
+    text,
+    course_id,
+    data_directory=None,
+    static_asset_path='',
+    static_paths_out=None,
+    jump_to_id_base_url=None,
+    static_replace_only=False,
+):
+    """
+    Replace static, course and jump-to-id urls in a single pass over `text`.
+
+    This gives the same result as replace_static_urls followed by
+    replace_course_urls and, if jump_to_id_base_url is given,
+    replace_jump_to_id_urls.  The rewritten text is cached by its content,
+    see common.djangoapps.static_replace.cache.
+
+    text: The source text to do the substitution in
+    course_id: The course identifier used to distinguish static content for this course in studio
+    data_directory, static_asset_path, static_paths_out: As for replace_static_urls
+    jump_to_id_base_url: (optional) Absolute path to the base of the handler that will perform the redirect
+    static_replace_only: If True, only static urls will be replaced
+    """
+    cache_key = cached = None
+    if cache_timeout():
+        cache_key = (
+            hashlib.sha1(text.encode('utf-8')).hexdigest(),
+            str(course_id),
+            data_directory,
+            static_asset_path,
+            jump_to_id_base_url,
+            static_replace_only,
+        )
+        cached = rewritten_text_cache.get(cache_key)
+    if cached is not None:
+        rewritten_text, static_paths = cached
+        if static_paths_out is not None:
+            static_paths_out.extend(static_paths)
+        return rewritten_text
+
+    static_paths = []
+    replace_static_url = _static_url_match_replacer(
+        _static_url_replacer(data_directory, course_id, static_asset_path, static_paths)
+    )
+    prefix = '(?P<static>{})'.format(_static_url_prefix(static_asset_path or data_directory))
+    if not static_replace_only:
+        prefix += '|(?P<course>/course/)'
+        if jump_to_id_base_url:
+            prefix += '|(?P<jump_to_id>/jump_to_id/)'
+    courses_url = '/courses/' + str(course_id) + '/'
+
+    def replace_url(match):
+        """
+        Replace a single matched url of any kind.
+        """
+        if match.group('static'):
+            return replace_static_url(match)
+        quote = match.group('quote')
+        rest = match.group('rest')
+        if match.group('course'):
+            return "".join([quote, courses_url, rest, quote])
+        return "".join([quote, jump_to_id_base_url + rest, quote])
+
+    rewritten_text = _compiled_url_replace_regex(prefix).sub(replace_url, text)
+    if cache_key is not None:
+        rewritten_text_cache.set(cache_key, (rewritten_text, static_paths))
+    if static_paths_out is not None:
+        static_paths_out.extend(static_paths)
+    return rewritten_text
+
+
+def _course_asset_url(course_id, path):
+    """
+    Return the url of the asset at `path`, either from the static file pipeline
+    or from the contentstore of the course.
+    """
+    # first look in the static file pipeline and see if we are trying to reference
+    # a piece of static content which is in the edx-platform repo (e.g. JS associated with an xmodule)
+
+    exists_in_staticfiles_storage = False
+    try:
+        exists_in_staticfiles_storage = staticfiles_storage.exists(path)
+    except Exception as err:  # lint-amnesty, pylint: disable=broad-except
+        log.warning("staticfiles_storage couldn't find path {}: {}".format(
+            path, str(err)))
+
+    if exists_in_staticfiles_storage:
+        return staticfiles_storage.url(path)
+
+    # if not, then assume it's courseware specific content and then look in the
+    # Mongo-backed database
+    # Import is placed here to avoid model import at project startup.
+    from common.djangoapps.static_replace.models import AssetBaseUrlConfig, AssetExcludedExtensionsConfig
+    base_url = AssetBaseUrlConfig.get_base_url()
+    excluded_exts = AssetExcludedExtensionsConfig.get_excluded_extensions()
+    url = StaticContent.get_canonicalized_asset_path(course_id, path, base_url, excluded_exts)
+
+    if AssetLocator.CANONICAL_NAMESPACE in url:
+        url = url.replace('block@', 'block/', 1)
+    return url
+
+
+def _static_url_replacer(
+    data_directory=None,
+    course_id=None,
+    static_asset_path='',
+    static_paths_out=None,
+    xblock=None,
+    lookup_asset_url=None
+):
+    """
+    Return the replacement function for process_static_urls used by
+    replace_static_urls; see there for the arguments.
+    """
     if static_paths_out is None:
         static_paths_out = []
 
@@ -197,29 +344,10 @@ def replace_static_urls(
 
         # if we're running with a MongoBacked store course_namespace is not None, then use studio style urls
         elif (not static_asset_path) and course_id:
-            # first look in the static file pipeline and see if we are trying to reference
-            # a piece of static content which is in the edx-platform repo (e.g. JS associated with an xmodule)
-
-            exists_in_staticfiles_storage = False
-            try:
-                exists_in_staticfiles_storage = staticfiles_storage.exists(rest)
-            except Exception as err:  # lint-amnesty, pylint: disable=broad-except
-                log.warning("staticfiles_storage couldn't find path {}: {}".format(
-                    rest, str(err)))
-
-            if exists_in_staticfiles_storage:
-                url = staticfiles_storage.url(rest)
-            else:
-                # if not, then assume it's courseware specific content and then look in the
-                # Mongo-backed database
-                # Import is placed here to avoid model import at project startup.
-                from common.djangoapps.static_replace.models import AssetBaseUrlConfig, AssetExcludedExtensionsConfig
-                base_url = AssetBaseUrlConfig.get_base_url()
-                excluded_exts = AssetExcludedExtensionsConfig.get_excluded_extensions()
-                url = StaticContent.get_canonicalized_asset_path(course_id, rest, base_url, excluded_exts)
-
-                if AssetLocator.CANONICAL_NAMESPACE in url:
-                    url = url.replace('block@', 'block/', 1)
+            url = asset_url_cache.get((str(course_id), rest))
+            if url is None:
+                url = _course_asset_url(course_id, rest)
+                asset_url_cache.set((str(course_id), rest), url)
 
         # Otherwise, look the file up in staticfiles_storage, and append the data directory if needed
         else:
@@ -239,4 +367,4 @@ def replace_static_urls(
         static_paths_out.append((original_uri, url))
         return "".join([quote, url, quote])
 
-    return process_static_urls(text, replace_static_url, data_dir=static_asset_path or data_directory)
+    return replace_static_url
@@ -0,0 +1,89 @@
+"""
+Process-local caches of static url replacements.
+
+Resolving a course asset url looks the asset up in the contentstore, and
+the same HTML is rewritten on every render of a block, so both the asset
+url resolutions and the rewritten text are cached in memory for
+STATIC_REPLACE_CACHE_TIMEOUT seconds.  Changes to assets (e.g. locking one
+or uploading a new version) show up in rewritten urls once the entries
+expire.
+
+The caches are disabled when STATIC_REPLACE_CACHE_TIMEOUT is 0, and hold
+at most STATIC_REPLACE_CACHE_MAX_ENTRIES entries each.
+"""
+
+
+from collections import OrderedDict
+from threading import Lock
+from time import monotonic
+
+from django.conf import settings
+
+
+def cache_timeout():
+    """
+    Returns the number of seconds entries are cached for, 0 if caching is disabled.
+    """
+    return getattr(settings, 'STATIC_REPLACE_CACHE_TIMEOUT', 0)
+
+
+class TimedLRUCache:
+    """
+    Thread-safe LRU cache whose entries expire after the configured timeout.
+    """
+
+    def __init__(self):
+        # Map of a key to a tuple of its expiry time and value, least
+        # recently used first.
+        self._entries = OrderedDict()
+        self._lock = Lock()
+
+    def get(self, key):
+        """
+        Returns the value cached for the given key, or None if it isn't
+        cached or has expired.
+        """
+        if not cache_timeout():
+            return None
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at <= monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key, value):
+        """
+        Caches the given value for the given key, evicting the least
+        recently used entries when the cache is full.
+        """
+        timeout = cache_timeout()
+        if not timeout:
+            return
+
+        max_entries = getattr(settings, 'STATIC_REPLACE_CACHE_MAX_ENTRIES', 1000)
+        with self._lock:
+            self._entries[key] = (monotonic() + timeout, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        """
+        Removes all cached entries.
+        """
+        with self._lock:
+            self._entries.clear()
+
+
+# Map of (course id, asset path) to the url of the asset.
+asset_url_cache = TimedLRUCache()
+
+# Map of the digest of a text and the replacement arguments to the
+# rewritten text and the static paths found in it.
+rewritten_text_cache = TimedLRUCache()
@@ -4,11 +4,7 @@ Supports replacement of static/course/jump-to-id URLs to absolute URLs in XBlock
 
 from xblock.reference.plugins import Service
 
-from common.djangoapps.static_replace import (
-    replace_course_urls,
-    replace_jump_to_id_urls,
-    replace_static_urls
-)
+from common.djangoapps.static_replace import replace_all_urls, replace_static_urls
 
 
 class ReplaceURLService(Service):
@@ -54,16 +50,14 @@ class ReplaceURLService(Service):
         if self.lookup_asset_url:
             text = replace_static_urls(text, xblock=block, lookup_asset_url=self.lookup_asset_url)
         else:
-            text = replace_static_urls(
+            text = replace_all_urls(
                 text,
+                block.scope_ids.usage_id.context_key,
                 data_directory=getattr(block, 'data_dir', None),
-                course_id=block.scope_ids.usage_id.context_key,
                 static_asset_path=self.static_asset_path or block.static_asset_path,
-                static_paths_out=self.static_paths_out
+                static_paths_out=self.static_paths_out,
+                jump_to_id_base_url=self.jump_to_id_base_url,
+                static_replace_only=static_replace_only,
             )
-            if not static_replace_only:
-                text = replace_course_urls(text, block.scope_ids.usage_id.context_key)
-                if self.jump_to_id_base_url:
-                    text = replace_jump_to_id_urls(text, block.scope_ids.usage_id.context_key, self.jump_to_id_base_url)
 
         return text
@@ -17,10 +17,12 @@ from common.djangoapps.static_replace import (
     _url_replace_regex,
     make_static_urls_absolute,
     process_static_urls,
+    replace_all_urls,
     replace_course_urls,
     replace_static_urls,
     replace_jump_to_id_urls,
 )
+from common.djangoapps.static_replace.cache import asset_url_cache, rewritten_text_cache
 from common.djangoapps.static_replace.services import ReplaceURLService
 from common.djangoapps.static_replace.wrapper import replace_urls_wrapper
 from xmodule.assetstore.assetmgr import AssetManager  # lint-amnesty, pylint: disable=wrong-import-order
@@ -213,6 +215,64 @@ def test_static_paths_out(mock_modulestore, mock_storage):
     assert static_paths == [(static_url, static_course_url), (raw_url, raw_url)]
 
 
+@pytest.mark.django_db
+@patch('common.djangoapps.static_replace.staticfiles_storage', autospec=True)
+@patch('xmodule.modulestore.django.modulestore', autospec=True)
+def test_replace_all_urls(mock_modulestore, mock_storage):
+    """
+    Make sure that replacing all urls in one pass gives the same result as replacing each kind in turn.
+    """
+    mock_storage.exists.return_value = False
+    mock_modulestore.return_value = Mock(MongoModuleStore)
+
+    pre_text = (
+        '<img src="/static/image.png"/> <a href="/course/info">info</a> <a href=\'/jump_to_id/block\'>block</a> '
+        '<script src="/static/js/lib.js?raw"></script>'
+    )
+    expected = replace_jump_to_id_urls(
+        replace_course_urls(replace_static_urls(pre_text, DATA_DIRECTORY, COURSE_KEY), COURSE_KEY),
+        COURSE_KEY,
+        '/jump_to_id_base/',
+    )
+    static_paths = []
+    assert replace_all_urls(
+        pre_text, COURSE_KEY, DATA_DIRECTORY, static_paths_out=static_paths, jump_to_id_base_url='/jump_to_id_base/'
+    ) == expected
+    assert static_paths == [
+        ('/static/image.png', '/c4x/org/course/asset/image.png'),
+        ('/static/js/lib.js?raw', '/static/js/lib.js?raw'),
+    ]
+    assert replace_all_urls(pre_text, COURSE_KEY, DATA_DIRECTORY, static_replace_only=True) == replace_static_urls(
+        pre_text, DATA_DIRECTORY, COURSE_KEY
+    )
+
+
+@pytest.mark.django_db
+@override_settings(STATIC_REPLACE_CACHE_TIMEOUT=60)
+@patch('common.djangoapps.static_replace.StaticContent', autospec=True)
+@patch('common.djangoapps.static_replace.staticfiles_storage', autospec=True)
+def test_replace_all_urls_cached(mock_storage, mock_static_content):
+    """
+    Make sure that asset urls and rewritten texts are cached.
+    """
+    asset_url_cache.clear()
+    rewritten_text_cache.clear()
+    mock_storage.exists.return_value = False
+    mock_static_content.get_canonicalized_asset_path.return_value = '/c4x/org/course/asset/image.png'
+
+    pre_text = '<img src="/static/image.png"/>'
+    post_text = '<img src="/c4x/org/course/asset/image.png"/>'
+    for _ in range(2):
+        static_paths = []
+        assert replace_all_urls(pre_text, COURSE_KEY, static_paths_out=static_paths) == post_text
+        assert static_paths == [('/static/image.png', '/c4x/org/course/asset/image.png')]
+    assert replace_all_urls(pre_text + ' ', COURSE_KEY) == post_text + ' '
+    assert mock_static_content.get_canonicalized_asset_path.call_count == 1
+
+    asset_url_cache.clear()
+    rewritten_text_cache.clear()
+
+
 def test_regex():
     yes = ('"/static/foo.png"',
            '"/static/foo.png"',
@@ -614,14 +674,8 @@ class ReplaceURLServiceTest(SharedModuleStoreTestCase):
 
     def setUp(self):
         super().setUp()
-        self.mock_replace_static_urls = self.create_patch(
-            'common.djangoapps.static_replace.services.replace_static_urls'
-        )
-        self.mock_replace_course_urls = self.create_patch(
-            'common.djangoapps.static_replace.services.replace_course_urls'
-        )
-        self.mock_replace_jump_to_id_urls = self.create_patch(
-            'common.djangoapps.static_replace.services.replace_jump_to_id_urls'
+        self.mock_replace_all_urls = self.create_patch(
+            'common.djangoapps.static_replace.services.replace_all_urls'
         )
 
     def create_patch(self, name):
@@ -636,17 +690,14 @@ class ReplaceURLServiceTest(SharedModuleStoreTestCase):
         """
         replace_url_service = ReplaceURLService(xblock=self.course)
         replace_url_service.replace_urls("text", static_replace_only=True)
-        assert self.mock_replace_static_urls.called
-        assert not self.mock_replace_course_urls.called
-        assert not self.mock_replace_jump_to_id_urls.called
+        assert self.mock_replace_all_urls.call_args.kwargs['static_replace_only']
 
     def test_service_block_argument(self):
         """This service accepts either `block` or `xblock` keyword argument."""
         replace_url_service = ReplaceURLService(block=self.course)
         replace_url_service.replace_urls("text", static_replace_only=True)
-        assert self.mock_replace_static_urls.called
-        assert not self.mock_replace_course_urls.called
-        assert not self.mock_replace_jump_to_id_urls.called
+        assert self.mock_replace_all_urls.call_args.args == ("text", self.course.id)
+        assert self.mock_replace_all_urls.call_args.kwargs['static_replace_only']
 
     def test_replace_course_urls_called(self):
         """
@@ -654,7 +705,7 @@ class ReplaceURLServiceTest(SharedModuleStoreTestCase):
         """
         replace_url_service = ReplaceURLService(xblock=self.course)
         replace_url_service.replace_urls("text")
-        assert self.mock_replace_course_urls.called
+        assert not self.mock_replace_all_urls.call_args.kwargs['static_replace_only']
 
     def test_replace_jump_to_id_urls_called(self):
         """
@@ -662,7 +713,7 @@ class ReplaceURLServiceTest(SharedModuleStoreTestCase):
         """
         replace_url_service = ReplaceURLService(xblock=self.course, jump_to_id_base_url="/course/course_id")
         replace_url_service.replace_urls("text")
-        assert self.mock_replace_jump_to_id_urls.called
+        assert self.mock_replace_all_urls.call_args.kwargs['jump_to_id_base_url'] == "/course/course_id"
 
     def test_replace_jump_to_id_urls_not_called(self):
         """
@@ -670,7 +721,7 @@ class ReplaceURLServiceTest(SharedModuleStoreTestCase):
         """
         replace_url_service = ReplaceURLService(xblock=self.course)
         replace_url_service.replace_urls("text")
-        assert not self.mock_replace_jump_to_id_urls.called
+        assert self.mock_replace_all_urls.call_args.kwargs['jump_to_id_base_url'] is None
 
 
 @ddt.ddt
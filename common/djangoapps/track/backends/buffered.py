@@ -0,0 +1,182 @@
+"""
+Event tracker backend that sends events to another backend from a background
+thread.
+
+Emitting an event only adds it to a bounded in-memory queue, and a thread
+sends the queued events to the wrapped backend in batches, using its
+`send_many` method (e.g. a single `insert_many` for the MongoDB backend), so
+the request emitting the event doesn't wait for the wrapped backend.
+
+When the queue is full, `send` waits up to `block_timeout` seconds for room
+in it, and drops the event if there is still none.  The number of dropped
+events, and of events the wrapped backend failed to send, is counted.  The
+queued events are sent when the process exits.
+
+Example configuration::
+
+  TRACKING_BACKENDS = {
+      'mongo': {
+          'ENGINE': 'common.djangoapps.track.backends.buffered.BufferedBackend',
+          'OPTIONS': {
+              'backend': {
+                  'ENGINE': 'common.djangoapps.track.backends.mongodb.MongoBackend',
+                  'OPTIONS': {...},
+              },
+              'max_queue_size': 10000,
+              'batch_size': 100,
+          }
+      }
+  }
+
+"""
+
+
+import atexit
+import logging
+import os
+import queue
+import threading
+
+from edx_django_utils import monitoring
+
+from common.djangoapps.track.backends import BaseBackend
+
+log = logging.getLogger(__name__)
+
+# Queued by `close` to stop the thread once the events queued before it were sent.
+_STOP = object()
+
+
+class BufferedBackend(BaseBackend):
+    """
+    Event tracker backend that sends events to another backend in batches
+    from a background thread.
+    """
+
+    def __init__(self, backend, max_queue_size=10000, batch_size=100, block_timeout=0, **kwargs):
+        """
+        Event tracker backend that sends events to another backend in batches
+        from a background thread.
+
+        :Parameters:
+          - `backend`: configuration of the wrapped backend, a dictionary
+            with its `ENGINE` and `OPTIONS`, as in TRACKING_BACKENDS
+          - `max_queue_size`: maximum number of queued events
+          - `batch_size`: maximum number of events sent at once
+          - `block_timeout`: number of seconds to wait for room in the
+            queue when it is full, before dropping the event
+
+        """
+        super().__init__(**kwargs)
+
+        # Imported here because the tracker instantiates the backends when
+        # it is imported.
+        from common.djangoapps.track.tracker import _instantiate_backend_from_name
+        self.backend = _instantiate_backend_from_name(backend['ENGINE'], backend.get('OPTIONS', {}))
+
+        self.max_queue_size = max_queue_size
+        self.batch_size = batch_size
+        self.block_timeout = block_timeout
+
+        # Number of events dropped because the queue was full, and of events
+        # the wrapped backend failed to send.
+        self.dropped_events = 0
+        self.failed_events = 0
+
+        self._lock = threading.Lock()
+        self._queue = None
+        self._thread = None
+        self._pid = None
+        atexit.register(self.close)
+
+    def send(self, event):
+        """
+        Queue the event to be sent by the background thread.
+        """
+        event_queue = self._get_queue()
+        try:
+            if self.block_timeout:
+                event_queue.put(event, timeout=self.block_timeout)
+            else:
+                event_queue.put_nowait(event)
+        except queue.Full:
+            self.dropped_events += 1
+            monitoring.increment('track.buffered_backend.dropped_events')
+            if self.dropped_events == 1 or self.dropped_events % 1000 == 0:
+                log.warning(
+                    'Tracking event queue of %s is full, %d events dropped so far',
+                    type(self.backend).__name__, self.dropped_events,
+                )
+
+    def flush(self):
+        """
+        Wait until all of the queued events were sent.
+        """
+        if self._queue is not None and self._pid == os.getpid():
+            self._queue.join()
+
+    def close(self, timeout=5):
+        """
+        Send the queued events and stop the background thread, waiting at
+        most `timeout` seconds for it.
+        """
+        with self._lock:
+            thread = self._thread
+            if thread is None or self._pid != os.getpid():
+                return
+            self._thread = None
+            try:
+                self._queue.put(_STOP, timeout=timeout)
+            except queue.Full:
+                log.warning('Unable to send the queued tracking events of %s', type(self.backend).__name__)
+                return
+        thread.join(timeout)
+
+    def _get_queue(self):
+        """
+        Returns the queue of the events, starting the background thread if
+        it isn't running in this process yet.
+        """
+        # The thread doesn't survive a fork (e.g. of a preloading WSGI
+        # server), so each process starts its own.
+        if self._thread is None or self._pid != os.getpid():
+            with self._lock:
+                if self._thread is None or self._pid != os.getpid():
+                    self._queue = queue.Queue(maxsize=self.max_queue_size)
+                    self._pid = os.getpid()
+                    self._thread = threading.Thread(
+                        target=self._run, args=(self._queue,), name='tracking-buffered-backend', daemon=True,
+                    )
+                    self._thread.start()
+        return self._queue
+
+    def _run(self, event_queue):
+        """
+        Send the events of the given queue in batches, until it is closed.
+        """
+        while True:
+            batch = [event_queue.get()]
+            while len(batch) < self.batch_size and batch[-1] is not _STOP:
+                try:
+                    batch.append(event_queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            stopped = batch[-1] is _STOP
+            events = batch[:-1] if stopped else batch
+            if events:
+                self._send_batch(events)
+            for _ in batch:
+                event_queue.task_done()
+            if stopped:
+                return
+
+    def _send_batch(self, events):
+        """
+        Send the given events with the wrapped backend.
+        """
+        try:
+            self.backend.send_many(events)
+        except Exception:  # pylint: disable=broad-except
+            self.failed_events += len(events)
+            log.exception('Error sending %d events to %s', len(events), type(self.backend).__name__)
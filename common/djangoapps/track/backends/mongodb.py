@@ -98,3 +98,14 @@ class MongoBackend(BaseBackend):
             # during the next event.
             msg = 'Error inserting to MongoDB event tracker backend'
             log.exception(msg)
+
+    def send_many(self, events):
+        """Insert the events in to the Mongo collection at once"""
+        try:
+            # insert_many adds an _id to the documents, which must not change
+            # the events, as they are shared by all of the backends.
+            self.collection.insert_many([dict(event) for event in events], ordered=False)
+        except (PyMongoError, BSONError):
+            # As in send, the events are lost.
+            msg = 'Error inserting to MongoDB event tracker backend'
+            log.exception(msg)
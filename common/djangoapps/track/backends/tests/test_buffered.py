@@ -0,0 +1,107 @@
+"""Tests for the buffered event tracker backend."""
+
+
+import threading
+
+import pytest
+
+from common.djangoapps.track.backends import BaseBackend
+from common.djangoapps.track.backends.buffered import BufferedBackend
+
+
+class InMemoryBackend(BaseBackend):
+    """Event tracker backend that records the batches of events sent to it."""
+
+    def __init__(self, fail=False, **kwargs):
+        super().__init__(**kwargs)
+        self.fail = fail
+        self.batches = []
+        self.started = threading.Event()
+        self.release = threading.Event()
+        self.release.set()
+
+    def send(self, event):
+        self.send_many([event])
+
+    def send_many(self, events):
+        self.started.set()
+        self.release.wait()
+        if self.fail:
+            raise ValueError('Unable to send events')
+        self.batches.append(list(events))
+
+
+def make_backend(**options):
+    """
+    Returns a BufferedBackend wrapping an InMemoryBackend.
+    """
+    backend = BufferedBackend(
+        backend={'ENGINE': 'common.djangoapps.track.backends.tests.test_buffered.InMemoryBackend'},
+        **options
+    )
+    return backend
+
+
+@pytest.fixture
+def buffered_backend():
+    """
+    A BufferedBackend whose queue holds a single event.
+    """
+    backend = make_backend(max_queue_size=1)
+    yield backend
+    backend.backend.release.set()
+    backend.close()
+
+
+def test_events_sent_in_batches():
+    backend = make_backend(batch_size=2)
+    backend.backend.release.clear()
+
+    backend.send({'test': 0})
+    backend.backend.started.wait(5)
+    for index in range(1, 4):
+        backend.send({'test': index})
+    backend.backend.release.set()
+    backend.flush()
+
+    assert backend.backend.batches == [[{'test': 0}], [{'test': 1}, {'test': 2}], [{'test': 3}]]
+    backend.close()
+
+
+def test_events_dropped_when_queue_is_full(buffered_backend):
+    buffered_backend.backend.release.clear()
+
+    buffered_backend.send({'test': 0})
+    # Wait for the thread to take the first event, so the second fills the queue.
+    buffered_backend.backend.started.wait(5)
+    buffered_backend.send({'test': 1})
+    buffered_backend.send({'test': 2})
+
+    assert buffered_backend.dropped_events == 1
+    buffered_backend.backend.release.set()
+    buffered_backend.flush()
+    assert buffered_backend.backend.batches == [[{'test': 0}], [{'test': 1}]]
+
+
+def test_failed_events_counted():
+    backend = make_backend()
+    backend.backend.fail = True
+
+    backend.send({'test': 0})
+    backend.flush()
+
+    assert backend.failed_events == 1
+    backend.close()
+
+
+def test_close_sends_queued_events():
+    backend = make_backend()
+    backend.backend.release.clear()
+
+    backend.send({'test': 0})
+    backend.backend.started.wait(5)
+    backend.send({'test': 1})
+    backend.backend.release.set()
+    backend.close()
+
+    assert backend.backend.batches == [[{'test': 0}], [{'test': 1}]]
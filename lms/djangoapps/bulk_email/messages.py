@@ -31,14 +31,17 @@ class DjangoEmail(CourseEmailMessage):
     """
     Email message class to send email directly using django mail API.
     """
-    def __init__(self, connection, course_email, email_context):
+    def __init__(self, connection, course_email, email_context, course_email_template=None):
         """
-        Construct message content using course_email model and context
+        Construct message content using course_email model and context.  The
+        CourseEmailTemplate of the course_email can be passed in when it was
+        already fetched.
         """
         self.connection = connection
         template_context = email_context.copy()
         # use the CourseEmailTemplate that was associated with the CourseEmail
-        course_email_template = course_email.get_template()
+        if course_email_template is None:
+            course_email_template = course_email.get_template()
 
         plaintext_msg = course_email_template.render_plaintext(course_email.text_message, template_context)
         html_msg = course_email_template.render_htmltext(course_email.html_message, template_context)
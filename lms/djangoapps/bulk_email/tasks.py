@@ -9,6 +9,7 @@ import random
 import re
 import time
 from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from smtplib import SMTPConnectError, SMTPDataError, SMTPException, SMTPSenderRefused, SMTPServerDisconnected
 from time import sleep
@@ -433,6 +434,67 @@ def _get_source_address(course_id, course_title, course_language, truncate=True)
     return from_addr
 
 
+def _send_message(message):
+    """
+    Sends the given course email message, on a worker thread when messages are
+    sent over a pool of connections.
+
+    Returns a tuple of the exception raised when sending it, if any, and the
+    number of milliseconds that sending it took.
+    """
+    start_time = time.time()
+    try:
+        message.send()
+    except Exception as exc:  # pylint: disable=broad-except
+        return exc, int((time.time() - start_time) * 1000)
+    return None, int((time.time() - start_time) * 1000)
+
+
+def _process_send_result(send_exception, current_recipient, subtask_status, email_id, log_prefix):
+    """
+    Records the result of sending the course email email_id to current_recipient
+    in subtask_status.
+
+    Errors that only affect this recipient are counted as failures.  Any other
+    error is re-raised, so that the whole task is retried or failed, without
+    counting the recipient.
+    """
+    user_id = current_recipient['pk']
+    try:
+        if send_exception is not None:
+            raise send_exception
+    except (SMTPDataError, SMTPSenderRefused) as exc:
+        # According to SMTP spec, we'll retry error codes in the 4xx range.  5xx range indicates hard failure.
+        log.exception(f"BulkEmail ==> Status: Failed({exc.smtp_error}), {log_prefix}, Recipient UserId: {user_id}")
+        if exc.smtp_code >= 400 and exc.smtp_code < 500:  # lint-amnesty, pylint: disable=no-else-raise
+            # This will cause the outer handler to catch the exception and retry the entire task.
+            raise exc
+        else:
+            # This will fall through and not retry the message.
+            log.warning(
+                f"BulkEmail ==> {log_prefix}, Email not delievered to user {user_id} due to error: {exc.smtp_error}"
+            )
+            subtask_status.increment(failed=1)
+
+    except SINGLE_EMAIL_FAILURE_ERRORS as exc:
+        # This will fall through and not retry the message.
+        if exc.response['Error']['Code'] in ['MessageRejected', 'MailFromDomainNotVerified', 'MailFromDomainNotVerifiedException', 'FromEmailAddressNotVerifiedException']:   # lint-amnesty, pylint: disable=line-too-long
+            log.exception(
+                f"BulkEmail ==> Status: Failed(SINGLE_EMAIL_FAILURE_ERRORS), {log_prefix}, Recipient UserId: {user_id}"
+            )
+            subtask_status.increment(failed=1)
+        else:
+            raise exc
+
+    else:
+        log.info(f"BulkEmail ==> Status: Success, {log_prefix}, Recipient UserId: {user_id}")
+        if settings.BULK_EMAIL_LOG_SENT_EMAILS:
+            log.info(f"Email with id {email_id} sent to user {user_id}")
+        else:
+            log.debug(f"Email with id {email_id} sent to user {user_id}")
+        subtask_status.increment(succeeded=1)
+
+
 def _send_course_email(entry_id, email_id, to_list, global_email_context, subtask_status):  # lint-amnesty, pylint: disable=too-many-statements
     """
     Performs the email sending task.
@@ -515,123 +577,128 @@ def _send_course_email(entry_id, email_id, to_list, global_email_context, subtas
         from_addr = course_email.from_addr or _get_source_address(course_email.course_id, course_title, course_language)
 
     site = Site.objects.get_current()
+    ace_enabled = is_bulk_email_edx_ace_enabled()
+    # Messages are sent concurrently over a pool of connections, unless they are sent
+    # through edx-ace or the task has been retried for rate-related reasons.
+    num_connections = 1
+    if not ace_enabled and subtask_status.retried_nomax == 0:
+        num_connections = max(1, settings.BULK_EMAIL_SMTP_CONNECTIONS)
+    connections = []
+    executor = ThreadPoolExecutor(max_workers=num_connections) if num_connections > 1 else None
     try:
-        connection = get_connection()
-        connection.open()
+        for __ in range(num_connections):
+            connection = get_connection()
+            connections.append(connection)
+            connection.open()
 
         # Define context values to use in all course emails:
         email_context = {'name': '', 'email': '', 'course_email': course_email, 'from_address': from_addr}
         template_context = get_base_template_context(site)
         email_context.update(global_email_context)
         email_context.update(template_context)
+        # The template is the same for all recipients, so only fetch it once.
+        course_email_template = None if ace_enabled else course_email.get_template()
 
         start_time = time.time()
         while to_list:
-            # Update context with user-specific values from the user at the end of the list.
-            # At the end of processing this user, they will be popped off of the to_list.
+            # Build messages for the recipients at the end of the list, one for each connection.
+            # Recipients are only removed from the to_list once they have been processed.
             # That way, the to_list will always contain the recipients remaining to be emailed.
             # This is convenient for retries, which will need to send to those who haven't
             # yet been emailed, but not send to those who have already been sent to.
-            recipient_num += 1
-            current_recipient = to_list[-1]
-            email = current_recipient['email']
-            user_id = current_recipient['pk']
-            profile_name = current_recipient['profile__name']
-            if _has_non_ascii_characters(email):
-                to_list.pop()
-                total_recipients_failed += 1
-                log.warning(
-                    f"BulkEmail ==> Skipping course email to user {current_recipient['pk']} with email_id {email_id}. "
-                    "The email address contains non-ASCII characters."
+            batch = []
+            while len(batch) < num_connections and len(batch) < len(to_list):
+                recipient_num += 1
+                # Position of the recipient from the end of the to_list, which stays valid
+                # when recipients before it are removed.
+                offset = len(batch)
+                current_recipient = to_list[-1 - offset]
+                email = current_recipient['email']
+                user_id = current_recipient['pk']
+                profile_name = current_recipient['profile__name']
+                if _has_non_ascii_characters(email):
+                    del to_list[-1 - offset]
+                    total_recipients_failed += 1
+                    log.warning(
+                        f"BulkEmail ==> Skipping course email to user {current_recipient['pk']} with email_id "
+                        f"{email_id}. The email address contains non-ASCII characters."
+                    )
+                    subtask_status.increment(failed=1)
+                    continue
+
+                email_context['email'] = email
+                email_context['name'] = profile_name
+                email_context['user_id'] = user_id
+                email_context['course_id'] = str(course_email.course_id)
+                email_context['unsubscribe_link'] = get_unsubscribed_link(current_recipient['username'],
+                                                                          str(course_email.course_id))
+                email_context['unsubscribe_text'] = 'Unsubscribe from course updates for this course'
+                email_context['disclaimer'] = (
+                    "You are receiving this email because you are enrolled in the "
+                    f"{email_context['platform_name']} course {email_context['course_title']}"
                 )
-                subtask_status.increment(failed=1)
-                continue
-
-            email_context['email'] = email
-            email_context['name'] = profile_name
-            email_context['user_id'] = user_id
-            email_context['course_id'] = str(course_email.course_id)
-            email_context['unsubscribe_link'] = get_unsubscribed_link(current_recipient['username'],
-                                                                      str(course_email.course_id))
-            email_context['unsubscribe_text'] = 'Unsubscribe from course updates for this course'
-            email_context['disclaimer'] = (
-                "You are receiving this email because you are enrolled in the "
-                f"{email_context['platform_name']} course {email_context['course_title']}"
-            )
 
-            if is_bulk_email_edx_ace_enabled():
-                message = ACEEmail(site, email_context)
-            else:
-                message = DjangoEmail(connection, course_email, email_context)
+                if ace_enabled:
+                    message = ACEEmail(site, email_context)
+                else:
+                    message = DjangoEmail(
+                        connections[len(batch)], course_email, email_context,
+                        course_email_template=course_email_template,
+                    )
+                log.info(
+                    f"BulkEmail ==> Task: {parent_task_id}, SubTask: {task_id}, EmailId: {email_id}, Recipient num: "
+                    f"{recipient_num}/{total_recipients}, Recipient UserId: {current_recipient['pk']}"
+                )
+                batch.append((offset, recipient_num, current_recipient, message))
+
             # Throttle if we have gotten the rate limiter.  This is not very high-tech,
             # but if a task has been retried for rate-limiting reasons, then we sleep
             # for a period of time between all emails within this task.  Choice of
             # the value depends on the number of workers that might be sending email in
             # parallel, and what the SES throttle rate is.
-            if subtask_status.retried_nomax > 0:
+            if batch and subtask_status.retried_nomax > 0:
                 sleep(settings.BULK_EMAIL_RETRY_DELAY_BETWEEN_SENDS)
 
-            try:
-                log.info(
-                    f"BulkEmail ==> Task: {parent_task_id}, SubTask: {task_id}, EmailId: {email_id}, Recipient num: "
-                    f"{recipient_num}/{total_recipients}, Recipient UserId: {current_recipient['pk']}"
-                )
-                message.send()
-            except (SMTPDataError, SMTPSenderRefused) as exc:
-                # According to SMTP spec, we'll retry error codes in the 4xx range.  5xx range indicates hard failure.
-                total_recipients_failed += 1
-                log.exception(
-                    f"BulkEmail ==> Status: Failed({exc.smtp_error}), Task: {parent_task_id}, SubTask: {task_id}, "
-                    f"EmailId: {email_id}, Recipient num: {recipient_num}/{total_recipients}, Recipient UserId: "
-                    f"{current_recipient['pk']}"
-                )
-                if exc.smtp_code >= 400 and exc.smtp_code < 500:  # lint-amnesty, pylint: disable=no-else-raise
-                    # This will cause the outer handler to catch the exception and retry the entire task.
-                    raise exc
-                else:
-                    # This will fall through and not retry the message.
-                    log.warning(
-                        f"BulkEmail ==> Task: {parent_task_id}, SubTask: {task_id}, EmailId: {email_id}, Recipient "
-                        f"num: {recipient_num}/{total_recipients}, Email not delievered to user "
-                        f"{current_recipient['pk']} due to error: {exc.smtp_error}"
-                    )
-                    subtask_status.increment(failed=1)
-
-            except SINGLE_EMAIL_FAILURE_ERRORS as exc:
-                # This will fall through and not retry the message.
-                if exc.response['Error']['Code'] in ['MessageRejected', 'MailFromDomainNotVerified', 'MailFromDomainNotVerifiedException', 'FromEmailAddressNotVerifiedException']:   # lint-amnesty, pylint: disable=line-too-long
-                    total_recipients_failed += 1
-                    log.exception(
-                        f"BulkEmail ==> Status: Failed(SINGLE_EMAIL_FAILURE_ERRORS), Task: {parent_task_id}, SubTask: "
-                        f"{task_id}, EmailId: {email_id}, Recipient num: {recipient_num}/{total_recipients}, Recipient "
-                        f"UserId: {current_recipient['pk']}"
-                    )
-                    subtask_status.increment(failed=1)
-                else:
-                    raise exc
-
+            messages = [message for __, __, __, message in batch]
+            if executor is not None and len(messages) > 1:
+                results = list(executor.map(_send_message, messages))
             else:
-                total_recipients_successful += 1
-                log.info(
-                    f"BulkEmail ==> Status: Success, Task: {parent_task_id}, SubTask: {task_id}, EmailId: {email_id}, "
-                    f"Recipient num: {recipient_num}/{total_recipients}, Recipient UserId: {current_recipient['pk']}"
-                )
-                if settings.BULK_EMAIL_LOG_SENT_EMAILS:
-                    log.info(f"Email with id {email_id} sent to user {current_recipient['pk']}")
+                results = [_send_message(message) for message in messages]
+            subtask_status.increment(send_ms=sum(send_ms for __, send_ms in results))
+
+            # Errors that should retry or fail the whole task are raised once all the
+            # results of the batch have been processed.
+            pending_exception = None
+            processed = []
+            for (offset, num, current_recipient, __), (send_exception, __) in zip(batch, results):
+                try:
+                    _process_send_result(
+                        send_exception, current_recipient, subtask_status, email_id,
+                        f"Task: {parent_task_id}, SubTask: {task_id}, EmailId: {email_id}, "
+                        f"Recipient num: {num}/{total_recipients}",
+                    )
+                except Exception as exc:  # pylint: disable=broad-except
+                    pending_exception = pending_exception or exc
+                    continue
+                if send_exception is None:
+                    total_recipients_successful += 1
                 else:
-                    log.debug(f"Email with id {email_id} sent to user {current_recipient['pk']}")
-                subtask_status.increment(succeeded=1)
+                    total_recipients_failed += 1
+                recipients_info[current_recipient['email']] += 1
+                processed.append(offset)
 
-            # Pop the user that was emailed off the end of the list only once they have
-            # successfully been processed.  (That way, if there were a failure that
-            # needed to be retried, the user is still on the list.)
-            recipients_info[email] += 1
-            to_list.pop()
+            # Remove the processed recipients starting with the one furthest from the end,
+            # so that the offsets of the others stay valid.
+            for offset in reversed(processed):
+                del to_list[-1 - offset]
+            if pending_exception is not None:
+                raise pending_exception
 
         log.info(
             f"BulkEmail ==> Task: {parent_task_id}, SubTask: {task_id}, EmailId: {email_id}, Total Successful "
             f"Recipients: {total_recipients_successful}/{total_recipients}, Failed Recipients: "
-            f"{total_recipients_failed}/{total_recipients}, Time Taken: {time.time() - start_time}"
+            f"{total_recipients_failed}/{total_recipients}, Time Taken: {time.time() - start_time}, "
+            f"Connections: {num_connections}, Time Sending: {subtask_status.send_ms}ms"
         )
 
         duplicate_recipients = [f"{email} ({repetition})"
@@ -706,7 +773,10 @@ def _send_course_email(entry_id, email_id, to_list, global_email_context, subtas
         return subtask_status, None
     finally:
         # Clean up at the end.
-        connection.close()
+        if executor is not None:
+            executor.shutdown()
+        for connection in connections:
+            connection.close()
 
 
 def _get_current_task():
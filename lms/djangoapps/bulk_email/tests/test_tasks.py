@@ -25,6 +25,7 @@ from botocore.exceptions import ClientError, EndpointConnectionError
 from celery.states import FAILURE, SUCCESS
 from dateutil.relativedelta import relativedelta
 from django.conf import settings
+from django.core import mail
 from django.core.management import call_command
 from django.test.utils import override_settings
 from opaque_keys.edx.locator import CourseLocator
@@ -213,6 +214,34 @@ class TestBulkEmailInstructorTask(InstructorTaskCourseTestCase):
         assert parent_status.get('succeeded') == num_emails
         assert parent_status.get('failed') == 0
 
+    @override_settings(BULK_EMAIL_SMTP_CONNECTIONS=4)
+    def test_successful_over_connection_pool(self):
+        # Select number of emails to fit into a single subtask.
+        num_emails = settings.BULK_EMAIL_EMAILS_PER_TASK
+        # We also send email to the instructor:
+        students = self._create_students(num_emails - 1)
+        self._test_run_with_task(send_bulk_course_email, 'emailed', num_emails, num_emails)
+        assert len(mail.outbox) == num_emails
+        assert {message.to[0] for message in mail.outbox} == (
+            {student.email for student in students} | {self.instructor.email}
+        )
+
+    @override_settings(BULK_EMAIL_SMTP_CONNECTIONS=4)
+    def test_address_failures_over_connection_pool(self):
+        num_emails = settings.BULK_EMAIL_EMAILS_PER_TASK
+        self._create_students(num_emails - 1)
+        expected_fails = int((num_emails + 3) / 4.0)
+        expected_succeeds = num_emails - expected_fails
+        with patch('lms.djangoapps.bulk_email.tasks.get_connection', autospec=True) as get_conn:
+            # have every fourth email fail due to some address failure:
+            get_conn.return_value.send_messages.side_effect = cycle(
+                [SMTPDataError(554, "Email address is blacklisted"), None, None, None]
+            )
+            self._test_run_with_task(
+                send_bulk_course_email, 'emailed', num_emails, expected_succeeds, failed=expected_fails
+            )
+        assert get_conn.call_count == 4
+
     def test_unactivated_user(self):
         # Select number of emails to fit into a single subtask.
         num_emails = settings.BULK_EMAIL_EMAILS_PER_TASK
@@ -7,3 +7,9 @@ from django.apps import AppConfig
 
 class CourseHomeApiConfig(AppConfig):
     name = 'lms.djangoapps.course_home_api'
+
+    def ready(self):
+        """
+        Connect signal handlers.
+        """
+        from .progress import handlers  # pylint: disable=unused-import
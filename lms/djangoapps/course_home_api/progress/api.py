@@ -2,13 +2,53 @@
 Python APIs exposed for the progress tracking functionality of the course home API.
 """
 
+from django.conf import settings
 from django.contrib.auth import get_user_model
+from django.core.cache import cache
 from opaque_keys.edx.keys import CourseKey
 
 from lms.djangoapps.courseware.courses import get_course_blocks_completion_summary
 
 User = get_user_model()
 
+PROGRESS_SNAPSHOT_CACHE_KEY = 'course_home_api.progress.snapshot.{user_id}.{course_key}'
+
+
+def get_progress_snapshot(course_key, user, course_version, enrollment_mode, collected_block_structure=None):
+    """
+    Returns the parts of the progress of the given learner in the given course
+    which are derived from the blocks of the course, as a dict with the
+    completion_summary of the course.
+
+    The snapshot is cached for COURSE_HOME_PROGRESS_SNAPSHOT_CACHE_TIMEOUT
+    seconds, for the given version of the course and enrollment mode of the
+    learner, unless the course version is unknown.  It is cleared when the
+    learner completes a block or their score changes.
+    """
+    timeout = getattr(settings, 'COURSE_HOME_PROGRESS_SNAPSHOT_CACHE_TIMEOUT', 0)
+    cache_key = PROGRESS_SNAPSHOT_CACHE_KEY.format(user_id=user.id, course_key=course_key)
+    snapshot_version = (str(course_version), enrollment_mode)
+    if timeout and course_version and user.id:
+        cached = cache.get(cache_key)
+        if cached is not None and cached['version'] == snapshot_version:
+            return cached['snapshot']
+
+    snapshot = {
+        'completion_summary': get_course_blocks_completion_summary(
+            course_key, user, collected_block_structure=collected_block_structure,
+        ),
+    }
+    if timeout and course_version and user.id:
+        cache.set(cache_key, {'version': snapshot_version, 'snapshot': snapshot}, timeout)
+    return snapshot
+
+
+def clear_progress_snapshot(course_key, user_id):
+    """
+    Clears the cached progress snapshot of the given learner in the given course.
+    """
+    cache.delete(PROGRESS_SNAPSHOT_CACHE_KEY.format(user_id=user_id, course_key=course_key))
+
 
 def calculate_progress_for_learner_in_course(course_key: CourseKey, user: User) -> dict:
     """
@@ -0,0 +1,27 @@
+"""
+Signal handlers clearing the cached progress snapshots of learners.
+"""
+
+
+from completion.models import BlockCompletion
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+
+from lms.djangoapps.course_home_api.progress.api import clear_progress_snapshot
+from lms.djangoapps.grades.api import signals as grades_signals
+
+
+@receiver(post_save, sender=BlockCompletion, dispatch_uid="clear_progress_snapshot_on_completion")
+def clear_progress_snapshot_on_completion(sender, instance, **kwargs):  # pylint: disable=unused-argument
+    """
+    Clears the progress snapshot of the learner who completed a block.
+    """
+    clear_progress_snapshot(instance.context_key, instance.user_id)
+
+
+@receiver(grades_signals.PROBLEM_WEIGHTED_SCORE_CHANGED, dispatch_uid="clear_progress_snapshot_on_score_change")
+def clear_progress_snapshot_on_score_change(sender, **kwargs):  # pylint: disable=unused-argument
+    """
+    Clears the progress snapshot of the learner whose score changed.
+    """
+    clear_progress_snapshot(kwargs['course_id'], kwargs['user_id'])
@@ -2,11 +2,18 @@
 Tests for the Python APIs exposed by the Progress API of the Course Home API app.
 """
 
-from unittest.mock import patch
+from unittest.mock import Mock, patch
 
 from django.test import TestCase
+from django.test.utils import override_settings
+from opaque_keys.edx.keys import CourseKey
 
-from lms.djangoapps.course_home_api.progress.api import calculate_progress_for_learner_in_course
+from lms.djangoapps.course_home_api.progress.api import (
+    calculate_progress_for_learner_in_course,
+    clear_progress_snapshot,
+    get_progress_snapshot
+)
+from lms.djangoapps.course_home_api.progress.handlers import clear_progress_snapshot_on_score_change
 
 
 class ProgressApiTests(TestCase):
@@ -73,3 +80,57 @@ class ProgressApiTests(TestCase):
 
         results = calculate_progress_for_learner_in_course("some_course", "some_user")
         assert not results
+
+
+@override_settings(
+    CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}},
+    COURSE_HOME_PROGRESS_SNAPSHOT_CACHE_TIMEOUT=300,
+)
+@patch("lms.djangoapps.course_home_api.progress.api.get_course_blocks_completion_summary")
+class ProgressSnapshotTests(TestCase):
+    """
+    Tests for the cached progress snapshots of learners.
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.course_key = CourseKey.from_string('course-v1:edX+Progress+Snapshot')
+        self.user = Mock(id=42)
+
+    def get_snapshot(self, course_version='version_1', enrollment_mode='audit'):
+        """
+        Returns the progress snapshot of the user.
+        """
+        return get_progress_snapshot(self.course_key, self.user, course_version, enrollment_mode)
+
+    def test_snapshot_cached(self, mock_get_summary):
+        mock_get_summary.return_value = {'complete_count': 1, 'incomplete_count': 0, 'locked_count': 0}
+
+        assert self.get_snapshot() == {'completion_summary': mock_get_summary.return_value}
+        assert self.get_snapshot() == {'completion_summary': mock_get_summary.return_value}
+        assert mock_get_summary.call_count == 1
+
+    def test_snapshot_of_other_version_or_mode(self, mock_get_summary):
+        self.get_snapshot()
+        self.get_snapshot(course_version='version_2')
+        self.get_snapshot(course_version='version_2', enrollment_mode='verified')
+        assert mock_get_summary.call_count == 3
+
+    def test_snapshot_not_cached_without_course_version(self, mock_get_summary):
+        self.get_snapshot(course_version=None)
+        self.get_snapshot(course_version=None)
+        assert mock_get_summary.call_count == 2
+
+    @override_settings(COURSE_HOME_PROGRESS_SNAPSHOT_CACHE_TIMEOUT=0)
+    def test_snapshot_cache_disabled(self, mock_get_summary):
+        self.get_snapshot()
+        self.get_snapshot()
+        assert mock_get_summary.call_count == 2
+
+    def test_snapshot_cleared(self, mock_get_summary):
+        self.get_snapshot()
+        clear_progress_snapshot(self.course_key, self.user.id)
+        self.get_snapshot()
+        clear_progress_snapshot_on_score_change(None, user_id=self.user.id, course_id=str(self.course_key))
+        self.get_snapshot()
+        assert mock_get_summary.call_count == 3
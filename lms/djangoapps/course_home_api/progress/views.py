@@ -12,8 +12,8 @@ from rest_framework.generics import RetrieveAPIView
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 
-from xmodule.modulestore.django import modulestore
 from common.djangoapps.student.models import CourseEnrollment
+from lms.djangoapps.course_home_api.progress.api import get_progress_snapshot
 from lms.djangoapps.course_home_api.progress.serializers import ProgressTabSerializer
 from lms.djangoapps.course_home_api.toggles import course_home_mfe_progress_tab_is_active
 from lms.djangoapps.courseware.access import has_access, has_ccx_coach_role
@@ -22,10 +22,8 @@ from lms.djangoapps.course_blocks.transformers import start_date
 
 from lms.djangoapps.ccx.custom_exception import CCXLocatorValidationException
 from lms.djangoapps.course_home_api.utils import get_course_or_403
-from lms.djangoapps.courseware.courses import (
-    get_course_blocks_completion_summary, get_studio_url,
-)
-from lms.djangoapps.courseware.masquerade import setup_masquerade
+from lms.djangoapps.courseware.courses import get_studio_url
+from lms.djangoapps.courseware.masquerade import is_masquerading, setup_masquerade
 from lms.djangoapps.courseware.views.views import credit_course_requirements, get_cert_data
 
 from lms.djangoapps.grades.api import CourseGradeFactory
@@ -201,8 +199,8 @@ class ProgressTabView(RetrieveAPIView):
         if not (enrollment and enrollment.is_active) and not is_staff:
             return Response('User not enrolled.', status=401)
 
-        # The block structure is used for both the course_grade and has_scheduled content fields
-        # So it is called upfront and reused for optimization purposes
+        # The block structure is used for the course_grade, has_scheduled content and completion_summary
+        # fields, so it is called upfront and reused for optimization purposes
         collected_block_structure = get_block_structure_manager(course_key).get_collected()
         course_grade = CourseGradeFactory().read(student, collected_block_structure=collected_block_structure)
 
@@ -228,9 +226,25 @@ class ProgressTabView(RetrieveAPIView):
             user_grade = course_grade.percent
             user_has_passing_grade = user_grade >= course.lowest_passing_grade
 
-        block = modulestore().get_course(course_key)
-        grading_policy = block.grading_policy
-        disable_progress_graph = block.disable_progress_graph
+        # The course block loaded for the access check is the same block the
+        # grading policy is read from, so it isn't loaded from the modulestore again.
+        grading_policy = course.grading_policy
+        disable_progress_graph = course.disable_progress_graph
+
+        # The block derived parts of the progress are only cached for learners
+        # looking at their own progress, as masquerading changes the blocks.
+        if student.id == request.user.id and not is_masquerading(request.user, course_key):
+            course_version = getattr(course, 'course_version', None)
+        else:
+            course_version = None
+        progress_snapshot = get_progress_snapshot(
+            course_key,
+            student,
+            course_version,
+            enrollment_mode,
+            collected_block_structure=collected_block_structure,
+        )
+
         verification_status = IDVerificationService.user_status(student)
         verification_link = None
         if verification_status['status'] is None or verification_status['status'] == 'expired':
@@ -248,7 +262,7 @@ class ProgressTabView(RetrieveAPIView):
         data = {
             'access_expiration': access_expiration,
             'certificate_data': get_cert_data(student, course, enrollment_mode, course_grade),
-            'completion_summary': get_course_blocks_completion_summary(course_key, student),
+            'completion_summary': progress_snapshot['completion_summary'],
             'course_grade': course_grade,
             'credit_course_requirements': credit_course_requirements(course_key, student),
             'end': course.end,
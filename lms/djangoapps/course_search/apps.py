@@ -8,5 +8,10 @@ class CourseSearchConfig(AppConfig):
     """
     Configuration for the course search app
     """
+    default_auto_field = 'django.db.models.BigAutoField'
     name = 'lms.djangoapps.course_search'
     verbose_name = 'Course Search'
+
+    def ready(self):
+        # Connect signal handlers that keep the search index up to date
+        from . import signals  # pylint: disable=unused-import
@@ -0,0 +1,35 @@
+"""
+Command to (re)build the course search index.
+"""
+import logging
+
+from django.core.management.base import BaseCommand
+
+from lms.djangoapps.course_search.search import rebuild_index
+
+log = logging.getLogger(__name__)
+
+
+class Command(BaseCommand):
+    """
+    Rebuilds the course search index from all CourseOverviews.
+
+    The index is kept up to date on course publish, so this only needs to run
+    once after the app is installed, or to recover from a drifted index.
+
+    Example usage:
+        $ ./manage.py lms rebuild_course_search_index
+    """
+    help = 'Rebuilds the course search index from all course overviews.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=100,
+            help='Number of course overviews to load from the database at a time.'
+        )
+
+    def handle(self, *args, **options):
+        count = rebuild_index(batch_size=options['batch_size'])
+        log.info('Indexed %d courses for course search', count)
@@ -0,0 +1,31 @@
+"""
+Models for the Chalix course search index
+"""
+from django.db import models
+from opaque_keys.edx.django.models import CourseKeyField
+
+
+class CourseSearchTerm(models.Model):
+    """
+    One posting of the course search inverted index.
+
+    Each row records that the folded ``term`` occurs in the catalog text of
+    ``course_id``; ``weight`` is the accumulated field-weighted frequency of
+    the term in that course and is summed at query time to rank results.
+
+    .. no_pii:
+    """
+    MAX_TERM_LENGTH = 64
+
+    course_id = CourseKeyField(max_length=255, db_index=True)
+    term = models.CharField(max_length=MAX_TERM_LENGTH, db_index=True)
+    weight = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        app_label = 'course_search'
+        constraints = [
+            models.UniqueConstraint(fields=['course_id', 'term'], name='unique_course_search_term'),
+        ]
+
+    def __str__(self):
+        return f'CourseSearchTerm({self.course_id}, {self.term!r}, {self.weight})'
@@ -0,0 +1,147 @@
+"""
+Inverted index backing the Chalix course search.
+
+Catalog text of every searchable ``CourseOverview`` (display name, short
+description and overview) is folded to lowercase ASCII-ish terms - Vietnamese
+diacritics are stripped so that "lập trình" and "lap trinh" match each other -
+and stored as ``CourseSearchTerm`` postings.  Queries are answered with a
+single grouped query over the postings table: every query token is matched as
+a prefix, all tokens must match, and courses are ranked by the summed weight
+of the matching postings (exact term matches count twice).
+"""
+import logging
+import operator
+import re
+import unicodedata
+from collections import Counter
+from functools import reduce
+
+from django.db import transaction
+from django.db.models import Case, F, IntegerField, Max, Q, Sum, Value, When
+from django.utils.html import strip_tags
+
+from openedx.core.djangoapps.content.course_overviews.models import CourseOverview
+from xmodule.course_block import CATALOG_VISIBILITY_CATALOG_AND_ABOUT
+
+from .models import CourseSearchTerm
+
+log = logging.getLogger(__name__)
+
+# Relative weight of a term occurrence in each indexed CourseOverview field.
+FIELD_WEIGHTS = (
+    ('display_name', 10),
+    ('short_description', 3),
+    ('overview', 1),
+)
+
+# Upper bound on the number of tokens of a query that are used for matching.
+MAX_QUERY_TERMS = 8
+
+_TOKEN_RE = re.compile(r'\w+', re.UNICODE)
+
+# Letters that do not decompose into a base letter plus combining marks.
+_FOLD_TRANSLATION = str.maketrans({'đ': 'd', 'Đ': 'd'})
+
+
+def fold_text(text):
+    """
+    Lowercase ``text`` and strip diacritics from it.
+    """
+    if not text:
+        return ''
+    decomposed = unicodedata.normalize('NFKD', text.translate(_FOLD_TRANSLATION))
+    return ''.join(char for char in decomposed if not unicodedata.combining(char)).lower()
+
+
+def tokenize(text):
+    """
+    Split ``text`` into folded search terms, in order of appearance.
+    """
+    return [
+        token[:CourseSearchTerm.MAX_TERM_LENGTH]
+        for token in _TOKEN_RE.findall(fold_text(text))
+    ]
+
+
+def is_searchable(course_overview):
+    """
+    Return whether the course should be listed in search results at all.
+    """
+    return course_overview.catalog_visibility == CATALOG_VISIBILITY_CATALOG_AND_ABOUT
+
+
+def get_course_terms(course_overview):
+    """
+    Return a dict mapping each term of the course's catalog text to its weight.
+    """
+    weights = Counter()
+    for field_name, field_weight in FIELD_WEIGHTS:
+        text = strip_tags(getattr(course_overview, field_name, None) or '')
+        for term, count in Counter(tokenize(text)).items():
+            weights[term] += field_weight * count
+    return weights
+
+
+def index_course(course_overview):
+    """
+    Replace the postings of a single course with ones built from ``course_overview``.
+    """
+    terms = get_course_terms(course_overview) if is_searchable(course_overview) else {}
+    with transaction.atomic():
+        CourseSearchTerm.objects.filter(course_id=course_overview.id).delete()
+        CourseSearchTerm.objects.bulk_create(
+            CourseSearchTerm(course_id=course_overview.id, term=term, weight=weight)
+            for term, weight in terms.items()
+        )
+    log.info('Indexed %d search terms for course %s', len(terms), course_overview.id)
+
+
+def remove_course(course_key):
+    """
+    Drop every posting of the given course from the index.
+    """
+    CourseSearchTerm.objects.filter(course_id=course_key).delete()
+
+
+def rebuild_index(batch_size=100):
+    """
+    (Re)index every course in the catalog, dropping postings of deleted courses.
+    """
+    indexed = set()
+    course_overviews = CourseOverview.objects.only(
+        'id', 'catalog_visibility', *[field_name for field_name, __ in FIELD_WEIGHTS]
+    ).order_by('id')
+    for course_overview in course_overviews.iterator(chunk_size=batch_size):
+        index_course(course_overview)
+        indexed.add(course_overview.id)
+    stale = set(CourseSearchTerm.objects.values_list('course_id', flat=True).distinct()) - indexed
+    for course_key in stale:
+        remove_course(course_key)
+    return len(indexed)
+
+
+def search_courses(query):
+    """
+    Return a queryset of rows with ``course_id`` and ``score`` keys, best match first.
+
+    The queryset is lazy, so paginating it (e.g. with Django's ``Paginator``)
+    only ever fetches the requested page from the database.
+    """
+    tokens = list(dict.fromkeys(tokenize(query)))[:MAX_QUERY_TERMS]
+    if not tokens:
+        return CourseSearchTerm.objects.none().values('course_id')
+
+    prefix_filters = [Q(term__startswith=token) for token in tokens]
+    token_matches = {
+        f'matched_{index}': Max(Case(When(prefix_filter, then=Value(1)), default=Value(0), output_field=IntegerField()))
+        for index, prefix_filter in enumerate(prefix_filters)
+    }
+    exact_bonus = Sum(Case(When(term__in=tokens, then=F('weight')), default=Value(0), output_field=IntegerField()))
+    return (
+        CourseSearchTerm.objects
+        .filter(reduce(operator.or_, prefix_filters))
+        .values('course_id')
+        .annotate(score=Sum('weight') + exact_bonus, **token_matches)
+        .filter(**{name: 1 for name in token_matches})
+        .order_by('-score', 'course_id')
+    )
@@ -0,0 +1,26 @@
+"""
+Signal handlers keeping the course search index in sync with the catalog
+"""
+from django.db import transaction
+from django.dispatch import receiver
+
+from xmodule.modulestore.django import SignalHandler
+
+from .search import remove_course
+from .tasks import update_course_search_index
+
+
+@receiver(SignalHandler.course_published)
+def _listen_for_course_publish(sender, course_key, **kwargs):  # pylint: disable=unused-argument
+    """
+    Re-index the published course once its CourseOverview has been refreshed.
+    """
+    transaction.on_commit(lambda: update_course_search_index.delay(str(course_key)))
+
+
+@receiver(SignalHandler.course_deleted)
+def _listen_for_course_delete(sender, course_key, **kwargs):  # pylint: disable=unused-argument
+    """
+    Remove a deleted course from the search index.
+    """
+    remove_course(course_key)
@@ -0,0 +1,29 @@
+"""
+Celery tasks for the course search index
+"""
+from celery import shared_task
+from celery.utils.log import get_task_logger
+from edx_django_utils.monitoring import set_code_owner_attribute
+from opaque_keys.edx.keys import CourseKey
+
+from openedx.core.djangoapps.content.course_overviews.models import CourseOverview
+
+from .search import index_course, remove_course
+
+log = get_task_logger(__name__)
+
+
+@shared_task(name='lms.djangoapps.course_search.tasks.update_course_search_index')
+@set_code_owner_attribute
+def update_course_search_index(course_key_str):
+    """
+    Re-index the catalog text of a single course from its CourseOverview.
+    """
+    course_key = CourseKey.from_string(course_key_str)
+    try:
+        course_overview = CourseOverview.get_from_id(course_key)
+    except CourseOverview.DoesNotExist:
+        log.info('Course %s no longer exists, removing it from the search index', course_key)
+        remove_course(course_key)
+        return
+    index_course(course_overview)
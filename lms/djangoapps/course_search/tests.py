@@ -0,0 +1,126 @@
+"""
+Tests for the course search index and views.
+"""
+from unittest.mock import patch
+
+from django.test import TestCase
+from django.urls import reverse
+
+from common.djangoapps.student.tests.factories import TEST_PASSWORD, CourseEnrollmentFactory, UserFactory
+from openedx.core.djangoapps.content.course_overviews.tests.factories import CourseOverviewFactory
+
+from .models import CourseSearchTerm
+from .search import fold_text, index_course, rebuild_index, remove_course, search_courses, tokenize
+
+
+class CourseSearchTextTestCase(TestCase):
+    """
+    Test cases for text folding and tokenization.
+    """
+
+    def test_fold_text_strips_vietnamese_diacritics(self):
+        self.assertEqual(fold_text('Lập Trình Python'), 'lap trinh python')
+        self.assertEqual(fold_text('Đại học Đà Nẵng'), 'dai hoc da nang')
+
+    def test_tokenize(self):
+        self.assertEqual(tokenize('Nhập môn: Khoa-học dữ liệu!'), ['nhap', 'mon', 'khoa', 'hoc', 'du', 'lieu'])
+        self.assertEqual(tokenize(''), [])
+        self.assertEqual(tokenize(None), [])
+
+
+class CourseSearchIndexTestCase(TestCase):
+    """
+    Test cases for building and querying the course search index.
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.python = CourseOverviewFactory.create(
+            display_name='Lập trình Python',
+            short_description='Khóa học nhập môn',
+            overview='<p>Học lập trình với Python</p>',
+            catalog_visibility='both',
+        )
+        self.data = CourseOverviewFactory.create(
+            display_name='Khoa học dữ liệu',
+            short_description='Phân tích dữ liệu với Python',
+            catalog_visibility='both',
+        )
+        self.hidden = CourseOverviewFactory.create(
+            display_name='Lập trình nội bộ',
+            catalog_visibility='none',
+        )
+        rebuild_index()
+
+    def _search(self, query):
+        return [row['course_id'] for row in search_courses(query)]
+
+    def test_ranks_title_matches_first(self):
+        self.assertEqual(self._search('python'), [self.python.id, self.data.id])
+
+    def test_matches_without_diacritics_and_by_prefix(self):
+        self.assertEqual(self._search('lap trin'), [self.python.id])
+        self.assertEqual(self._search('dữ li'), [self.data.id])
+
+    def test_all_query_terms_must_match(self):
+        self.assertEqual(self._search('python phan tich'), [self.data.id])
+        self.assertEqual(self._search('python golang'), [])
+
+    def test_hidden_courses_are_not_indexed(self):
+        self.assertFalse(CourseSearchTerm.objects.filter(course_id=self.hidden.id).exists())
+
+    def test_empty_query(self):
+        self.assertEqual(self._search('  !! '), [])
+
+    def test_reindex_and_remove_course(self):
+        self.data.display_name = 'Thống kê'
+        self.data.short_description = ''
+        self.data.save()
+        index_course(self.data)
+        self.assertEqual(self._search('thong ke'), [self.data.id])
+        self.assertEqual(self._search('khoa hoc du lieu'), [])
+
+        remove_course(self.data.id)
+        self.assertEqual(self._search('thong ke'), [])
+
+
+class CourseSearchViewTestCase(TestCase):
+    """
+    Test cases for the course search views.
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.user = UserFactory.create()
+        self.courses = [
+            CourseOverviewFactory.create(display_name=f'Toán cao cấp {index}', catalog_visibility='both')
+            for index in range(3)
+        ]
+        CourseEnrollmentFactory.create(user=self.user, course_id=self.courses[0].id)
+        rebuild_index()
+        self.assertTrue(self.client.login(username=self.user.username, password=TEST_PASSWORD))
+
+    def test_api_search(self):
+        response = self.client.get(reverse('course_search_api'), {'q': 'toan cao'})
+        self.assertEqual(response.status_code, 200)
+        results = response.json()['results']
+        self.assertEqual(len(results), 3)
+        enrolled = {result['id']: result['is_enrolled'] for result in results}
+        self.assertTrue(enrolled[str(self.courses[0].id)])
+        self.assertFalse(enrolled[str(self.courses[1].id)])
+
+    def test_api_search_limit(self):
+        response = self.client.get(reverse('course_search_api'), {'q': 'toan', 'limit': 2})
+        self.assertEqual(response.json()['count'], 2)
+
+    def test_inaccessible_courses_are_not_counted(self):
+        denied_id = self.courses[1].id
+        with patch(
+            'lms.djangoapps.course_search.views.check_course_access',
+            side_effect=lambda overview, user, action: overview.id != denied_id,
+        ):
+            response = self.client.get(reverse('course_search_results'), {'q': 'toan'})
+            api_response = self.client.get(reverse('course_search_api'), {'q': 'toan', 'limit': 2})
+        self.assertContains(response, 'Found 2 course(s)')
+        self.assertNotIn(str(denied_id), [result['id'] for result in api_response.json()['results']])
+        self.assertEqual(api_response.json()['count'], 2)
@@ -2,19 +2,22 @@
 Course search views for Chalix platform
 """
 import logging
+from itertools import islice
+
 from django.http import JsonResponse
 from django.shortcuts import render
 from django.core.paginator import Paginator, EmptyPage, PageNotAnInteger
 from django.views.generic import View
 from django.contrib.auth.decorators import login_required
 from django.utils.decorators import method_decorator
-from django.db.models import Q
 from django.urls import reverse
 
 from openedx.core.djangoapps.content.course_overviews.models import CourseOverview
-from lms.djangoapps.courseware.courses import get_course_overview_with_access
+from lms.djangoapps.courseware.courses import check_course_access
 from common.djangoapps.student.models import CourseEnrollment
 
+from .search import search_courses
+
 log = logging.getLogger(__name__)
 
 
@@ -40,10 +43,12 @@ class CourseSearchView(View):
 
         if query:
             # Search in course titles and descriptions
-            courses = self._search_courses(query, request.user)
+            ranked_rows = self._search_courses(query)
 
-            # Paginate results
-            paginator = Paginator(courses, 20)  # Show 20 courses per page
+            # Paginate the courses the user has access to, so that counts and pages
+            # match what is shown; the entries are only built for the page shown
+            overviews = list(self._get_accessible_overviews(ranked_rows, request.user))
+            paginator = Paginator(overviews, 20)  # Show 20 courses per page
 
             try:
                 page_obj = paginator.page(page)
@@ -53,7 +58,7 @@ class CourseSearchView(View):
                 page_obj = paginator.page(paginator.num_pages)
 
             context.update({
-                'courses': page_obj.object_list,
+                'courses': self._get_course_results(page_obj.object_list, request.user),
                 'page_obj': page_obj,
                 'is_paginated': page_obj.has_other_pages(),
                 'paginator': paginator,
@@ -61,48 +66,54 @@ class CourseSearchView(View):
 
         return render(request, 'course_search/search_results.html', context)
 
-    def _search_courses(self, query, user):
+    def _search_courses(self, query):
+        """
+        Return the ranked search results for the query, as a lazy queryset
+        """
+        return search_courses(query)
+
+    def _get_accessible_overviews(self, ranked_rows, user):
         """
-        Search for courses matching the query in title, description, and content
+        Yield the overviews of the ranked search results that the user has access to, in rank order
         """
-        # Basic search in course overviews
-        course_overviews = CourseOverview.objects.filter(
-            Q(display_name__icontains=query) |
-            Q(short_description__icontains=query) |
-            Q(overview__icontains=query)
-        ).filter(
-            catalog_visibility='both'  # Only show publicly visible courses
-        ).order_by('-modified')
-
-        # Convert to list and add enrollment status
-        courses = []
-        for overview in course_overviews:
+        course_ids = [row['course_id'] for row in ranked_rows]
+        overviews = CourseOverview.objects.in_bulk(course_ids)
+
+        for course_id in course_ids:
+            overview = overviews.get(course_id)
+            if overview is None:
+                continue
             try:
                 # Check if user has access to the course
-                course = get_course_overview_with_access(user, 'load', overview.id)
-                if course:
-                    course_data = {
-                        'overview': overview,
-                        'is_enrolled': False,
-                        'enrollment_url': reverse('course_modes_choose', args=[overview.id]),
-                        'course_url': reverse('course_root', args=[overview.id]),
-                    }
-
-                    # Check enrollment status for authenticated users
-                    if user.is_authenticated:
-                        enrollment = CourseEnrollment.objects.filter(
-                            user=user,
-                            course_id=overview.id,
-                            is_active=True
-                        ).first()
-                        course_data['is_enrolled'] = enrollment is not None
-
-                    courses.append(course_data)
+                if check_course_access(overview, user, 'load'):
+                    yield overview
             except Exception as e:
                 log.warning(f"Error accessing course {overview.id}: {e}")
                 continue
 
-        return courses
+    def _get_course_results(self, overviews, user):
+        """
+        Build the result entries for one page of accessible courses
+        """
+        enrolled_course_ids = set()
+        if user.is_authenticated:
+            enrolled_course_ids = set(
+                CourseEnrollment.objects.filter(
+                    user=user,
+                    course_id__in=[overview.id for overview in overviews],
+                    is_active=True,
+                ).values_list('course_id', flat=True)
+            )
+
+        return [
+            {
+                'overview': overview,
+                'is_enrolled': overview.id in enrolled_course_ids,
+                'enrollment_url': reverse('course_modes_choose', args=[overview.id]),
+                'course_url': reverse('course_root', args=[overview.id]),
+            }
+            for overview in overviews
+        ]
 
 
 class CourseSearchAPIView(View):
@@ -125,7 +136,8 @@ class CourseSearchAPIView(View):
             })
 
         search_view = CourseSearchView()
-        courses = search_view._search_courses(query, request.user)[:limit]
+        overviews = search_view._get_accessible_overviews(search_view._search_courses(query), request.user)
+        courses = search_view._get_course_results(list(islice(overviews, limit)), request.user)
 
         results = []
         for course_data in courses:
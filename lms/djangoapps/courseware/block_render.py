@@ -64,11 +64,13 @@ from lms.djangoapps.courseware.masquerade import (
 from lms.djangoapps.courseware.model_data import DjangoKeyValueStore, FieldDataCache
 from lms.djangoapps.courseware.field_overrides import OverrideFieldData
 from lms.djangoapps.courseware.services import UserStateService
+from lms.djangoapps.courseware.toggles import courseware_prefetch_block_structure_state
 from lms.djangoapps.grades.api import GradesUtilService
 from lms.djangoapps.lms_xblock.field_data import LmsFieldData
 from lms.djangoapps.lms_xblock.runtime import UserTagsService, lms_wrappers_aside, lms_applicable_aside_types
 from lms.djangoapps.verify_student.services import XBlockVerificationService
 from openedx.core.djangoapps.bookmarks.api import BookmarksService
+from openedx.core.djangoapps.content.block_structure.api import get_course_in_cache
 from openedx.core.djangoapps.crawlers.models import CrawlersConfig
 from openedx.core.djangoapps.credit.services import CreditService
 from openedx.core.djangoapps.enrollments.services import EnrollmentsService
@@ -860,11 +862,15 @@ def get_block_by_usage_id(request, course_id, usage_id, disable_staff_debug_info
     block, tracking_context = _get_block_by_usage_key(usage_key)
 
     _, user = setup_masquerade(request, course_key, has_access(request.user, 'staff', block, course_key))
+    block_structure = None
+    if courseware_prefetch_block_structure_state(course_key):
+        block_structure = get_course_in_cache(course_key)
     field_data_cache = FieldDataCache.cache_for_block_descendents(
         course_key,
         user,
         block,
         read_only=CrawlersConfig.is_crawler(request),
+        block_structure=block_structure,
     )
     instance = get_block_for_descriptor(
         user,
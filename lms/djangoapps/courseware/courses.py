@@ -585,19 +585,27 @@ def get_course_assignment_date_blocks(course, user, request, num_return=None,
 
 
 @request_cached()
-def get_course_blocks_completion_summary(course_key, user):
+def get_course_blocks_completion_summary(course_key, user, collected_block_structure=None):
     """
     Returns an object with the number of complete units, incomplete units, and units that contain gated content
     for the given course. The complete and incomplete counts only reflect units that are able to be completed by
     the given user. If a unit contains gated content, it is not counted towards the incomplete count.
 
+    The collected block structure of the course can be given if the caller already fetched it.
+
     The object contains fields: complete_count, incomplete_count, locked_count
     """
     if not user.id:
         return []
     store = modulestore()
     course_usage_key = store.make_course_usage_key(course_key)
-    block_data = get_course_blocks(user, course_usage_key, allow_start_dates_in_future=True, include_completion=True)
+    block_data = get_course_blocks(
+        user,
+        course_usage_key,
+        collected_block_structure=collected_block_structure,
+        allow_start_dates_in_future=True,
+        include_completion=True,
+    )
 
     complete_count, incomplete_count, locked_count = 0, 0, 0
     for section_key in block_data.get_children(course_usage_key):  # pylint: disable=too-many-nested-blocks
@@ -13,6 +13,13 @@ Currently, this module is used in the `block_render` module in this same
 package and is used to wrap the `authored_data` when constructing an
 `LmsFieldData`.  This means overrides will be in effect for all scopes covered
 by `authored_data`, e.g. course content and settings stored in Mongo.
+
+The overrides found for a block are kept in an index for the rest of the
+request, along with the overrides each block inherits from its ancestors, so
+that every provider is asked at most once for each field of each block of a
+course version, however many times the field is read while rendering.  The
+index is keyed by the user, the course and the version of the course, and the
+APIs which set overrides reset it with `reset_override_index`.
 """
 
 
@@ -21,7 +28,7 @@ from abc import ABCMeta, abstractmethod
 from contextlib import contextmanager
 
 from django.conf import settings
-from edx_django_utils.cache import DEFAULT_REQUEST_CACHE
+from edx_django_utils.cache import DEFAULT_REQUEST_CACHE, RequestCache
 from xblock.field_data import FieldData
 
 from xmodule.modulestore.inheritance import InheritanceMixin
@@ -30,6 +37,7 @@ NOTSET = object()
 ENABLED_OVERRIDE_PROVIDERS_KEY = 'lms.djangoapps.courseware.field_overrides.enabled_providers.{course_id}'
 ENABLED_MODULESTORE_OVERRIDE_PROVIDERS_KEY = 'lms.djangoapps.courseware.modulestore_field_overrides.\
     enabled_providers.{course_id}'
+OVERRIDE_INDEX_NAMESPACE = 'lms.djangoapps.courseware.field_overrides.index'
 
 
 def resolve_dotted(name):
@@ -62,6 +70,32 @@ def _lineage(block):
         parent = parent.get_parent()
 
 
+class _OverrideIndex:
+    """
+    The overrides of the blocks of a course version for a user, as resolved
+    during the current request.
+    """
+
+    def __init__(self):
+        # The override of each field of each block, or NOTSET if it isn't
+        # overridden.
+        # {(usage id, field name): value}
+        self.overrides = {}
+
+        # The override of each field which each block inherits from its
+        # nearest overridden ancestor, or NOTSET if there is none.
+        # {(usage id, field name): value}
+        self.inherited = {}
+
+
+def reset_override_index():
+    """
+    Discards the overrides resolved during the current request.  Must be
+    called whenever an override is set or cleared.
+    """
+    RequestCache(OVERRIDE_INDEX_NAMESPACE).clear()
+
+
 class _OverridesDisabled(threading.local):
     """
     A thread local used to manage state of overrides being disabled or not.
@@ -200,18 +234,93 @@ class OverrideFieldData(FieldData):
     def __init__(self, user, fallback, providers):  # pylint: disable=super-init-not-called
         self.fallback = fallback
         self.providers = tuple(provider(user, fallback) for provider in providers)
+        self._index_key = (tuple(providers), getattr(user, 'id', None))
+
+    def _override_index(self, block):
+        """
+        Returns the override index of the course version of the given block,
+        or None if the block isn't located in a course.
+        """
+        location = getattr(block, 'location', None)
+        course_key = getattr(location, 'course_key', None)
+        if course_key is None:
+            return None
+
+        index_key = self._index_key + (course_key, getattr(block, 'course_version', None))
+        indexes = RequestCache(OVERRIDE_INDEX_NAMESPACE).data
+        index = indexes.get(index_key)
+        if index is None:
+            index = indexes[index_key] = _OverrideIndex()
+        return index
+
+    def _get_provider_override(self, block, name):
+        """
+        Asks the providers, in order, for an override for the field
+        identified by `name` in `block`.
+        """
+        for provider in self.providers:
+            value = provider.get(block, name, NOTSET)
+            if value is not NOTSET:
+                return value
+        return NOTSET
 
     def get_override(self, block, name):
         """
         Checks for an override for the field identified by `name` in `block`.
         Returns the overridden value or `NOTSET` if no override is found.
         """
-        if not overrides_disabled():
-            for provider in self.providers:
-                value = provider.get(block, name, NOTSET)
+        if overrides_disabled():
+            return NOTSET
+
+        index = self._override_index(block)
+        if index is None:
+            return self._get_provider_override(block, name)
+
+        key = (block.scope_ids.usage_id, name)
+        if key not in index.overrides:
+            index.overrides[key] = self._get_provider_override(block, name)
+        return index.overrides[key]
+
+    def get_inherited_override(self, block, name):
+        """
+        Checks for an override for the field identified by `name` in the
+        ancestors of `block`, nearest first.  Returns the overridden value or
+        `NOTSET` if no override is found.
+        """
+        if overrides_disabled():
+            return NOTSET
+
+        index = self._override_index(block)
+        if index is None:
+            for ancestor in _lineage(block):
+                value = self.get_override(ancestor, name)
                 if value is not NOTSET:
                     return value
-        return NOTSET
+            return NOTSET
+
+        # Walk up the ancestors until one is overridden or its inherited
+        # override is already indexed, then index that value for all the
+        # blocks walked through, which inherit it as well.
+        unresolved = []
+        current = block
+        while True:
+            key = (current.scope_ids.usage_id, name)
+            if key in index.inherited:
+                value = index.inherited[key]
+                break
+            unresolved.append(key)
+            parent = current.get_parent()
+            if parent is None:
+                value = NOTSET
+                break
+            value = self.get_override(parent, name)
+            if value is not NOTSET:
+                break
+            current = parent
+
+        for key in unresolved:
+            index.inherited[key] = value
+        return value
 
     def get(self, block, name):
         value = self.get_override(block, name)
@@ -234,11 +343,9 @@ class OverrideFieldData(FieldData):
             # If this is an inheritable field and an override is set above,
             # then we want to return False here, so the field_data uses the
             # override and not the original value for this block.
-            inheritable = list(InheritanceMixin.fields.keys())  # pylint: disable=no-member
-            if name in inheritable:
-                for ancestor in _lineage(block):
-                    if self.get_override(ancestor, name) is not NOTSET:
-                        return False
+            if name in InheritanceMixin.fields:  # pylint: disable=no-member
+                if self.get_inherited_override(block, name) is not NOTSET:
+                    return False
 
         return has is not NOTSET or self.fallback.has(block, name)
 
@@ -248,13 +355,10 @@ class OverrideFieldData(FieldData):
     def default(self, block, name):
         # The `default` method is overloaded by the field storage system to
         # also handle inheritance.
-        if self.providers and not overrides_disabled():
-            inheritable = list(InheritanceMixin.fields.keys())  # pylint: disable=no-member
-            if name in inheritable:
-                for ancestor in _lineage(block):
-                    value = self.get_override(ancestor, name)
-                    if value is not NOTSET:
-                        return value
+        if self.providers and name in InheritanceMixin.fields:  # pylint: disable=no-member
+            value = self.get_inherited_override(block, name)
+            if value is not NOTSET:
+                return value
         return self.fallback.default(block, name)
 
 
@@ -7,6 +7,7 @@ from django.shortcuts import redirect
 from django.utils.deprecation import MiddlewareMixin
 
 from lms.djangoapps.courseware.exceptions import Redirect
+from lms.djangoapps.courseware.user_state_client import flush_write_behind, start_write_behind
 from openedx.core.lib.request_utils import COURSE_REGEX
 
 
@@ -37,3 +38,24 @@ class CacheCourseIdMiddleware(MiddlewareMixin):
 
             if course_id and course_id != request.session.get('course_id'):
                 request.session['course_id'] = course_id
+
+
+class UserStateWriteBehindMiddleware(MiddlewareMixin):
+    """
+    Defer the XBlock user state writes of the block types configured in
+    XBLOCK_USER_STATE_WRITE_BEHIND_BLOCK_TYPES until the end of the request,
+    and store them in bulk before the response is returned.
+    """
+
+    def process_request(self, request):
+        """
+        Start deferring user state writes.
+        """
+        start_write_behind()
+
+    def process_response(self, request, response):
+        """
+        Store the deferred user state writes.
+        """
+        flush_write_behind()
+        return response
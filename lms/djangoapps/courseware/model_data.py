@@ -27,14 +27,17 @@ import logging
 from abc import ABCMeta, abstractmethod
 from collections import defaultdict, namedtuple
 
+from django.conf import settings
 from django.db import DatabaseError, IntegrityError, transaction
+from edx_django_utils import monitoring
 from opaque_keys.edx.asides import AsideUsageKeyV1, AsideUsageKeyV2
 from opaque_keys.edx.block_types import BlockTypeKeyV1
 from opaque_keys.edx.keys import LearningContextKey
-from xblock.core import XBlockAside
+from xblock.core import XBlock, XBlockAside
 from xblock.exceptions import InvalidScopeError, KeyValueMultiSaveError
-from xblock.fields import Scope, UserScope
-from xblock.runtime import KeyValueStore
+from xblock.fields import Scope, ScopeIds, UserScope
+from xblock.plugin import PluginMissingError
+from xblock.runtime import KeyValueStore, Mixologist
 
 from lms.djangoapps.courseware.user_state_client import DjangoXBlockUserStateClient
 from xmodule.modulestore.django import modulestore  # lint-amnesty, pylint: disable=wrong-import-order
@@ -44,6 +47,11 @@ from .models import StudentModule, XModuleStudentInfoField, XModuleStudentPrefsF
 log = logging.getLogger(__name__)
 
 
+# Stand-in for a block that is known from a block structure, but hasn't been
+# loaded from the modulestore, with what FieldDataCache needs to prefetch its fields.
+_PrefetchBlock = namedtuple('_PrefetchBlock', ['scope_ids', 'location', 'entry_point', 'fields', 'has_score'])
+
+
 class InvalidWriteError(Exception):
     """
     Raised to indicate that writing to a particular key
@@ -51,6 +59,13 @@ class InvalidWriteError(Exception):
     """
 
 
+def _field_names(block):
+    """
+    Return the set of the names of the fields of `block`.
+    """
+    return {field.name for field in block.fields.values()}
+
+
 def _all_usage_keys(blocks, aside_types):
     """
     Return a set of all usage_ids for the `blocks` and for
@@ -705,20 +720,75 @@ class FieldDataCache:
             ),
         }
         self.scorable_locations = set()
+        # Map of the usage keys of the blocks added to this cache to the names of their loaded fields.
+        self._cached_field_names = {}
         self.add_blocks_to_cache(blocks)
 
     def add_blocks_to_cache(self, blocks):
         """
-        Add all `blocks` to this FieldDataCache.
+        Add all `blocks` to this FieldDataCache.  Blocks whose fields were
+        all loaded already are not loaded again.
         """
         if self.user.is_authenticated:
             self.scorable_locations.update(block.location for block in blocks if block.has_score)
+            blocks = [
+                block for block in blocks
+                if not _field_names(block) <= self._cached_field_names.get(block.scope_ids.usage_id, set())
+            ]
+            if not blocks:
+                return
+            for block in blocks:
+                self._cached_field_names.setdefault(block.scope_ids.usage_id, set()).update(_field_names(block))
+
+            # .. custom_attribute_name: field_data_cache.bulk_loads
+            # .. custom_attribute_description: The number of times field data of blocks was loaded into
+            #   a FieldDataCache in a request.  Each load runs a query for each of the scopes of the fields.
+            monitoring.accumulate('field_data_cache.bulk_loads', 1)
+            # .. custom_attribute_name: field_data_cache.blocks
+            # .. custom_attribute_description: The number of blocks whose field data was loaded into a
+            #   FieldDataCache in a request.
+            monitoring.accumulate('field_data_cache.blocks', len(blocks))
             for scope, fields in self._fields_to_cache(blocks).items():
                 if scope not in self.cache:
                     continue
 
                 self.cache[scope].cache_fields(fields, blocks, self.asides)
 
+    def add_block_structure_descendants(self, block_structure, root_usage_key):
+        """
+        Add the block with `root_usage_key` and all its descendants in the given
+        block structure to this FieldDataCache, in a single load.
+
+        This doesn't need the blocks to be loaded from the modulestore, so it
+        also covers blocks that are only discovered while rendering, like the
+        children of library content and split test blocks.
+
+        Arguments:
+            block_structure: A collected BlockStructure of the course
+            root_usage_key: The usage key of the block to load field data for
+        """
+        if root_usage_key not in block_structure:
+            return
+
+        # The fields of the blocks include those of the mixins the modulestore adds to them.
+        mixologist = Mixologist(modulestore().xblock_mixins)
+        blocks = []
+        for usage_key in block_structure.post_order_traversal(start_node=root_usage_key):
+            try:
+                block_class = XBlock.load_class(usage_key.block_type, select=settings.XBLOCK_SELECT_FUNCTION)
+            except PluginMissingError:
+                continue
+            block_class = mixologist.mix(block_class)
+            blocks.append(_PrefetchBlock(
+                scope_ids=ScopeIds(self.user.id, usage_key.block_type, None, usage_key),
+                location=usage_key,
+                entry_point=block_class.entry_point,
+                fields=block_class.fields,
+                # The blocks still need to be added to know which of them are scored.
+                has_score=False,
+            ))
+        self.add_blocks_to_cache(blocks)
+
     def add_block_descendents(self, block, depth=None, block_filter=lambda block: True):
         """
         Add all descendants of `block` to this FieldDataCache.
@@ -762,7 +832,7 @@ class FieldDataCache:
     @classmethod
     def cache_for_block_descendents(cls, course_id, user, block, depth=None,
                                     block_filter=lambda block: True,
-                                    asides=None, read_only=False):
+                                    asides=None, read_only=False, block_structure=None):
         """
         course_id: the course in the context of which we want StudentModules.
         user: the django user for whom to load modules.
@@ -771,8 +841,12 @@ class FieldDataCache:
             the supplied block. If depth is None, load all descendant StudentModules
         block_filter is a function that accepts a block and return whether the field data
             should be cached
+        block_structure is an optional collected BlockStructure of the course, used to load the
+            field data of all descendants of the block in a single round of queries up front
         """
         cache = FieldDataCache([], course_id, user, asides=asides, read_only=read_only)
+        if block_structure is not None:
+            cache.add_block_structure_descendants(block_structure, block.location)
         cache.add_block_descendents(block, depth, block_filter)
         return cache
 
@@ -7,9 +7,10 @@ by the individual due dates feature.
 import json
 
 from lms.djangoapps.courseware.models import StudentFieldOverride
+from openedx.core.lib.cache_utils import get_cache
 from openedx.core.lib.xblock_utils import is_xblock_aside
 
-from .field_overrides import FieldOverrideProvider
+from .field_overrides import FieldOverrideProvider, reset_override_index
 
 
 class IndividualStudentOverrideProvider(FieldOverrideProvider):
@@ -56,19 +57,45 @@ def _get_overrides_for_user(user, block):
     else:
         location = block.location
 
-    query = StudentFieldOverride.objects.filter(
-        course_id=block.scope_ids.usage_id.context_key,
-        location=location,
-        student_id=user.id,
-    )
+    course_overrides = _get_course_overrides_for_user(user, block.scope_ids.usage_id.context_key)
     overrides = {}
-    for override in query:
-        field = block.fields[override.field]
-        value = field.from_json(json.loads(override.value))
-        overrides[override.field] = value
+    for field_name, value in course_overrides.get(str(location), {}).items():
+        field = block.fields[field_name]
+        overrides[field_name] = field.from_json(json.loads(value))
     return overrides
 
 
+def _get_course_overrides_for_user(user, course_key):
+    """
+    Gets the serialized values of all of the individual student overrides for
+    the given user in the given course, which are loaded in a single query
+    and cached for the rest of the request.  Returns a dictionary mapping the
+    serialized location of each overridden block to its override values keyed
+    by field name.
+    """
+    overrides_cache = get_cache('student-field-overrides')
+    cache_key = (user.id, course_key)
+    if cache_key not in overrides_cache:
+        overrides = {}
+        query = StudentFieldOverride.objects.filter(
+            course_id=course_key,
+            student_id=user.id,
+        )
+        for override in query:
+            overrides.setdefault(str(override.location), {})[override.field] = override.value
+        overrides_cache[cache_key] = overrides
+    return overrides_cache[cache_key]
+
+
+def _reset_overrides_cache():
+    """
+    Discards the overrides cached during the current request, after one of
+    them was set or cleared.
+    """
+    get_cache('student-field-overrides').clear()
+    reset_override_index()
+
+
 def override_field_for_user(user, block, name, value):
     """
     Overrides a field for the `user`.  `block` and `name` specify the block
@@ -83,6 +110,7 @@ def override_field_for_user(user, block, name, value):
     field = block.fields[name]
     override.value = json.dumps(field.to_json(value))
     override.save()
+    _reset_overrides_cache()
 
 
 def clear_override_for_user(user, block, name):
@@ -100,3 +128,5 @@ def clear_override_for_user(user, block, name):
             field=name).delete()
     except StudentFieldOverride.DoesNotExist:
         pass
+    else:
+        _reset_overrides_cache()
@@ -2,8 +2,11 @@
 Tests for `field_overrides` module.
 """
 import unittest
+from unittest.mock import Mock
+
 import pytest
 from django.test.utils import override_settings
+from opaque_keys.edx.locator import CourseLocator
 from xblock.field_data import DictFieldData
 
 from xmodule.modulestore.tests.django_utils import SharedModuleStoreTestCase
@@ -14,6 +17,7 @@ from ..field_overrides import (
     OverrideFieldData,
     OverrideModulestoreFieldData,
     disable_overrides,
+    reset_override_index,
     resolve_dotted
 )
 from ..testutils import FieldOverrideTestMixin
@@ -43,6 +47,24 @@ class TestOverrideProvider(FieldOverrideProvider):
         return True
 
 
+class CountingOverrideProvider(FieldOverrideProvider):
+    """
+    A `FieldOverrideProvider` which overrides the due date of chapters, and
+    records the lookups made by `OverrideFieldData`.
+    """
+    lookups = []
+
+    def get(self, block, name, default):
+        self.lookups.append((block.scope_ids.usage_id.block_id, name))
+        if name == 'due' and block.scope_ids.usage_id.block_type == 'chapter':
+            return 'tomorrow'
+        return default
+
+    @classmethod
+    def enabled_for(cls, course):  # pylint: disable=arguments-differ
+        return True
+
+
 class OverrideFieldBase(SharedModuleStoreTestCase):
     """
     Base class for field data override tests.  Using override_settings and
@@ -145,6 +167,92 @@ class OverrideModulestoreFieldDataTests(FieldOverrideTestMixin, OverrideFieldDat
         assert isinstance(data, DictFieldData)
 
 
+@override_settings(FIELD_OVERRIDE_PROVIDERS=(
+    'lms.djangoapps.courseware.tests.test_field_overrides.CountingOverrideProvider',))
+class OverrideFieldDataIndexTests(unittest.TestCase):
+    """
+    Tests for the index of the overrides resolved by `OverrideFieldData`.
+    """
+
+    def setUp(self):
+        super().setUp()
+        OverrideFieldData.provider_classes = None
+        CountingOverrideProvider.lookups = []
+        reset_override_index()
+        self.addCleanup(reset_override_index)
+
+        course_key = CourseLocator('edX', 'index', '2024')
+        self.course = self.make_block(course_key.make_usage_key('course', 'course'), None)
+        chapter = self.make_block(course_key.make_usage_key('chapter', 'chapter'), self.course)
+        sequential = self.make_block(course_key.make_usage_key('sequential', 'sequential'), chapter)
+        self.problems = [
+            self.make_block(course_key.make_usage_key('problem', f'problem_{index}'), sequential)
+            for index in range(3)
+        ]
+
+    def tearDown(self):
+        super().tearDown()
+        OverrideFieldData.provider_classes = None
+
+    def make_block(self, location, parent):
+        """
+        Returns a mock block of the given location in the version 'v1' of
+        its course.
+        """
+        block = Mock(location=location, course_version='v1')
+        block.scope_ids.usage_id = location
+        block.get_parent.return_value = parent
+        return block
+
+    def make_one(self):
+        """
+        Factory method.
+        """
+        return OverrideFieldData.wrap(TESTUSER, self.course, DictFieldData({'due': 'never'}))
+
+    def test_inherited_override(self):
+        for problem in self.problems:
+            data = self.make_one()
+            assert data.default(problem, 'due') == 'tomorrow'
+            assert not data.has(problem, 'due')
+            assert data.get(problem, 'due') == 'never'
+
+        # The providers were asked once for each block, while the override
+        # of the chapter was inherited by all of the problems.
+        assert sorted(CountingOverrideProvider.lookups) == sorted(
+            [(f'problem_{index}', 'due') for index in range(3)] + [('sequential', 'due'), ('chapter', 'due')]
+        )
+
+    def test_no_inherited_override(self):
+        data = self.make_one()
+        assert data.has(self.problems[0], 'start') is False
+        assert data.has(self.problems[1], 'start') is False
+        assert len(CountingOverrideProvider.lookups) == 5
+
+    def test_reset_override_index(self):
+        data = self.make_one()
+        assert data.default(self.problems[0], 'due') == 'tomorrow'
+        reset_override_index()
+        assert data.default(self.problems[0], 'due') == 'tomorrow'
+        assert CountingOverrideProvider.lookups == [('sequential', 'due'), ('chapter', 'due')] * 2
+
+    def test_new_course_version(self):
+        data = self.make_one()
+        assert data.default(self.problems[0], 'due') == 'tomorrow'
+        block = self.problems[0]
+        while block:
+            block.course_version = 'v2'
+            block = block.get_parent()
+        assert data.default(self.problems[0], 'due') == 'tomorrow'
+        assert CountingOverrideProvider.lookups == [('sequential', 'due'), ('chapter', 'due')] * 2
+
+    def test_disable_overrides(self):
+        data = self.make_one()
+        with disable_overrides():
+            assert data.has(self.problems[0], 'due')
+        assert not CountingOverrideProvider.lookups
+
+
 class ResolveDottedTests(unittest.TestCase):
     """
     Tests for `resolve_dotted`.
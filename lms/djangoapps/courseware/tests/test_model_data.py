@@ -26,6 +26,7 @@ from lms.djangoapps.courseware.tests.factories import StudentInfoFactory
 from lms.djangoapps.courseware.tests.factories import StudentModuleFactory as cmfStudentModuleFactory
 from lms.djangoapps.courseware.tests.factories import StudentPrefsFactory
 from lms.djangoapps.courseware.tests.factories import UserStateSummaryFactory
+from openedx.core.djangoapps.content.block_structure.block_structure import BlockStructureBlockData
 
 
 def mock_field(scope, name):
@@ -238,6 +239,76 @@ class TestStudentModuleStorage(OtherUserFailureTestMixin, TestCase):
                 self.kvs.set_many(kv_dict)
         assert exception_context.value.saved_field_names == []
 
+    def test_add_cached_block_again(self):
+        "Test that adding a block that is already cached doesn't load its fields again"
+        with self.assertNumQueries(0):
+            self.field_data_cache.add_blocks_to_cache([mock_block([mock_field(Scope.user_state, 'a_field')])])
+        assert 'a_value' == self.kvs.get(user_state_key('a_field'))
+
+
+class TestBlockStructurePrefetch(TestCase):
+    """Tests for loading the state of the descendants of a block from a block structure"""
+
+    def setUp(self):
+        super().setUp()
+        self.user = UserFactory.create()
+        self.sequence_key = COURSE_KEY.make_usage_key('sequential', 'sequence')
+        self.problem_keys = [LOCATION(f'problem_{index}') for index in range(3)]
+        self.block_structure = BlockStructureBlockData(self.sequence_key)
+        for problem_key in self.problem_keys[:2]:
+            self.block_structure._add_relation(self.sequence_key, problem_key)  # pylint: disable=protected-access
+        for problem_key in self.problem_keys:
+            cmfStudentModuleFactory(
+                student=self.user,
+                course_id=COURSE_KEY,
+                module_state_key=problem_key,
+                state=json.dumps({'a_field': str(problem_key)}),
+            )
+        self.field_data_cache = FieldDataCache([], COURSE_KEY, self.user)
+        self.kvs = DjangoKeyValueStore(self.field_data_cache)
+
+    def _key(self, problem_key):
+        return DjangoKeyValueStore.Key(Scope.user_state, self.user.id, problem_key, 'a_field')
+
+    def test_prefetch_descendants(self):
+        self.field_data_cache.add_block_structure_descendants(self.block_structure, self.sequence_key)
+        with self.assertNumQueries(0):
+            for problem_key in self.problem_keys[:2]:
+                assert str(problem_key) == self.kvs.get(self._key(problem_key))
+                # Blocks that were prefetched are not loaded again when they are bound.
+                self.field_data_cache.add_blocks_to_cache([Mock(
+                    scope_ids=ScopeIds(self.user.id, 'problem', None, problem_key),
+                    location=problem_key,
+                    fields=XBlock.load_class('problem').fields,
+                    has_score=True,
+                )])
+            assert not self.kvs.has(self._key(self.problem_keys[2]))
+        assert self.field_data_cache.scorable_locations == set(self.problem_keys[:2])
+
+    def test_prefetch_mixin_fields(self):
+        StudentInfoFactory.create(student=self.user, field_name='edxnotes_visibility', value=json.dumps(False))
+        self.field_data_cache.add_block_structure_descendants(self.block_structure, self.sequence_key)
+        # The fields that the modulestore's mixins add to the blocks are prefetched too.
+        key = DjangoKeyValueStore.Key(Scope.user_info, self.user.id, None, 'edxnotes_visibility')
+        with self.assertNumQueries(0):
+            assert self.kvs.get(key) is False
+
+    def test_bound_block_with_more_fields(self):
+        self.field_data_cache.add_block_structure_descendants(self.block_structure, self.sequence_key)
+        # A bound block with fields that were not prefetched is loaded again.
+        with self.assertNumQueries(1):
+            self.field_data_cache.add_blocks_to_cache([Mock(
+                scope_ids=ScopeIds(self.user.id, 'problem', None, self.problem_keys[0]),
+                location=self.problem_keys[0],
+                fields={'unknown_field': mock_field(Scope.user_state, 'unknown_field')},
+                has_score=True,
+            )])
+
+    def test_prefetch_missing_block(self):
+        with self.assertNumQueries(0):
+            self.field_data_cache.add_block_structure_descendants(self.block_structure, self.problem_keys[2])
+        assert not self.kvs.has(self._key(self.problem_keys[2]))
+
 
 class TestMissingStudentModule(TestCase):  # lint-amnesty, pylint: disable=missing-class-docstring
     # Tell Django to clean out all databases, not just default
@@ -3,6 +3,8 @@ Black-box tests of the DjangoUserStateClient against the semantics
 defined in edx_user_state_client.
 """
 
+import json
+
 import pytz
 from opaque_keys.edx.locator import BlockUsageLocator, CourseLocator
 from xblock.fields import Scope
@@ -10,12 +12,18 @@ from datetime import datetime
 from unittest import TestCase
 from collections import defaultdict
 from django.db import connections
+from django.test import TestCase as DjangoTestCase
+from django.test.utils import override_settings
+from edx_django_utils.cache import RequestCache
 
 from common.djangoapps.student.tests.factories import UserFactory
+from lms.djangoapps.courseware.models import StudentModule
 from lms.djangoapps.courseware.user_state_client import (
     DjangoXBlockUserStateClient,
     XBlockUserStateClient,
-    XBlockUserState
+    XBlockUserState,
+    flush_write_behind,
+    start_write_behind
 )
 from xmodule.modulestore.tests.django_utils import ModuleStoreTestCase  # lint-amnesty, pylint: disable=wrong-import-order
 
@@ -757,3 +765,57 @@ class TestDjangoUserStateClient(UserStateClientTestBase, ModuleStoreTestCase):
             2. Update the test in the other repo to align with the new functionality
             3. Remove this override to re-enable the working test
         """
+
+
+@override_settings(XBLOCK_USER_STATE_WRITE_BEHIND_BLOCK_TYPES=['video', 'problem'])
+class TestDjangoUserStateClientWriteBehind(DjangoTestCase):
+    """
+    Tests of the user state writes deferred until the end of the request.
+    """
+    # Tell Django to clean out all databases, not just default
+    databases = set(connections)
+
+    def setUp(self):
+        super().setUp()
+        RequestCache.clear_all_namespaces()
+        self.addCleanup(RequestCache.clear_all_namespaces)
+        self.user = UserFactory.create()
+        self.client = DjangoXBlockUserStateClient(self.user)
+        course_key = CourseLocator('org', 'course', 'run')
+        self.video_key = BlockUsageLocator(course_key, 'video', 'video')
+        self.problem_key = BlockUsageLocator(course_key, 'problem', 'problem')
+
+    def _stored_state(self, block_key):
+        return json.loads(StudentModule.objects.get(student=self.user, module_state_key=block_key).state)
+
+    def test_writes_are_coalesced(self):
+        start_write_behind()
+        self.client.set(self.user.username, self.video_key, {'position': 1, 'speed': 1.5})
+        self.client.set(self.user.username, self.video_key, {'position': 2})
+        assert not StudentModule.objects.filter(module_state_key=self.video_key).exists()
+
+        flush_write_behind()
+        assert self._stored_state(self.video_key) == {'position': 2, 'speed': 1.5}
+
+        # Writes are no longer deferred after the flush.
+        self.client.set(self.user.username, self.video_key, {'position': 3})
+        assert self._stored_state(self.video_key) == {'position': 3, 'speed': 1.5}
+
+    def test_existing_state_is_updated(self):
+        self.client.set(self.user.username, self.video_key, {'position': 1, 'speed': 1.5})
+        start_write_behind()
+        self.client.set(self.user.username, self.video_key, {'position': 2})
+        assert self._stored_state(self.video_key) == {'position': 1, 'speed': 1.5}
+
+        # Reads store the pending writes first.
+        assert self.client.get(self.user.username, self.video_key).state == {'position': 2, 'speed': 1.5}
+        assert self._stored_state(self.video_key) == {'position': 2, 'speed': 1.5}
+
+    def test_problem_state_is_written_immediately(self):
+        start_write_behind()
+        self.client.set(self.user.username, self.problem_key, {'attempts': 1})
+        assert self._stored_state(self.problem_key) == {'attempts': 1}
+
+    def test_writes_outside_request(self):
+        self.client.set(self.user.username, self.video_key, {'position': 1})
+        assert self._stored_state(self.video_key) == {'position': 1}
@@ -138,6 +138,19 @@ COURSEWARE_OPTIMIZED_RENDER_XBLOCK = CourseWaffleFlag(
     f'{WAFFLE_FLAG_NAMESPACE}.optimized_render_xblock', __name__
 )
 
+# .. toggle_name: courseware.prefetch_block_structure_state
+# .. toggle_implementation: CourseWaffleFlag
+# .. toggle_default: False
+# .. toggle_description: Waffle flag to load the learner state of a whole unit or sequence in a single round of
+#   queries, using the collected block structure of the course to find the descendants of the rendered block,
+#   instead of loading state as the blocks are discovered while rendering.
+# .. toggle_use_cases: temporary
+# .. toggle_creation_date: 2026-10-18
+# .. toggle_target_removal_date: None
+COURSEWARE_PREFETCH_BLOCK_STRUCTURE_STATE = CourseWaffleFlag(
+    f'{WAFFLE_FLAG_NAMESPACE}.prefetch_block_structure_state', __name__
+)
+
 # .. toggle_name: COURSES_INVITE_ONLY
 # .. toggle_implementation: SettingToggle
 # .. toggle_type: feature_flag
@@ -202,3 +215,10 @@ def courseware_disable_navigation_sidebar_blocks_caching(course_key=None):
     Return whether the courseware.disable_navigation_sidebar_blocks_caching flag is on.
     """
     return COURSEWARE_MICROFRONTEND_NAVIGATION_SIDEBAR_BLOCKS_DISABLE_CACHING.is_enabled(course_key)
+
+
+def courseware_prefetch_block_structure_state(course_key=None):
+    """
+    Return whether the courseware.prefetch_block_structure_state flag is on.
+    """
+    return COURSEWARE_PREFETCH_BLOCK_STRUCTURE_STATE.is_enabled(course_key)
@@ -17,7 +17,9 @@ from django.contrib.auth.models import User  # lint-amnesty, pylint: disable=imp
 from django.core.paginator import Paginator
 from django.db import transaction
 from django.db.utils import IntegrityError
+from django.utils import timezone
 from edx_django_utils import monitoring as monitoring_utils
+from edx_django_utils.cache import RequestCache
 from xblock.fields import Scope
 
 from lms.djangoapps.courseware.models import BaseStudentModuleHistory, StudentModule
@@ -30,6 +32,33 @@ except ImportError:
 
 log = logging.getLogger(__name__)
 
+# Namespace of the request cache holding the user state writes that are
+# deferred until the end of the request.
+WRITE_BEHIND_NAMESPACE = 'xblock_user_state_write_behind'
+PENDING_WRITES_KEY = 'pending_writes'
+
+
+def start_write_behind():
+    """
+    Start deferring the user state writes of the block types configured in
+    XBLOCK_USER_STATE_WRITE_BEHIND_BLOCK_TYPES for the current request.
+
+    Writes to the same block are coalesced, and all deferred writes are
+    stored in bulk by :func:`flush_write_behind`, which must be called
+    before the request ends.
+    """
+    if getattr(settings, 'XBLOCK_USER_STATE_WRITE_BEHIND_BLOCK_TYPES', None):
+        RequestCache(WRITE_BEHIND_NAMESPACE).set(PENDING_WRITES_KEY, {})
+
+
+def flush_write_behind():
+    """
+    Store all user state writes deferred in the current request, and stop
+    deferring writes.
+    """
+    DjangoXBlockUserStateClient().flush_pending_writes()
+    RequestCache(WRITE_BEHIND_NAMESPACE).delete(PENDING_WRITES_KEY)
+
 
 class XBlockUserState(namedtuple('_XBlockUserState', ['username', 'block_key', 'state', 'updated', 'scope'])):
     """
@@ -338,6 +367,105 @@ class DjangoXBlockUserStateClient(XBlockUserStateClient):
         """
         self._nr_block_stat_accumulate(function_name, block_type, stat_name, count)
 
+    def _pending_writes(self):
+        """
+        Return the user state writes deferred in the current request, as a dict
+        mapping usernames to a tuple of the user and a dict mapping UsageKeys to
+        state dicts, or None if writes aren't deferred.
+        """
+        return RequestCache(WRITE_BEHIND_NAMESPACE).data.get(PENDING_WRITES_KEY)
+
+    def _defer_writes(self, user, block_keys_to_state):
+        """
+        Defer the writes of the blocks that are written behind in the current
+        request, overlaying them over the writes already pending for the same
+        blocks.
+
+        Blocks whose state history is saved, such as problems, are always
+        written immediately, so that graded state is stored with its score.
+
+        Returns:
+            dict: The part of ``block_keys_to_state`` that must be written now.
+        """
+        pending_writes = self._pending_writes()
+        if pending_writes is None:
+            return block_keys_to_state
+
+        deferred_block_types = (
+            set(settings.XBLOCK_USER_STATE_WRITE_BEHIND_BLOCK_TYPES) - BaseStudentModuleHistory.HISTORY_SAVING_TYPES
+        )
+        _, user_pending_writes = pending_writes.setdefault(user.username, (user, {}))
+        block_keys_to_write = {}
+        for usage_key, state in block_keys_to_state.items():
+            if usage_key.block_type not in deferred_block_types:
+                block_keys_to_write[usage_key] = state
+            elif usage_key in user_pending_writes:
+                user_pending_writes[usage_key].update(state)
+                self._nr_block_stat_increment('set_many', usage_key.block_type, 'blocks_coalesced')
+            else:
+                user_pending_writes[usage_key] = dict(state)
+                self._nr_block_stat_increment('set_many', usage_key.block_type, 'blocks_deferred')
+        return block_keys_to_write
+
+    def flush_pending_writes(self, username=None):
+        """
+        Store the user state writes deferred in the current request.
+
+        Arguments:
+            username: The name of the user whose writes should be stored. If None,
+                store the writes of all users.
+        """
+        pending_writes = self._pending_writes()
+        if not pending_writes:
+            return
+
+        usernames = list(pending_writes) if username is None else [username]
+        for name in usernames:
+            if name not in pending_writes:
+                continue
+            user, block_keys_to_state = pending_writes.pop(name)
+            if block_keys_to_state:
+                self._write_many(user, block_keys_to_state)
+
+    def _write_many(self, user, block_keys_to_state):
+        """
+        Overlay the given states over the stored states of the user in bulk,
+        with a single query to read the existing rows and one to update and
+        create them each.
+        """
+        self._nr_stat_increment('flush_pending_writes', 'calls')
+        block_keys_to_state = dict(block_keys_to_state)
+        modified = timezone.now()
+        student_modules_to_update = []
+        for student_module, usage_key in self._get_student_modules(user.username, list(block_keys_to_state)):
+            state = block_keys_to_state.pop(usage_key, None)
+            if state is None:
+                continue
+            current_state = json.loads(student_module.state) if student_module.state else {}
+            current_state.update(state)
+            student_module.state = json.dumps(current_state)
+            student_module.modified = modified
+            student_modules_to_update.append(student_module)
+
+        student_modules_to_create = [
+            StudentModule(
+                student=user,
+                course_id=usage_key.context_key,
+                module_state_key=usage_key,
+                module_type=usage_key.block_type,
+                state=json.dumps(state),
+            )
+            for usage_key, state in block_keys_to_state.items()
+        ]
+        with transaction.atomic():
+            StudentModule.objects.bulk_update(student_modules_to_update, ['state', 'modified'])
+            # Rows created by another process in the meantime are ignored, like in set_many.
+            StudentModule.objects.bulk_create(student_modules_to_create, ignore_conflicts=True)
+
+        self._nr_stat_accumulate(
+            'flush_pending_writes', 'blocks_flushed', len(student_modules_to_update) + len(student_modules_to_create)
+        )
+
     def get_many(self, username, block_keys, scope=Scope.user_state, fields=None):
         """
         Retrieve the stored XBlock state for the specified XBlock usages.
@@ -355,6 +483,7 @@ class DjangoXBlockUserStateClient(XBlockUserStateClient):
         if scope != Scope.user_state:
             raise ValueError(f"Only Scope.user_state is supported, not {scope}")
 
+        self.flush_pending_writes(username)
         total_block_count = 0
         evt_time = time()
 
@@ -428,6 +557,7 @@ class DjangoXBlockUserStateClient(XBlockUserStateClient):
             # what we have.
             return
 
+        block_keys_to_state = self._defer_writes(user, block_keys_to_state)
         evt_time = time()
 
         for usage_key, state in block_keys_to_state.items():
@@ -511,6 +641,7 @@ class DjangoXBlockUserStateClient(XBlockUserStateClient):
         if scope != Scope.user_state:
             raise ValueError("Only Scope.user_state is supported")
 
+        self.flush_pending_writes(username)
         evt_time = time()  # lint-amnesty, pylint: disable=unused-variable
         student_modules = self._get_student_modules(username, block_keys)
         for student_module, _ in student_modules:
@@ -549,6 +680,7 @@ class DjangoXBlockUserStateClient(XBlockUserStateClient):
 
         if scope != Scope.user_state:
             raise ValueError("Only Scope.user_state is supported")
+        self.flush_pending_writes(username)
         student_modules = list(
             student_module
             for student_module, usage_id
@@ -600,6 +732,7 @@ class DjangoXBlockUserStateClient(XBlockUserStateClient):
         if scope != Scope.user_state:
             raise ValueError("Only Scope.user_state is supported")
 
+        self.flush_pending_writes()
         results = StudentModule.objects.order_by('id').filter(module_state_key=block_key).select_related('student')
         p = Paginator(results, settings.USER_STATE_BATCH_SIZE)
 
@@ -632,6 +765,7 @@ class DjangoXBlockUserStateClient(XBlockUserStateClient):
         if scope != Scope.user_state:
             raise ValueError("Only Scope.user_state is supported")
 
+        self.flush_pending_writes()
         results = StudentModule.objects.order_by('id').filter(course_id=course_key)
         if block_type:
             results = results.filter(module_type=block_type)
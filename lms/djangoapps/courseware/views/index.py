@@ -35,6 +35,7 @@ from lms.djangoapps.courseware.exceptions import CourseAccessRedirect, Redirect
 from lms.djangoapps.experiments.utils import get_experiment_user_metadata_context
 from lms.djangoapps.gating.api import get_entrance_exam_score, get_entrance_exam_usage_key
 from lms.djangoapps.grades.api import CourseGradeFactory
+from openedx.core.djangoapps.content.block_structure.api import get_course_in_cache
 from openedx.core.djangoapps.content.course_overviews.models import CourseOverview
 from openedx.core.djangoapps.crawlers.models import CrawlersConfig
 from openedx.core.djangoapps.lang_pref import LANGUAGE_KEY
@@ -62,7 +63,7 @@ from ..masquerade import check_content_start_date_for_masquerade_user, setup_mas
 from ..model_data import FieldDataCache
 from ..block_render import get_block_for_descriptor, toc_for_course
 from ..permissions import MASQUERADE_AS_STUDENT
-from ..toggles import ENABLE_OPTIMIZELY_IN_COURSEWARE
+from ..toggles import ENABLE_OPTIMIZELY_IN_COURSEWARE, courseware_prefetch_block_structure_state
 from .views import CourseTabView
 
 log = logging.getLogger("edx.courseware.views.index")
@@ -373,6 +374,10 @@ class CoursewareIndex(View):
         sets up the runtime, which binds the request user to the section.
         """
         # Pre-fetch all descendant data
+        if courseware_prefetch_block_structure_state(self.course_key):
+            self.field_data_cache.add_block_structure_descendants(
+                get_course_in_cache(self.course_key), self.section.location
+            )
         self.section = modulestore().get_item(self.section.location, depth=None, lazy=False)
         self.field_data_cache.add_block_descendents(self.section, depth=None)
 
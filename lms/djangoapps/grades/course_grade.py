@@ -14,7 +14,7 @@ from openedx.core.lib.grade_utils import round_away_from_zero
 from xmodule import block_metadata_utils  # lint-amnesty, pylint: disable=wrong-import-order
 
 from .scores import compute_percent
-from .subsection_grade import ZeroSubsectionGrade
+from .subsection_grade import ReadSubsectionGrade, ZeroSubsectionGrade
 from .subsection_grade_factory import SubsectionGradeFactory
 
 
@@ -352,5 +352,22 @@ class CourseGrade(CourseGradeBase):
         return success_cutoff and percent >= success_cutoff
 
 
+class PersistedCourseGrade(CourseGrade):
+    """
+    Course Grade class for grades read from storage together with the
+    stored grades of their subsections, which are never computed.
+    """
+    def __init__(self, user, course_data, subsection_grade_models, *args, **kwargs):
+        super().__init__(user, course_data, *args, **kwargs)
+        # Stored subsection grades of the user, keyed by subsection location.
+        self._subsection_grade_models = subsection_grade_models
+
+    def _get_subsection_grade(self, subsection, force_update_subsections=False):
+        grade_model = self._subsection_grade_models.get(subsection.location)
+        if grade_model is None:
+            return ZeroSubsectionGrade(subsection, self.course_data)
+        return ReadSubsectionGrade(subsection, grade_model, self._subsection_grade_factory)
+
+
 def _uniqueify_and_keep_order(iterable):
     return list(OrderedDict([(item, None) for item in iterable]).keys())
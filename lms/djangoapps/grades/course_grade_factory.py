@@ -10,8 +10,8 @@ from openedx.core.djangoapps.signals.signals import (
     COURSE_GRADE_NOW_PASSED
 )
 from .course_data import CourseData
-from .course_grade import CourseGrade, ZeroCourseGrade
-from .models import PersistentCourseGrade
+from .course_grade import CourseGrade, PersistedCourseGrade, ZeroCourseGrade
+from .models import PersistentCourseGrade, PersistentSubsectionGrade
 from .models_api import prefetch_grade_overrides_and_visible_blocks
 
 log = getLogger(__name__)
@@ -96,6 +96,66 @@ class CourseGradeFactory:
         for user in users:
             yield self._iter_grade_result(user, course_data, force_update)
 
+    def iter_persisted(
+            self,
+            users,
+            course=None,
+            collected_block_structure=None,
+            course_key=None,
+    ):
+        """
+        Given a course and an iterable of students (User), yield a GradeResult
+        for every student, like iter does, but read the stored course and
+        subsection grades of all the students in bulk, without computing or
+        reading any other grading data.
+
+        Students without a stored grade get a zero grade, as with read.  Only
+        students whose stored grade was computed with a different grading
+        policy are regraded, as with iter(force_update=True).
+        """
+        course_data = CourseData(
+            user=None, course=course, collected_block_structure=collected_block_structure, course_key=course_key,
+        )
+        users = list(users)
+        user_ids = [user.id for user in users]
+        course_grades = PersistentCourseGrade.bulk_read(course_data.course_key, user_ids)
+        subsection_grades = PersistentSubsectionGrade.bulk_read_grades_for_users(course_data.course_key, user_ids)
+        collected_structure = course_data.collected_structure
+        grading_policy_hash = course_data.grading_policy_hash
+
+        for user in users:
+            persistent_grade = course_grades.get(user.id)
+            if persistent_grade is not None and persistent_grade.grading_policy_hash != grading_policy_hash:
+                log.info(
+                    'Grades: Regrading stale grade of user %s in course %s', user.id, course_data.course_key,
+                )
+                yield self._iter_grade_result(user, course_data, force_update=True)
+                continue
+
+            # The chapters and subsections of the stored grades are laid out from the
+            # collected structure, which all the students share, instead of transforming
+            # the course structure for each of them.
+            user_course_data = CourseData(
+                user,
+                course=course_data.course,
+                collected_block_structure=collected_structure,
+                structure=collected_structure,
+                course_key=course_data.course_key,
+            )
+            if persistent_grade is None:
+                course_grade = self._create_zero(user, user_course_data)
+            else:
+                course_grade = PersistedCourseGrade(
+                    user,
+                    user_course_data,
+                    subsection_grades.get(user.id, {}),
+                    persistent_grade.percent_grade,
+                    persistent_grade.letter_grade,
+                    persistent_grade.letter_grade != '',
+                    last_updated=persistent_grade.modified,
+                )
+            yield self.GradeResult(user, course_grade, None)
+
     def _iter_grade_result(self, user, course_data, force_update):  # lint-amnesty, pylint: disable=missing-function-docstring
         try:
             kwargs = {
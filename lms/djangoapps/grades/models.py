@@ -452,6 +452,24 @@ class PersistentSubsectionGrade(TimeStampedModel):
                 course_id=course_key,
             )
 
+    @classmethod
+    def bulk_read_grades_for_users(cls, course_key, user_ids):
+        """
+        Reads all grades of the given users in the given course, with their
+        visible blocks and overrides, streaming them from the database.
+
+        Returns:
+            dict: {user_id: {full usage key of the subsection: grade}}
+        """
+        grades = defaultdict(dict)
+        queryset = cls.objects.select_related('visible_blocks', 'override').filter(
+            user_id__in=user_ids,
+            course_id=course_key,
+        )
+        for grade in queryset.iterator():
+            grades[grade.user_id][grade.full_usage_key] = grade
+        return grades
+
     @classmethod
     def update_or_create_grade(cls, **params):
         """
@@ -630,6 +648,20 @@ class PersistentCourseGrade(TimeStampedModel):
         """
         get_cache(cls._CACHE_NAMESPACE).pop(cls._cache_key(course_key), None)
 
+    @classmethod
+    def bulk_read(cls, course_id, user_ids):
+        """
+        Reads the grades of the given users in the given course.
+
+        Returns:
+            dict: {user_id: grade}
+        """
+        return {
+            grade.user_id: grade
+            for grade in
+            cls.objects.filter(user_id__in=user_ids, course_id=course_id)
+        }
+
     @classmethod
     def read(cls, user_id, course_id):
         """
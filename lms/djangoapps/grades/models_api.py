@@ -27,6 +27,13 @@ def prefetch_course_and_subsection_grades(course_key, users):
     _PersistentSubsectionGrade.prefetch(course_key, users)
 
 
+def get_persisted_course_grades(course_key, user_ids):
+    """
+    Returns a dict of the stored course grades of the given users, keyed by user id.
+    """
+    return _PersistentCourseGrade.bulk_read(course_key, user_ids)
+
+
 def clear_prefetched_course_grades(course_key):
     _PersistentCourseGrade.clear_prefetched_data(course_key)
     _PersistentSubsectionGrade.clear_prefetched_data(course_key)
@@ -11,8 +11,9 @@ from openedx.core.djangoapps.content.block_structure.factory import BlockStructu
 from xmodule.modulestore.tests.django_utils import SharedModuleStoreTestCase  # lint-amnesty, pylint: disable=wrong-import-order
 from xmodule.modulestore.tests.factories import CourseFactory  # lint-amnesty, pylint: disable=wrong-import-order
 
-from ..course_grade import CourseGrade, ZeroCourseGrade
+from ..course_grade import CourseGrade, PersistedCourseGrade, ZeroCourseGrade
 from ..course_grade_factory import CourseGradeFactory
+from ..models import PersistentCourseGrade
 from ..subsection_grade import ReadSubsectionGrade, ZeroSubsectionGrade
 from .base import GradeTestBase
 from .utils import mock_get_score
@@ -158,6 +159,39 @@ class TestCourseGradeFactory(GradeTestBase):
             ))
         assert mock_update.called == force_update
 
+    def test_iter_persisted(self):
+        grade_factory = CourseGradeFactory()
+        with mock_get_score(1, 2):
+            grade_factory.update(self.request.user, self.course, force_update_subsections=True)
+
+        with patch('lms.djangoapps.grades.course_data.get_course_blocks') as mocked_course_blocks:
+            with patch('lms.djangoapps.grades.subsection_grade.get_score') as mocked_get_score:
+                [(user, course_grade, error)] = grade_factory.iter_persisted([self.request.user], course=self.course)
+                assert user == self.request.user
+                assert error is None
+                assert isinstance(course_grade, PersistedCourseGrade)
+                assert course_grade.percent == 0.5
+                assert course_grade.subsection_grade(self.sequence.location).percent_graded == 0.5
+                assert isinstance(course_grade.subsection_grade(self.sequence2.location), ReadSubsectionGrade)
+                # The chapters are laid out from the collected structure.
+                assert course_grade.chapter_grades
+                assert not mocked_get_score.called
+                assert not mocked_course_blocks.called
+
+    def test_iter_persisted_zero(self):
+        [(_, course_grade, error)] = CourseGradeFactory().iter_persisted([self.request.user], course=self.course)
+        assert error is None
+        self._assert_zero_grade(course_grade, ZeroCourseGrade)
+
+    def test_iter_persisted_regrades_stale_grades(self):
+        with mock_get_score(1, 2):
+            CourseGradeFactory().update(self.request.user, self.course, force_update_subsections=True)
+        PersistentCourseGrade.objects.filter(user_id=self.request.user.id).update(grading_policy_hash='stale')
+
+        with patch('lms.djangoapps.grades.subsection_grade_factory.SubsectionGradeFactory.update') as mock_update:
+            list(CourseGradeFactory().iter_persisted([self.request.user], course=self.course))
+        assert mock_update.called
+
     def test_course_grade_summary(self):
         with mock_get_score(1, 2):
             self.subsection_grade_factory.update(self.course_structure[self.sequence.location])
@@ -36,6 +36,44 @@ USE_ON_DISK_GRADE_REPORTING = CourseWaffleFlag(
     f'{WAFFLE_NAMESPACE}.use_on_disk_grade_reporting', __name__
 )
 
+# .. toggle_name: instructor_task.use_sharded_grade_reporting
+# .. toggle_implementation: CourseWaffleFlag
+# .. toggle_default: False
+# .. toggle_description: When generating course grade reports, split the enrolled learners into
+#   ranges of user ids that are graded by parallel subtasks, each uploading a partial report, and
+#   merge the partial reports once all of them are done. See GRADE_REPORT_USERS_PER_SHARD.
+# .. toggle_use_cases: opt_in
+# .. toggle_creation_date: 2026-10-18
+USE_SHARDED_GRADE_REPORTING = CourseWaffleFlag(
+    f'{WAFFLE_NAMESPACE}.use_sharded_grade_reporting', __name__
+)
+
+# .. toggle_name: instructor_task.use_snapshot_grade_reporting
+# .. toggle_implementation: CourseWaffleFlag
+# .. toggle_default: False
+# .. toggle_description: When generating course grade reports, build the rows from the persisted
+#   course and subsection grades of the learners, read in bulk, instead of reading them through the
+#   grading framework. Only learners whose persisted grade is stale (computed with another grading
+#   policy) are regraded. A report can also be requested in this mode with the 'snapshot' task input.
+# .. toggle_use_cases: opt_in
+# .. toggle_creation_date: 2026-10-18
+USE_SNAPSHOT_GRADE_REPORTING = CourseWaffleFlag(
+    f'{WAFFLE_NAMESPACE}.use_snapshot_grade_reporting', __name__
+)
+
+# .. toggle_name: instructor_task.use_streaming_problem_grade_reporting
+# .. toggle_implementation: CourseWaffleFlag
+# .. toggle_default: False
+# .. toggle_description: When generating problem grade reports, read the scores of the learners from
+#   the courseware student module in chunks and write them to a gzipped CSV as they are read, instead
+#   of reading the course grade of every learner. The content visibility of each learner is not
+#   applied: problems a learner cannot see are reported as not attempted rather than not available.
+# .. toggle_use_cases: opt_in
+# .. toggle_creation_date: 2026-10-18
+USE_STREAMING_PROBLEM_GRADE_REPORTING = CourseWaffleFlag(
+    f'{WAFFLE_NAMESPACE}.use_streaming_problem_grade_reporting', __name__
+)
+
 
 def optimize_get_learners_switch_enabled():
     """
@@ -69,3 +107,27 @@ def use_on_disk_grade_reporting(course_id):
     False otherwise.
     """
     return USE_ON_DISK_GRADE_REPORTING.is_enabled(course_id)
+
+
+def use_sharded_grade_reporting(course_id):
+    """
+    Returns True if course grade reports should be generated
+    by parallel subtasks, False otherwise.
+    """
+    return USE_SHARDED_GRADE_REPORTING.is_enabled(course_id)
+
+
+def use_snapshot_grade_reporting(course_id):
+    """
+    Returns True if course grade reports should be built
+    from the persisted grades of the learners, False otherwise.
+    """
+    return USE_SNAPSHOT_GRADE_REPORTING.is_enabled(course_id)
+
+
+def use_streaming_problem_grade_reporting(course_id):
+    """
+    Returns True if problem grade reports should be streamed
+    from the courseware student module, False otherwise.
+    """
+    return USE_STREAMING_PROBLEM_GRADE_REPORTING.is_enabled(course_id)
@@ -136,6 +136,8 @@ class SubtaskStatus:
       'retried_withmax' : number of times the subtask has been retried for conditions that
           should have a maximum count applied
       'state' : celery state of the subtask (e.g. QUEUING, PROGRESS, RETRY, FAILURE, SUCCESS)
+      'send_ms' : total number of milliseconds spent sending, used to measure the latency
+          and throughput of the subtask
 
     Object is not JSON-serializable, so to_dict and from_dict methods are provided so that
     it can be passed as a serializable argument to tasks (and be reconstituted within such tasks).
@@ -145,7 +147,7 @@ class SubtaskStatus:
     Also, we should count up "not attempted" separately from attempted/failed.
     """
 
-    def __init__(self, task_id, attempted=None, succeeded=0, failed=0, skipped=0, retried_nomax=0, retried_withmax=0, state=None):  # lint-amnesty, pylint: disable=line-too-long
+    def __init__(self, task_id, attempted=None, succeeded=0, failed=0, skipped=0, retried_nomax=0, retried_withmax=0, state=None, send_ms=0):  # lint-amnesty, pylint: disable=line-too-long
         """Construct a SubtaskStatus object."""
         self.task_id = task_id
         if attempted is not None:
@@ -158,6 +160,7 @@ class SubtaskStatus:
         self.retried_nomax = retried_nomax
         self.retried_withmax = retried_withmax
         self.state = state if state is not None else QUEUING
+        self.send_ms = send_ms
 
     @classmethod
     def from_dict(cls, d):
@@ -180,7 +183,7 @@ class SubtaskStatus:
         """
         return self.__dict__
 
-    def increment(self, succeeded=0, failed=0, skipped=0, retried_nomax=0, retried_withmax=0, state=None):
+    def increment(self, succeeded=0, failed=0, skipped=0, retried_nomax=0, retried_withmax=0, state=None, send_ms=0):
         """
         Update the result of a subtask with additional results.
 
@@ -193,6 +196,7 @@ class SubtaskStatus:
         self.skipped += skipped
         self.retried_nomax += retried_nomax
         self.retried_withmax += retried_withmax
+        self.send_ms += send_ms
         if state is not None:
             self.state = state
 
@@ -31,7 +31,12 @@ from lms.djangoapps.bulk_email.tasks import perform_delegate_email_batches
 from lms.djangoapps.instructor_task.tasks_base import BaseInstructorTask
 from lms.djangoapps.instructor_task.tasks_helper.certs import generate_students_certificates
 from lms.djangoapps.instructor_task.tasks_helper.enrollments import upload_may_enroll_csv, upload_students_csv
-from lms.djangoapps.instructor_task.tasks_helper.grades import CourseGradeReport, ProblemGradeReport, ProblemResponses
+from lms.djangoapps.instructor_task.tasks_helper.grades import (
+    CourseGradeReport,
+    ProblemGradeReport,
+    ProblemResponses,
+    generate_course_grade_report_shard
+)
 from lms.djangoapps.instructor_task.tasks_helper.misc import (
     cohort_students_and_upload,
     upload_course_survey_report,
@@ -197,6 +202,24 @@ def calculate_grades_csv(entry_id, xblock_instance_args):
     return run_main_task(entry_id, task_fn, action_name)
 
 
+@shared_task
+@set_code_owner_attribute
+def calculate_grades_csv_shard(entry_id, xblock_instance_args, checkpoint_id, shard_index, subtask_status_dict):
+    """
+    Grade the learners of one shard of a sharded course grade report (see
+    ShardedCourseGradeReport), and merge the report once all shards are done.
+    """
+    # Translators: This is a past-tense verb that is inserted into task progress messages as {action}.
+    action_name = gettext_noop('graded')
+    TASK_LOG.info(
+        "Task: %s, InstructorTask ID: %s, Task type: %s, Preparing for shard %s",
+        subtask_status_dict['task_id'], entry_id, action_name, shard_index
+    )
+    return generate_course_grade_report_shard(
+        entry_id, xblock_instance_args, checkpoint_id, shard_index, subtask_status_dict, action_name,
+    )
+
+
 @shared_task(base=BaseInstructorTask)
 @set_code_owner_attribute
 def calculate_problem_grade_report(entry_id, xblock_instance_args):
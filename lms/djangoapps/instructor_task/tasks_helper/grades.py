@@ -3,38 +3,65 @@ Functionality for generating grade reports.
 """
 
 import csv
+import gzip
+import hashlib
+import io
+import json
 import logging
+import os
 import re
+import traceback
 from collections import OrderedDict, defaultdict
+from contextlib import contextmanager
 from datetime import datetime
-from itertools import chain
+from itertools import chain, groupby, islice
+from operator import itemgetter
 from tempfile import TemporaryFile
 
 from time import time
+from uuid import uuid4
 
+from celery.states import FAILURE, SUCCESS
 from django.conf import settings
 from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.files.base import ContentFile
 from lazy import lazy
 from opaque_keys.edx.keys import UsageKey
 from pytz import UTC
 from six.moves import zip_longest
+from submissions import api as submissions_api
 
 from common.djangoapps.course_modes.models import CourseMode
-from common.djangoapps.student.models import CourseEnrollment
+from common.djangoapps.student.models import CourseEnrollment, anonymous_id_for_user
 from common.djangoapps.student.roles import BulkRoleCache
+from common.djangoapps.util.db import outer_atomic
 from lms.djangoapps.certificates import api as certs_api
 from lms.djangoapps.certificates.models import GeneratedCertificate
 from lms.djangoapps.course_blocks.api import get_course_blocks
+from lms.djangoapps.courseware.model_data import ScoresClient
+from lms.djangoapps.courseware.models import StudentModule
 from lms.djangoapps.courseware.user_state_client import DjangoXBlockUserStateClient
 from lms.djangoapps.grades.api import CourseGradeFactory
 from lms.djangoapps.grades.api import context as grades_context
-from lms.djangoapps.grades.api import prefetch_course_and_subsection_grades
+from lms.djangoapps.grades.api import get_persisted_course_grades, prefetch_course_and_subsection_grades
+from lms.djangoapps.grades.api import scores as grades_scores
 from lms.djangoapps.instructor_analytics.basic import list_problem_responses
 from lms.djangoapps.instructor_analytics.csvs import format_dictlist
 from lms.djangoapps.instructor_task.config.waffle import (
     course_grade_report_verified_only,
     problem_grade_report_verified_only,
     use_on_disk_grade_reporting,
+    use_sharded_grade_reporting,
+    use_snapshot_grade_reporting,
+    use_streaming_problem_grade_reporting,
+)
+from lms.djangoapps.instructor_task.models import InstructorTask, ReportStore
+from lms.djangoapps.instructor_task.subtasks import (
+    SubtaskStatus,
+    check_subtask_is_valid,
+    initialize_subtask_info,
+    update_subtask_status,
 )
 from lms.djangoapps.teams.models import CourseTeamMembership
 from lms.djangoapps.verify_student.services import IDVerificationService
@@ -48,7 +75,11 @@ from xmodule.partitions.partitions_service import PartitionService  # lint-amnes
 from xmodule.split_test_block import get_split_user_partitions  # lint-amnesty, pylint: disable=wrong-import-order
 
 from .runner import TaskProgress
-from .utils import upload_csv_to_report_store, upload_csv_file_to_report_store
+from .utils import (
+    upload_csv_file_to_report_store,
+    upload_csv_to_report_store,
+    upload_gzip_csv_file_to_report_store,
+)
 
 TASK_LOG = logging.getLogger('edx.celery.task')
 
@@ -98,6 +129,7 @@ class _CourseGradeReportContext:
         self.report_for_verified_only = course_grade_report_verified_only(self.course_id)
         self.upload_parent_dir = _task_input.get('upload_parent_dir', '')
         self.upload_filename = _task_input.get('filename', 'grade_report')
+        self.use_snapshot = _task_input.get('snapshot', False) or use_snapshot_grade_reporting(self.course_id)
 
     @lazy
     def course(self):
@@ -272,7 +304,9 @@ class _CourseGradeBulkContext:  # lint-amnesty, pylint: disable=missing-class-do
         self.enrollments = _EnrollmentBulkContext(context, users)
         bulk_cache_cohorts(context.course_id, users)
         BulkRoleCache.prefetch(users)
-        prefetch_course_and_subsection_grades(context.course_id, users)
+        if not context.use_snapshot:
+            # Snapshot reports read the stored grades in bulk themselves.
+            prefetch_course_and_subsection_grades(context.course_id, users)
         BulkCourseTags.prefetch(context.course_id, users)
 
 
@@ -443,7 +477,30 @@ class GradeReportBase:
         TASK_LOG.info('%s, Task type: %s, %s, %s', task_info_string, self.context.action_name,
                       message, self.context.task_progress.state)
 
-    def _batch_users(self):
+    def _enrolled_learners(self, user_id_range=None):
+        """
+        Returns a queryset of the users enrolled in the course for this report.
+
+        Arguments:
+            user_id_range (tuple): Optional (lower, upper) bounds on the user ids,
+                where lower is inclusive, upper is exclusive and either may be None.
+        """
+        filter_kwargs = {
+            'courseenrollment__course_id': self.context.course_id,
+        }
+        if self.context.report_for_verified_only:
+            filter_kwargs['courseenrollment__mode'] = CourseMode.VERIFIED
+
+        learners = get_user_model().objects.filter(**filter_kwargs)
+        if user_id_range is not None:
+            lower_id, upper_id = user_id_range
+            if lower_id is not None:
+                learners = learners.filter(id__gte=lower_id)
+            if upper_id is not None:
+                learners = learners.filter(id__lt=upper_id)
+        return learners
+
+    def _batch_users(self, user_id_range=None):
         """
         Returns a generator of batches of users.
         """
@@ -451,36 +508,26 @@ class GradeReportBase:
             args = [iter(iterable)] * chunk_size
             return zip_longest(*args, fillvalue=fillvalue)
 
-        def get_enrolled_learners_for_course(course_id, verified_only=False):
+        def get_enrolled_learners_for_course(learners):
             """
             Get all the enrolled users in a course chunk by chunk.
             This generator method fetches & loads the enrolled user objects on demand which in chunk
             size defined. This method is a workaround to avoid out-of-memory errors.
             """
-            filter_kwargs = {
-                'courseenrollment__course_id': course_id,
-            }
-            if verified_only:
-                filter_kwargs['courseenrollment__mode'] = CourseMode.VERIFIED
-
-            user_ids_list = get_user_model().objects.filter(**filter_kwargs).values_list('id', flat=True).order_by('id')
+            user_ids_list = learners.values_list('id', flat=True).order_by('id')
             user_chunks = grouper(user_ids_list)
             for user_ids in user_chunks:
                 user_ids = [user_id for user_id in user_ids if user_id is not None]
                 min_id = min(user_ids)
                 max_id = max(user_ids)
-                users = get_user_model().objects.filter(
+                users = learners.filter(
                     id__gte=min_id,
                     id__lte=max_id,
-                    **filter_kwargs
                 ).select_related('profile')
 
                 yield users
 
-        return get_enrolled_learners_for_course(
-            course_id=self.context.course_id,
-            verified_only=self.context.report_for_verified_only
-        )
+        return get_enrolled_learners_for_course(self._enrolled_learners(user_id_range))
 
     def log_additional_info_for_testing(self, message):
         """
@@ -496,11 +543,11 @@ class GradeReportBase:
         been processed
         """
 
-    def _batched_rows(self):
+    def _batched_rows(self, user_id_range=None):
         """
         A generator of batches of (success_rows, error_rows) for this report.
         """
-        for users in self._batch_users():
+        for users in self._batch_users(user_id_range):
             yield self._rows_for_users(users)
             self._clear_caches()
 
@@ -519,6 +566,8 @@ class CourseGradeReport(GradeReportBase):
         """
         with modulestore().bulk_operations(course_id):
             context = _CourseGradeReportContext(_xblock_instance_args, _entry_id, course_id, _task_input, action_name)
+            if _entry_id is not None and use_sharded_grade_reporting(course_id):
+                return ShardedCourseGradeReport(context).queue_shards(_entry_id, _xblock_instance_args)
             if use_on_disk_grade_reporting(course_id):  # AU-926
                 return TempFileCourseGradeReport(context)._generate()  # pylint: disable=protected-access
             else:
@@ -564,13 +613,23 @@ class CourseGradeReport(GradeReportBase):
         with modulestore().bulk_operations(self.context.course_id):
             bulk_context = _CourseGradeBulkContext(self.context, users)
 
+            if self.context.use_snapshot:
+                grade_results = CourseGradeFactory().iter_persisted(
+                    users,
+                    course=self.context.course,
+                    collected_block_structure=self.context.course_structure,
+                    course_key=self.context.course_id,
+                )
+            else:
+                grade_results = CourseGradeFactory().iter(
+                    users,
+                    course=self.context.course,
+                    collected_block_structure=self.context.course_structure,
+                    course_key=self.context.course_id,
+                )
+
             success_rows, error_rows = [], []
-            for user, course_grade, error in CourseGradeFactory().iter(
-                users,
-                course=self.context.course,
-                collected_block_structure=self.context.course_structure,
-                course_key=self.context.course_id,
-            ):
+            for user, course_grade, error in grade_results:
                 if not course_grade:
                     # An empty gradeset means we failed to grade a student.
                     error_rows.append([user.id, user.username, str(error)])
@@ -706,6 +765,315 @@ class TempFileCourseGradeReport(CourseGradeReport, TemporaryFileReportMixin):
     """ Course Grade Report that writes file iteratively to a TempFile to then be uploaded """
 
 
+class _GradeReportCheckpoint:
+    """
+    The partial reports of a sharded course grade report.
+
+    Each shard covers a range of user ids and uploads its rows, without
+    headers, to a directory of the report store that is not listed with
+    the course's reports.  The shard ranges are kept in a manifest next to
+    them, and the django cache points to the checkpoint of the last report
+    that has not been merged yet, so that a report whose shards failed
+    can be resumed by requesting it again: only the shards without a
+    partial report are graded again.
+    """
+    MANIFEST_FILENAME = 'manifest.json'
+
+    def __init__(self, context, checkpoint_id, shards):
+        self.context = context
+        self.checkpoint_id = checkpoint_id
+        # List of [lower user id, upper user id, number of users] of each
+        # shard, with the lower bound inclusive and the upper one exclusive.
+        self.shards = shards
+        self.report_store = ReportStore.from_config('GRADES_DOWNLOAD')
+        self.directory = os.path.join(
+            self.report_store.path_to(context.course_id, parent_dir=context.upload_parent_dir),
+            'grade_report_shards',
+            checkpoint_id,
+        )
+
+    @classmethod
+    def create(cls, context, checkpoint_id, shards):
+        """
+        Stores and returns a new checkpoint for the given shards.
+        """
+        checkpoint = cls(context, checkpoint_id, shards)
+        checkpoint._store(cls.MANIFEST_FILENAME, ContentFile(json.dumps({'shards': shards})))
+        cache.set(cls._cache_key(context), checkpoint_id, settings.GRADE_REPORT_CHECKPOINT_TIMEOUT)
+        return checkpoint
+
+    @classmethod
+    def load(cls, context, checkpoint_id=None):
+        """
+        Returns the given checkpoint, or by default the last one that was not
+        merged for the report of the given context, if any.
+        """
+        checkpoint_id = checkpoint_id or cache.get(cls._cache_key(context))
+        if not checkpoint_id:
+            return None
+        checkpoint = cls(context, checkpoint_id, [])
+        try:
+            with checkpoint.report_store.storage.open(checkpoint._path(cls.MANIFEST_FILENAME)) as manifest_file:
+                checkpoint.shards = json.loads(manifest_file.read())['shards']
+        except (OSError, ValueError):
+            TASK_LOG.warning(
+                '%s, Ignoring unreadable grade report checkpoint %s', context.task_info_string, checkpoint_id,
+            )
+            return None
+        return checkpoint
+
+    @staticmethod
+    def _cache_key(context):
+        """
+        Returns the cache key pointing to the checkpoint for the report of the given context.
+        """
+        report_key = hashlib.sha1(json.dumps(
+            [
+                str(context.course_id),
+                context.upload_parent_dir,
+                context.upload_filename,
+                context.report_for_verified_only,
+                context.use_snapshot,
+            ]
+        ).encode('utf-8')).hexdigest()
+        return f'instructor_task.grade_report_checkpoint.{report_key}'
+
+    @property
+    def merge_lock_key(self):
+        """
+        Returns the cache key locking the merge of this checkpoint, which any
+        task resuming the same report can attempt.
+        """
+        return f'{self._cache_key(self.context)}.merge.{self.checkpoint_id}'
+
+    def _path(self, filename):
+        return self.report_store.path_to(self.context.course_id, filename, self.directory)
+
+    def _store(self, filename, buff):
+        """
+        Stores the given file in the checkpoint's directory, replacing any
+        earlier version of it, which storages would otherwise keep under
+        the original name.
+        """
+        path = self._path(filename)
+        if self.report_store.storage.exists(path):
+            self.report_store.storage.delete(path)
+        self.report_store.store(self.context.course_id, filename, buff, self.directory)
+
+    def _shard_filename(self, index, errors=False):
+        return 'shard-{index:05d}{suffix}.csv'.format(index=index, suffix='_err' if errors else '')
+
+    def is_shard_complete(self, index):
+        """
+        Returns whether the partial report of the given shard was stored.
+        """
+        return self.report_store.storage.exists(self._path(self._shard_filename(index)))
+
+    def is_complete(self):
+        """
+        Returns whether the partial reports of all the shards were stored.
+        """
+        return all(self.is_shard_complete(index) for index in range(len(self.shards)))
+
+    def store_shard(self, index, success_file, error_file):
+        """
+        Stores the partial report of the given shard.  The error rows are stored
+        first, so a shard counts as complete only once both files are stored.
+        """
+        error_file.seek(0)
+        self._store(self._shard_filename(index, errors=True), error_file)
+        success_file.seek(0)
+        self._store(self._shard_filename(index), success_file)
+
+    def copy_shard(self, index, output_file, errors=False):
+        """
+        Appends the partial report of the given shard to output_file, and
+        returns whether it had any rows.
+        """
+        with self.report_store.storage.open(self._path(self._shard_filename(index, errors))) as shard_file:
+            contents = shard_file.read()
+        if isinstance(contents, bytes):
+            contents = contents.decode('utf-8')
+        output_file.write(contents)
+        return bool(contents)
+
+    def delete(self):
+        """
+        Deletes the partial reports and manifest of this checkpoint.
+        """
+        storage = self.report_store.storage
+        for index in range(len(self.shards)):
+            for errors in (False, True):
+                path = self._path(self._shard_filename(index, errors))
+                if storage.exists(path):
+                    storage.delete(path)
+        storage.delete(self._path(self.MANIFEST_FILENAME))
+        if cache.get(self._cache_key(self.context)) == self.checkpoint_id:
+            cache.delete(self._cache_key(self.context))
+
+
+class ShardedCourseGradeReport(CourseGradeReport, TemporaryFileReportMixin):
+    """
+    Course Grade Report whose learners are graded by parallel subtasks.
+
+    The enrolled learners are split into ranges of user ids, each graded by a
+    calculate_grades_csv_shard subtask whose progress is tracked by the
+    instructor_task.subtasks framework.  The last shard to complete merges the
+    partial reports into the final one (see _GradeReportCheckpoint).
+    """
+
+    def queue_shards(self, entry_id, xblock_instance_args):
+        """
+        Queues a subtask for each shard of the report that is not complete yet, and
+        returns the progress of the task.  Courses with no more than one shard of
+        learners are graded right away instead.
+        """
+        from lms.djangoapps.instructor_task.tasks import calculate_grades_csv_shard
+
+        entry = InstructorTask.objects.get(pk=entry_id)
+        if len(entry.subtasks) > 0 and len(entry.task_output) > 0:
+            # The task was requeued after its shards were already queued.
+            TASK_LOG.warning('%s, Shards were already queued', self.context.task_info_string)
+            return json.loads(entry.task_output)
+
+        checkpoint = _GradeReportCheckpoint.load(self.context)
+        if checkpoint is not None:
+            self.context.update_status(f'Resuming grade report from checkpoint {checkpoint.checkpoint_id}')
+        else:
+            shards = self._shard_ranges()
+            if len(shards) <= 1:
+                return TempFileCourseGradeReport(self.context)._generate()  # pylint: disable=protected-access
+            checkpoint = _GradeReportCheckpoint.create(self.context, entry.task_id, shards)
+
+        pending_shards = [
+            index for index in range(len(checkpoint.shards)) if not checkpoint.is_shard_complete(index)
+        ]
+        if not pending_shards:
+            return self.merge_shards(checkpoint)
+
+        subtask_ids = [str(uuid4()) for _ in pending_shards]
+        num_users = sum(checkpoint.shards[index][2] for index in pending_shards)
+        with outer_atomic():
+            progress = initialize_subtask_info(entry, self.context.action_name, num_users, subtask_ids)
+
+        self.context.update_status(f'Queueing {len(pending_shards)} grade report shards for {num_users} learners')
+        for index, subtask_id in zip(pending_shards, subtask_ids):
+            subtask_status = SubtaskStatus.create(subtask_id)
+            calculate_grades_csv_shard.apply_async(
+                (entry_id, xblock_instance_args, checkpoint.checkpoint_id, index, subtask_status.to_dict()),
+                task_id=subtask_id,
+            )
+        return progress
+
+    def generate_shard(self, checkpoint, index):
+        """
+        Grades the learners of the given shard and stores its partial report.
+
+        Returns:
+            tuple (int, int): The number of rows that succeeded and failed.
+        """
+        lower_id, upper_id, __ = checkpoint.shards[index]
+        succeeded, failed = 0, 0
+        with TemporaryFile('r+') as success_file, TemporaryFile('r+') as error_file:
+            success_writer = csv.writer(success_file)
+            error_writer = csv.writer(error_file)
+            for success_rows, error_rows in self._batched_rows(user_id_range=(lower_id, upper_id)):
+                success_writer.writerows(success_rows)
+                error_writer.writerows(error_rows)
+                succeeded += len(success_rows)
+                failed += len(error_rows)
+            checkpoint.store_shard(index, success_file, error_file)
+        return succeeded, failed
+
+    def merge_shards(self, checkpoint):
+        """
+        Uploads the final report built from the partial reports of all the shards,
+        then deletes the checkpoint.  Does nothing if another task is already
+        merging them.
+        """
+        if not cache.add(checkpoint.merge_lock_key, 'true', 60 * 60):
+            return self.context.update_status('Grade report shards are merged by another task')
+
+        self.context.update_status('Merging grade report shards')
+        try:
+            with TemporaryFile('r+') as success_file, TemporaryFile('r+') as error_file:
+                csv.writer(success_file).writerow(self._success_headers())
+                csv.writer(error_file).writerow(self._error_headers())
+                has_errors = False
+                for index in range(len(checkpoint.shards)):
+                    checkpoint.copy_shard(index, success_file)
+                    has_errors = checkpoint.copy_shard(index, error_file, errors=True) or has_errors
+                self.upload_temp_files(success_file, error_file, has_errors)
+        except Exception:
+            # Let a retry, or a resumed report, merge the shards again.
+            cache.delete(checkpoint.merge_lock_key)
+            raise
+        checkpoint.delete()
+        return self.context.update_status('Merged grade report shards')
+
+    def _shard_ranges(self):
+        """
+        Returns the [lower user id, upper user id, number of users] of each shard,
+        covering all user ids so that learners who enroll later are graded by
+        the shards that are resumed.
+        """
+        user_ids = list(self._enrolled_learners().values_list('id', flat=True).order_by('id'))
+        users_per_shard = settings.GRADE_REPORT_USERS_PER_SHARD
+        bounds = user_ids[users_per_shard::users_per_shard]
+        return [
+            [lower_id, upper_id, min(users_per_shard, len(user_ids) - index * users_per_shard)]
+            for index, (lower_id, upper_id) in enumerate(zip([None] + bounds, bounds + [None]))
+        ]
+
+
+def generate_course_grade_report_shard(
+    entry_id, xblock_instance_args, checkpoint_id, shard_index, subtask_status_dict, action_name
+):
+    """
+    Grades a single shard of a sharded course grade report, and merges the
+    report if it is the last shard to complete successfully.
+    """
+    subtask_status = SubtaskStatus.from_dict(subtask_status_dict)
+    current_task_id = subtask_status.task_id
+    check_subtask_is_valid(entry_id, current_task_id, subtask_status)
+
+    entry = InstructorTask.objects.get(pk=entry_id)
+    with modulestore().bulk_operations(entry.course_id):
+        context = _CourseGradeReportContext(
+            xblock_instance_args, entry_id, entry.course_id, json.loads(entry.task_input), action_name,
+        )
+        report = ShardedCourseGradeReport(context)
+        checkpoint = _GradeReportCheckpoint.load(context, checkpoint_id)
+        try:
+            if checkpoint is None:
+                raise ValueError(f'Grade report checkpoint {checkpoint_id} not found')
+            succeeded, failed = report.generate_shard(checkpoint, shard_index)
+        except Exception:
+            TASK_LOG.exception('%s, Grade report shard %s failed', context.task_info_string, shard_index)
+            subtask_status.increment(state=FAILURE)
+            update_subtask_status(entry_id, current_task_id, subtask_status)
+            raise
+
+        # The report is merged before this shard is recorded as successful,
+        # since recording the last shard marks the whole task as successful.
+        if checkpoint.is_complete():
+            try:
+                report.merge_shards(checkpoint)
+            except Exception as exc:
+                TASK_LOG.exception('%s, Merging the grade report shards failed', context.task_info_string)
+                subtask_status.increment(state=FAILURE)
+                update_subtask_status(entry_id, current_task_id, subtask_status)
+                entry = InstructorTask.objects.get(pk=entry_id)
+                entry.task_state = FAILURE
+                entry.task_output = InstructorTask.create_output_for_failure(exc, traceback.format_exc())
+                entry.save_now()
+                raise
+
+        subtask_status.increment(succeeded=succeeded, failed=failed, state=SUCCESS)
+        update_subtask_status(entry_id, current_task_id, subtask_status)
+    return subtask_status.to_dict()
+
+
 class ProblemGradeReport(GradeReportBase):
     """
     Class to encapsulate functionality related to generating user/row had header data for Problem Grade Reports.
@@ -718,6 +1086,8 @@ class ProblemGradeReport(GradeReportBase):
         """
         with modulestore().bulk_operations(course_id):
             context = _ProblemGradeReportContext(_xblock_instance_args, _entry_id, course_id, _task_input, action_name)
+            if use_streaming_problem_grade_reporting(course_id):
+                return StreamingProblemGradeReport(context)._generate()  # pylint: disable=protected-access
             if use_on_disk_grade_reporting(course_id):  # AU-926
                 return TempFileProblemGradeReport(context)._generate()  # pylint: disable=protected-access
             else:
@@ -767,17 +1137,10 @@ class ProblemGradeReport(GradeReportBase):
                 )
                 continue
 
-            earned_possible_values = []
-            for block_location in self.context.graded_scorable_blocks_header:
-                try:
-                    problem_score = course_grade.problem_scores[block_location]
-                except KeyError:
-                    earned_possible_values.append(['Not Available', 'Not Available'])
-                else:
-                    if problem_score.first_attempted:
-                        earned_possible_values.append([problem_score.earned, problem_score.possible])
-                    else:
-                        earned_possible_values.append(['Not Attempted', problem_score.possible])
+            earned_possible_values = [
+                self._earned_possible_values(course_grade.problem_scores.get(block_location))
+                for block_location in self.context.graded_scorable_blocks_header
+            ]
 
             enrollment_status = _user_enrollment_status(student, self.context.course_id)
             success_rows.append(
@@ -788,6 +1151,18 @@ class ProblemGradeReport(GradeReportBase):
 
         return success_rows, error_rows
 
+    @staticmethod
+    def _earned_possible_values(problem_score):
+        """
+        Returns the earned and possible values of the given problem score,
+        which is None if the problem is not available to the user.
+        """
+        if problem_score is None:
+            return ['Not Available', 'Not Available']
+        if problem_score.first_attempted:
+            return [problem_score.earned, problem_score.possible]
+        return ['Not Attempted', problem_score.possible]
+
     def _clear_caches(self):
         get_cache('get_enrollment').clear()
         get_cache(CourseEnrollment.MODE_CACHE_NAMESPACE).clear()
@@ -801,6 +1176,174 @@ class TempFileProblemGradeReport(ProblemGradeReport, TemporaryFileReportMixin):
     """ Program Grade Report that writes file iteratively to a TempFile to then be uploaded """
 
 
+@contextmanager
+def _gzip_csv_writer(fileobj):
+    """
+    Returns a CSV writer that gzips the rows into the given binary file.
+    """
+    with gzip.GzipFile(fileobj=fileobj, mode='wb') as gzip_file:
+        with io.TextIOWrapper(gzip_file, encoding='utf-8', newline='') as text_file:
+            yield csv.writer(text_file)
+
+
+class StreamingProblemGradeReport(ProblemGradeReport):
+    """
+    Problem Grade Report that reads the scores of the learners straight from
+    the courseware student module, a chunk of learners at a time, instead of
+    reading the course grade of every learner.  Each chunk's scores are streamed
+    from a database cursor ordered by learner, pivoted into rows one learner at
+    a time and written to gzipped temp files, so the memory used does not grow
+    with the number of learners or problems.
+
+    The problems are those of the collected course structure: unlike the other
+    problem grade reports, the content visibility of each learner is not
+    applied, so problems a learner cannot see are reported as not attempted.
+    """
+    # Number of learners whose scores are read with a single query.
+    USERS_PER_QUERY = 1000
+    # Number of student module rows fetched from the database cursor at a time.
+    ROWS_PER_FETCH = 2000
+
+    def _generate(self):
+        """
+        Generates and uploads the gzipped CSVs of the report.
+        """
+        self.context.update_status('StreamingProblemGradeReport - 1: Starting problem grade report')
+        succeeded, failed = 0, 0
+        with TemporaryFile() as success_file, TemporaryFile() as error_file:
+            with _gzip_csv_writer(success_file) as success_writer, _gzip_csv_writer(error_file) as error_writer:
+                success_writer.writerow(self._success_headers())
+                error_writer.writerow(self._error_headers())
+
+                self.context.update_status('StreamingProblemGradeReport - 2: Writing scores into temp files')
+                for users in self._user_chunks():
+                    for row, error in self._rows_for_user_chunk(users):
+                        if error:
+                            error_writer.writerow(row)
+                            failed += 1
+                        else:
+                            success_writer.writerow(row)
+                            succeeded += 1
+
+            self.context.task_progress.succeeded = succeeded
+            self.context.task_progress.failed = failed
+            self.context.task_progress.attempted = succeeded + failed
+            self.context.task_progress.total = self.context.task_progress.attempted
+
+            self.context.update_status('StreamingProblemGradeReport - 3: Uploading files')
+            date = datetime.now(UTC)
+            upload_gzip_csv_file_to_report_store(
+                success_file,
+                self.context.upload_filename,
+                self.context.course_id,
+                date,
+                parent_dir=self.context.upload_parent_dir,
+            )
+            if failed:
+                upload_gzip_csv_file_to_report_store(
+                    error_file,
+                    self.context.upload_filename + '_err',
+                    self.context.course_id,
+                    date,
+                    parent_dir=self.context.upload_parent_dir,
+                )
+
+        return self.context.update_status('StreamingProblemGradeReport - 4: Completed problem grades')
+
+    def _user_chunks(self):
+        """
+        Returns a generator of lists of the (id, email, username) of the learners, in order of id.
+        """
+        users = self._enrolled_learners().order_by('id').values_list('id', 'email', 'username').iterator(
+            chunk_size=self.USERS_PER_QUERY,
+        )
+        while True:
+            chunk = list(islice(users, self.USERS_PER_QUERY))
+            if not chunk:
+                return
+            yield chunk
+
+    def _rows_for_user_chunk(self, users):
+        """
+        Returns a generator of (row, is_error) for the given chunk of learners.
+        """
+        user_ids = [user_id for user_id, __, __ in users]
+        course_grades = get_persisted_course_grades(self.context.course_id, user_ids)
+        active_user_ids = set(
+            CourseEnrollment.objects.filter(
+                course_id=self.context.course_id, user_id__in=user_ids, is_active=True,
+            ).values_list('user_id', flat=True)
+        )
+        submissions_users = get_user_model().objects.in_bulk(user_ids) if self._has_submissions_scores else {}
+
+        scores_by_user = groupby(self._student_module_scores(user_ids), key=itemgetter(0))
+        next_user_scores = next(scores_by_user, None)
+        for user_id, email, username in users:
+            csm_scores = {}
+            if next_user_scores is not None and next_user_scores[0] == user_id:
+                csm_scores = {
+                    location: ScoresClient.Score(correct, total, created)
+                    for __, location, correct, total, created in next_user_scores[1]
+                }
+                next_user_scores = next(scores_by_user, None)
+
+            try:
+                submissions_scores = {}
+                if user_id in submissions_users:
+                    submissions_scores = submissions_api.get_scores(
+                        str(self.context.course_id),
+                        anonymous_id_for_user(submissions_users[user_id], self.context.course_id),
+                    )
+                earned_possible_values = [
+                    self._earned_possible_values(grades_scores.get_score(submissions_scores, csm_scores, None, block))
+                    for block in self._scorable_blocks
+                ]
+            except Exception as error:  # pylint: disable=broad-except
+                TASK_LOG.exception(
+                    '%s, Cannot read the scores of user %s', self.context.task_info_string, user_id,
+                )
+                yield [user_id, email, username, str(error) or 'Unknown error'], True
+                continue
+
+            course_grade = course_grades.get(user_id)
+            enrollment_status = ENROLLED_IN_COURSE if user_id in active_user_ids else NOT_ENROLLED_IN_COURSE
+            yield (
+                [user_id, email, username] +
+                [enrollment_status, course_grade.percent_grade if course_grade else 0.0] +
+                _flatten(earned_possible_values)
+            ), False
+
+    def _student_module_scores(self, user_ids):
+        """
+        Returns a generator of the (user id, location, grade, max grade, created) of
+        the scorable blocks of the given learners, in order of user id, streamed
+        from the database.
+        """
+        student_modules = StudentModule.objects.filter(
+            course_id=self.context.course_id,
+            student_id__in=user_ids,
+            module_state_key__in=list(self.context.graded_scorable_blocks_header),
+        ).order_by('student_id').values_list('student_id', 'module_state_key', 'grade', 'max_grade', 'created')
+        for user_id, location, correct, total, created in student_modules.iterator(chunk_size=self.ROWS_PER_FETCH):
+            # Locations in StudentModule don't necessarily have course key info attached to them.
+            yield user_id, location.map_into_course(self.context.course_id), correct, total, created
+
+    @lazy
+    def _scorable_blocks(self):
+        """
+        Returns the collected blocks of the problems of the report, in the order of its columns.
+        """
+        return [self.context.course_structure[location] for location in self.context.graded_scorable_blocks_header]
+
+    @lazy
+    def _has_submissions_scores(self):
+        """
+        Returns whether the course has scorable blocks other than capa problems, which
+        may store their scores with the submissions API rather than the student module.
+        """
+        return any(location.block_type != 'problem' for location in self.context.graded_scorable_blocks_header)
+
+
 class ProblemResponses:
     """
     Class to encapsulate functionality related to generating Problem Responses Reports.
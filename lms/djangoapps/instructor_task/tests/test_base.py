@@ -4,6 +4,7 @@ Base test classes for LMS instructor-initiated background tasks
 """
 
 
+import gzip
 import json
 # pylint: disable=attribute-defined-outside-init
 import os
@@ -351,6 +352,8 @@ class TestReportMixin:
         report_csv_filename = report_store.links_for(self.course.id)[file_index][0]
         report_path = report_store.path_to(self.course.id, report_csv_filename)
         with report_store.storage.open(report_path) as csv_file:
+            if report_csv_filename.endswith('.gz'):
+                csv_file = gzip.GzipFile(fileobj=csv_file)
             # Expand the dict reader generator so we don't lose it's content
             csv_rows = list(unicodecsv.DictReader(csv_file, encoding='utf-8-sig'))
 
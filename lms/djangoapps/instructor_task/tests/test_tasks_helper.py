@@ -7,6 +7,7 @@ Unit tests for LMS instructor-initiated background tasks helper functions.
 """
 
 
+import json
 import os
 import shutil
 import tempfile
@@ -14,11 +15,14 @@ from collections import OrderedDict
 from contextlib import ExitStack, contextmanager
 from datetime import datetime, timedelta
 from unittest.mock import ANY, MagicMock, Mock, patch
+from uuid import uuid4
 
 import ddt
 import pytest
 import unicodecsv
+from celery.states import FAILURE, SUCCESS
 from django.conf import settings
+from django.core.cache import cache
 from django.test.utils import override_settings
 from edx_django_utils.cache import RequestCache
 from freezegun import freeze_time
@@ -39,6 +43,7 @@ from lms.djangoapps.grades.models import PersistentCourseGrade, PersistentSubsec
 from lms.djangoapps.grades.subsection_grade import CreateSubsectionGrade
 from lms.djangoapps.grades.transformer import GradesTransformer
 from lms.djangoapps.instructor_analytics.basic import UNAVAILABLE, list_problem_responses
+from lms.djangoapps.instructor_task.data import InstructorTaskTypes
 from lms.djangoapps.instructor_task.tasks_helper.certs import generate_students_certificates
 from lms.djangoapps.instructor_task.tasks_helper.enrollments import upload_may_enroll_csv, upload_students_csv
 from lms.djangoapps.instructor_task.tasks_helper.grades import (
@@ -47,6 +52,8 @@ from lms.djangoapps.instructor_task.tasks_helper.grades import (
     CourseGradeReport,
     ProblemGradeReport,
     ProblemResponses,
+    ShardedCourseGradeReport,
+    StreamingProblemGradeReport,
 )
 from lms.djangoapps.instructor_task.tasks_helper.misc import (
     cohort_students_and_upload,
@@ -55,6 +62,7 @@ from lms.djangoapps.instructor_task.tasks_helper.misc import (
     upload_ora2_submission_files,
     upload_ora2_summary
 )
+from lms.djangoapps.instructor_task.tests.factories import InstructorTaskFactory
 from lms.djangoapps.instructor_task.tests.test_base import (
     InstructorTaskCourseTestCase,
     InstructorTaskModuleTestCase,
@@ -75,7 +83,7 @@ from xmodule.partitions.partitions import Group, UserPartition  # lint-amnesty,
 # noinspection PyUnresolvedReferences
 from xmodule.tests.helpers import override_descriptor_system  # pylint: disable=unused-import
 
-from ..models import ReportStore
+from ..models import InstructorTask, ReportStore
 from ..tasks_helper.utils import UPDATE_STATUS_FAILED, UPDATE_STATUS_SUCCEEDED
 
 _TEAMS_CONFIG = TeamsConfig({
@@ -83,6 +91,10 @@ _TEAMS_CONFIG = TeamsConfig({
     'topics': [{'id': 'topic', 'name': 'Topic', 'description': 'A Topic'}],
 })
 USE_ON_DISK_GRADE_REPORT = 'lms.djangoapps.instructor_task.tasks_helper.grades.use_on_disk_grade_reporting'
+USE_SHARDED_GRADE_REPORT = 'lms.djangoapps.instructor_task.tasks_helper.grades.use_sharded_grade_reporting'
+USE_STREAMING_PROBLEM_GRADE_REPORT = (
+    'lms.djangoapps.instructor_task.tasks_helper.grades.use_streaming_problem_grade_reporting'
+)
 
 
 class InstructorGradeReportTestCase(TestReportMixin, InstructorTaskCourseTestCase):
@@ -435,6 +447,108 @@ class TestInstructorGradeReport(InstructorGradeReportTestCase):
         )
 
 
+@override_settings(GRADE_REPORT_USERS_PER_SHARD=2)
+@patch(USE_SHARDED_GRADE_REPORT, Mock(return_value=True))
+class TestShardedCourseGradeReport(InstructorGradeReportTestCase):
+    """
+    Tests that course grade reports graded by parallel subtasks are merged and resumed correctly.
+    """
+    ENABLED_CACHES = ['default']
+
+    def setUp(self):
+        super().setUp()
+        self.course = CourseFactory.create()
+        self.students = [self.create_student(f'student{index}') for index in range(5)]
+
+    def _generate(self):
+        """
+        Generates the report for a new grade report task entry, with its shards run eagerly.
+        """
+        entry = InstructorTaskFactory.create(
+            course_id=self.course.id,
+            task_type=InstructorTaskTypes.GRADE_COURSE,
+            task_id=str(uuid4()),
+        )
+        with patch('lms.djangoapps.instructor_task.tasks_helper.runner._get_current_task'):
+            CourseGradeReport.generate({'task_id': entry.task_id}, entry.id, self.course.id, {}, 'graded')
+        return InstructorTask.objects.get(pk=entry.id)
+
+    def _report_usernames(self):
+        """
+        Returns the usernames in the only grade report of the course, in order.
+        """
+        report_store = ReportStore.from_config(config_name='GRADES_DOWNLOAD')
+        links = report_store.links_for(self.course.id)
+        assert len(links) == 1
+        with report_store.storage.open(report_store.path_to(self.course.id, links[0][0])) as csv_file:
+            return [row['Username'] for row in unicodecsv.DictReader(csv_file, encoding='utf-8-sig')]
+
+    def test_shards_are_merged(self):
+        entry = self._generate()
+
+        assert entry.task_state == SUCCESS
+        self.assertDictContainsSubset({'total': 3, 'succeeded': 3, 'failed': 0}, json.loads(entry.subtasks))
+        self.assertDictContainsSubset({'attempted': 5, 'succeeded': 5, 'failed': 0}, json.loads(entry.task_output))
+        assert self._report_usernames() == [student.username for student in self.students]
+
+    def test_failed_shards_are_resumed(self):
+        generate_shard = ShardedCourseGradeReport.generate_shard
+        graded_shards = []
+
+        def fail_second_shard(report, checkpoint, index):
+            graded_shards.append(index)
+            if index == 1 and graded_shards.count(1) == 1:
+                raise ValueError('Shard failed')
+            return generate_shard(report, checkpoint, index)
+
+        with patch.object(ShardedCourseGradeReport, 'generate_shard', autospec=True, side_effect=fail_second_shard):
+            entry = self._generate()
+            self.assertDictContainsSubset({'total': 3, 'succeeded': 2, 'failed': 1}, json.loads(entry.subtasks))
+            assert ReportStore.from_config(config_name='GRADES_DOWNLOAD').links_for(self.course.id) == []
+
+            entry = self._generate()
+
+        assert entry.task_state == SUCCESS
+        assert graded_shards == [0, 1, 2, 1]
+        assert self._report_usernames() == [student.username for student in self.students]
+
+    def test_failed_merge_is_resumed(self):
+        merge_shards = ShardedCourseGradeReport.merge_shards
+        merges = []
+
+        def fail_first_merge(report, checkpoint):
+            merges.append(checkpoint.checkpoint_id)
+            if len(merges) == 1:
+                raise ValueError('Merge failed')
+            return merge_shards(report, checkpoint)
+
+        with patch.object(ShardedCourseGradeReport, 'merge_shards', autospec=True, side_effect=fail_first_merge):
+            entry = self._generate()
+            assert entry.task_state == FAILURE
+            self.assertDictContainsSubset({'total': 3, 'succeeded': 2, 'failed': 1}, json.loads(entry.subtasks))
+            assert ReportStore.from_config(config_name='GRADES_DOWNLOAD').links_for(self.course.id) == []
+
+            # All the shards are complete, so the resumed report is only merged.
+            self._generate()
+
+        assert len(merges) == 2
+        assert self._report_usernames() == [student.username for student in self.students]
+
+    def test_merge_is_locked_per_checkpoint(self):
+        with patch.object(ShardedCourseGradeReport, 'merge_shards', autospec=True) as mock_merge:
+            self._generate()
+        [(__, checkpoint), __] = mock_merge.call_args
+
+        # Another task is merging the shards of the checkpoint.
+        cache.add(checkpoint.merge_lock_key, 'true')
+        self._generate()
+        assert ReportStore.from_config(config_name='GRADES_DOWNLOAD').links_for(self.course.id) == []
+
+        cache.delete(checkpoint.merge_lock_key)
+        self._generate()
+        assert self._report_usernames() == [student.username for student in self.students]
+
+
 @ddt.ddt
 class TestTeamGradeReport(InstructorGradeReportTestCase):
     """ Test that teams appear correctly in the grade report when it is enabled for the course. """
@@ -949,6 +1063,61 @@ class TestProblemGradeReport(TestReportMixin, InstructorTaskModuleTestCase):
             )))
         ])
 
+    @patch('lms.djangoapps.instructor_task.tasks_helper.runner._get_current_task')
+    def test_streaming_report(self, _):
+        inactive_student = self.create_student('inactive-student', 'inactive@example.com', enrollment_active=False)
+        vertical = BlockFactory.create(
+            parent_location=self.problem_section.location,
+            category='vertical',
+            metadata={'graded': True},
+            display_name='Problem Vertical'
+        )
+        self.define_option_problem('Problem1', parent=vertical)
+        second_section = BlockFactory.create(
+            parent_location=self.chapter.location,
+            category='sequential',
+            metadata={'graded': True, 'format': 'Homework'},
+            display_name='Subsection 2',
+        )
+        self.define_option_problem('Problem2', parent=second_section)
+
+        self.submit_student_answer(self.student_1.username, 'Problem1', ['Option 1'])
+        self.submit_student_answer(self.student_2.username, 'Problem2', ['Option 2'])
+        with patch(USE_STREAMING_PROBLEM_GRADE_REPORT, return_value=True):
+            with patch.object(StreamingProblemGradeReport, 'USERS_PER_QUERY', 2):
+                result = ProblemGradeReport.generate(None, None, self.course.id, {}, 'graded')
+        self.assertDictContainsSubset({'action_name': 'graded', 'attempted': 3, 'succeeded': 3, 'failed': 0}, result)
+
+        report_store = ReportStore.from_config(config_name='GRADES_DOWNLOAD')
+        assert report_store.links_for(self.course.id)[0][0].endswith('.csv.gz')
+        problem_names = ['Homework 1: Subsection - Problem1', 'Homework 2: Subsection 2 - Problem2']
+        header_row = self.csv_header_row + [
+            problem_name + suffix for problem_name in problem_names for suffix in (' (Earned)', ' (Possible)')
+        ]
+        self.verify_rows_in_csv([
+            dict(zip(
+                header_row,
+                [
+                    str(self.student_1.id), self.student_1.email, self.student_1.username, ENROLLED_IN_COURSE,
+                    '0.01', '1.0', '2.0', 'Not Attempted', '2.0',
+                ]
+            )),
+            dict(zip(
+                header_row,
+                [
+                    str(self.student_2.id), self.student_2.email, self.student_2.username, ENROLLED_IN_COURSE,
+                    '0.0', 'Not Attempted', '2.0', '0.0', '2.0',
+                ]
+            )),
+            dict(zip(
+                header_row,
+                [
+                    str(inactive_student.id), inactive_student.email, inactive_student.username,
+                    NOT_ENROLLED_IN_COURSE, '0.0', 'Not Attempted', '2.0', 'Not Attempted', '2.0',
+                ]
+            )),
+        ])
+
 
 @ddt.ddt
 class TestProblemReportSplitTestContent(TestReportMixin, TestConditionalContent, InstructorTaskModuleTestCase):
@@ -1830,6 +1999,45 @@ class TestGradeReport(TestReportMixin, InstructorTaskModuleTestCase):
                 ignore_other_columns=True,
             )
 
+    @patch.dict(settings.FEATURES, {'DISABLE_START_DATES': False})
+    def test_snapshot_grade_report(self):
+        self.submit_student_answer(self.student.username, 'Problem1', ['Option 1'])
+        unattempted_student = self.create_student('üser_2')
+
+        with patch('lms.djangoapps.instructor_task.tasks_helper.runner._get_current_task'):
+            with patch('lms.djangoapps.grades.course_grade_factory.CourseGradeFactory.iter') as mock_iter:
+                result = CourseGradeReport.generate(None, None, self.course.id, {'snapshot': True}, 'graded')
+            assert not mock_iter.called
+            self.assertDictContainsSubset(
+                {'action_name': 'graded', 'attempted': 2, 'succeeded': 2, 'failed': 0},
+                result,
+            )
+            self.verify_rows_in_csv(
+                [
+                    {
+                        'Student ID': str(self.student.id),
+                        'Username': self.student.username,
+                        'Grade': '0.13',
+                        'Homework 1: Subsection': '0.5',
+                        'Homework 2: Unattempted': 'Not Attempted',
+                        'Homework 3: Empty': 'Not Attempted',
+                        'Homework 4: Unreleased': 'Not Attempted',
+                        'Homework (Avg)': str(0.5 / 4),
+                    },
+                    {
+                        'Student ID': str(unattempted_student.id),
+                        'Username': unattempted_student.username,
+                        'Grade': '0.0',
+                        'Homework 1: Subsection': 'Not Attempted',
+                        'Homework 2: Unattempted': 'Not Attempted',
+                        'Homework 3: Empty': 'Not Attempted',
+                        'Homework 4: Unreleased': 'Not Attempted',
+                        'Homework (Avg)': '0.0',
+                    },
+                ],
+                ignore_other_columns=True,
+            )
+
     def test_grade_report_custom_directory(self):
         self.submit_student_answer(self.student.username, 'Problem1', ['Option 1'])
 
@@ -12,3 +12,7 @@ class TeacherDashboardConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'lms.djangoapps.teacher_dashboard'
     verbose_name = 'Teacher Dashboard'
+
+    def ready(self):
+        # Connect signal handlers invalidating the teaching courses cache
+        from . import signals  # pylint: disable=unused-import
@@ -0,0 +1,28 @@
+"""
+Signal handlers invalidating the cached teaching courses of instructors.
+"""
+
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from common.djangoapps.student.models import CourseAccessRole
+from xmodule.modulestore.django import SignalHandler
+
+from .utils import invalidate_teaching_courses
+
+
+@receiver(post_save, sender=CourseAccessRole)
+@receiver(post_delete, sender=CourseAccessRole)
+def _listen_for_course_access_role_change(sender, instance, **kwargs):  # pylint: disable=unused-argument
+    """
+    Invalidate the teaching courses of a user whose course or org roles changed.
+    """
+    invalidate_teaching_courses(instance.user_id)
+
+
+@receiver(SignalHandler.course_published)
+def _listen_for_course_publish(sender, course_key, **kwargs):  # pylint: disable=unused-argument
+    """
+    Invalidate all teaching courses, since the published course may be listed for any number of users.
+    """
+    invalidate_teaching_courses()
@@ -7,11 +7,15 @@ from django.test import TestCase
 from django.urls import reverse
 from opaque_keys.edx.keys import CourseKey
 
-from common.djangoapps.student.roles import CourseInstructorRole, CourseStaffRole
+from common.djangoapps.student.roles import CourseInstructorRole, CourseStaffRole, OrgStaffRole
+from common.djangoapps.student.tests.factories import CourseEnrollmentFactory
 from openedx.core.djangoapps.content.course_overviews.models import CourseOverview
+from openedx.core.djangoapps.content.course_overviews.tests.factories import CourseOverviewFactory
 from xmodule.modulestore.tests.django_utils import SharedModuleStoreTestCase
 from xmodule.modulestore.tests.factories import CourseFactory
 
+from .utils import get_instructor_courses, get_teaching_courses
+
 
 class TeacherDashboardTestCase(SharedModuleStoreTestCase):
     """
@@ -68,3 +72,80 @@ class TeacherDashboardTestCase(SharedModuleStoreTestCase):
         response = self.client.get(url)
         self.assertEqual(response.status_code, 302)
         self.assertIn('/login', response.url)
+
+
+class TeachingCoursesTestCase(SharedModuleStoreTestCase):
+    """
+    Test cases for the teaching courses projection and JSON API.
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.user = User.objects.create_user(
+            username='testinstructor',
+            email='test@example.com',
+            password='testpass123'
+        )
+        self.courses = [
+            CourseOverviewFactory.create(org='TeachX', display_name=f'Course {index}')
+            for index in range(3)
+        ]
+        self.other_org_course = CourseOverviewFactory.create(org='OtherX')
+        self.url = reverse('teacher_dashboard:teacher_courses_api')
+
+    def test_course_and_org_roles_resolved_in_one_query(self):
+        CourseInstructorRole(self.other_org_course.id).add_users(self.user)
+        OrgStaffRole('TeachX').add_users(self.user)
+        with self.assertNumQueries(1):
+            courses = {course.id: course for course in get_instructor_courses(self.user)}
+        self.assertEqual(set(courses), {self.other_org_course.id} | {course.id for course in self.courses})
+        self.assertTrue(courses[self.other_org_course.id].is_course_instructor)
+        self.assertFalse(courses[self.courses[0].id].is_course_instructor)
+        self.assertFalse(courses[self.courses[0].id].is_org_instructor)
+
+    def test_projection_is_cached_and_invalidated_on_role_change(self):
+        CourseStaffRole(self.courses[0].id).add_users(self.user)
+        self.assertEqual([course['id'] for course in get_teaching_courses(self.user)], [str(self.courses[0].id)])
+        with self.assertNumQueries(0):
+            get_teaching_courses(self.user)
+
+        CourseInstructorRole(self.courses[0].id).add_users(self.user)
+        CourseStaffRole(self.courses[0].id).remove_users(self.user)
+        courses = get_teaching_courses(self.user)
+        self.assertEqual(len(courses), 1)
+        self.assertEqual(courses[0]['role'], 'instructor')
+
+    def test_api_cursor_pagination_and_enrollment_counts(self):
+        OrgStaffRole('TeachX').add_users(self.user)
+        CourseEnrollmentFactory.create(course_id=self.courses[1].id)
+        CourseEnrollmentFactory.create(course_id=self.courses[1].id)
+        self.client.login(username='testinstructor', password='testpass123')
+
+        response = self.client.get(self.url, {'page_size': 2})
+        self.assertEqual(response.status_code, 200)
+        first_page = response.json()
+        self.assertEqual(first_page['count'], 3)
+        self.assertEqual(len(first_page['results']), 2)
+        self.assertIsNotNone(first_page['next'])
+
+        response = self.client.get(self.url, {'page_size': 2, 'cursor': first_page['next']})
+        second_page = response.json()
+        self.assertEqual(len(second_page['results']), 1)
+        self.assertIsNone(second_page['next'])
+
+        results = first_page['results'] + second_page['results']
+        self.assertEqual({result['id'] for result in results}, {str(course.id) for course in self.courses})
+        counts = {result['id']: result['enrollment_count'] for result in results}
+        self.assertEqual(counts[str(self.courses[1].id)], 2)
+        self.assertEqual(counts[str(self.courses[0].id)], 0)
+
+    def test_api_invalid_cursor(self):
+        OrgStaffRole('TeachX').add_users(self.user)
+        self.client.login(username='testinstructor', password='testpass123')
+        response = self.client.get(self.url, {'cursor': 'a'})
+        self.assertEqual(response.status_code, 400)
+
+    def test_api_access_denied_for_regular_user(self):
+        self.client.login(username='testinstructor', password='testpass123')
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 404)
@@ -9,4 +9,5 @@ app_name = 'teacher_dashboard'
 
 urlpatterns = [
     path('', views.teacher_dashboard_view, name='teacher_dashboard'),
+    path('api/courses/', views.teacher_courses_api_view, name='teacher_courses_api'),
 ]
@@ -2,62 +2,211 @@
 Utility functions for Teacher Dashboard.
 """
 
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from datetime import datetime, timezone
+
 from django.contrib.auth.models import User
-from typing import List
+from django.core.cache import cache
+from django.db.models import Count, Exists, OuterRef, Q, QuerySet
+from opaque_keys.edx.keys import CourseKey
+from typing import Dict, List, Optional
 
+from common.djangoapps.student.models import CourseAccessRole, CourseEnrollment
 from common.djangoapps.student.roles import (
     CourseInstructorRole,
     CourseStaffRole,
-    UserBasedRole,
+    RoleCache,
 )
 from openedx.core.djangoapps.content.course_overviews.models import CourseOverview
 
 
-def get_instructor_courses(user: User) -> List[CourseOverview]:
+# Cache timeout for the per-user teaching courses projection.  Entries are
+# invalidated by bumping a version, so this only bounds stale memory usage.
+TEACHING_COURSES_CACHE_TIMEOUT = 60 * 60 * 24
+
+# Bumped whenever any course is published, invalidating every user's projection.
+TEACHING_COURSES_GLOBAL_VERSION_KEY = 'teacher_dashboard.teaching_courses.version'
+
+TEACHING_COURSES_USER_VERSION_KEY = 'teacher_dashboard.teaching_courses.version.{user_id}'
+
+TEACHING_COURSES_CACHE_KEY = 'teacher_dashboard.teaching_courses.{user_id}.{global_version}.{user_version}'
+
+DEFAULT_PAGE_SIZE = 20
+
+MAX_PAGE_SIZE = 100
+
+
+def _teaching_roles(user: User) -> QuerySet:
+    """
+    Return the user's course and org access roles that grant instructor or staff permissions.
+    """
+    return CourseAccessRole.objects.filter(
+        user=user,
+        role__in=RoleCache.get_roles(CourseInstructorRole.ROLE) | RoleCache.get_roles(CourseStaffRole.ROLE),
+    )
+
+
+def user_has_teaching_role(user: User) -> bool:
+    """
+    Return whether the user has an instructor or staff role for any course or org.
+    """
+    return _teaching_roles(user).exists()
+
+
+def get_instructor_courses(user: User) -> QuerySet:
     """
     Get all courses where the user has instructor or staff role.
-    
+
+    Course-level and org-wide roles are resolved in a single query, and each
+    course is annotated with `is_course_instructor` and `is_org_instructor`,
+    telling whether the user teaches it as an instructor rather than as staff.
+
     Args:
         user: The user to get courses for
-        
+
     Returns:
-        List of CourseOverview objects where user has teaching permissions
+        QuerySet of CourseOverview objects where user has teaching permissions
     """
-    # Get courses where user is instructor
-    instructor_courses = UserBasedRole(user, CourseInstructorRole.ROLE).courses_with_role()
-    
-    # Get courses where user is staff
-    staff_courses = UserBasedRole(user, CourseStaffRole.ROLE).courses_with_role()
-    
-    # Combine and deduplicate
-    all_course_accesses = instructor_courses | staff_courses
-    
-    # Extract course keys
-    course_keys = []
-    user_global_orgs = set()
-    
-    for course_access in all_course_accesses:
-        if course_access.course_id is not None:
-            course_keys.append(course_access.course_id)
-        elif course_access.org:
-            user_global_orgs.add(course_access.org)
-    
-    # Get courses from global orgs if any
-    if user_global_orgs:
-        org_overviews = CourseOverview.get_all_courses(orgs=list(user_global_orgs))
-        course_keys.extend([overview.id for overview in org_overviews])
-    
-    # Remove duplicates
-    course_keys = list(set(course_keys))
-    
-    if course_keys:
-        # Get CourseOverview objects
-        courses = CourseOverview.get_all_courses(filter_={'id__in': course_keys})
-        # Filter out courses that are None or have issues
-        courses = [course for course in courses if course is not None]
-        return courses
-    
-    return []
+    teaching_roles = _teaching_roles(user)
+    instructor_roles = teaching_roles.filter(role__in=RoleCache.get_roles(CourseInstructorRole.ROLE))
+
+    return CourseOverview.objects.filter(
+        Q(id__in=teaching_roles.exclude(course_id=None).values('course_id')) |
+        Q(org__in=teaching_roles.filter(course_id=None).exclude(org='').values('org'))
+    ).annotate(
+        is_course_instructor=Exists(instructor_roles.filter(course_id=OuterRef('id'))),
+        is_org_instructor=Exists(instructor_roles.filter(course_id=None, org=OuterRef('org'))),
+    )
+
+
+def _course_sort_key(course_data: dict):
+    """
+    Sort key ordering courses by start date (most recent first), undated courses last.
+    """
+    date = course_data['start'] or course_data['enrollment_start']
+    return (date is not None, date or datetime.min.replace(tzinfo=timezone.utc), course_data['id'])
+
+
+def _build_teaching_courses(user: User) -> List[dict]:
+    """
+    Build the sorted teaching courses projection for the user from the database.
+    """
+    courses_data = [
+        {
+            'id': str(course_overview.id),
+            'display_name': course_overview.display_name,
+            'short_description': course_overview.short_description or '',
+            'start': course_overview.start,
+            'end': course_overview.end,
+            'enrollment_start': course_overview.enrollment_start,
+            'enrollment_end': course_overview.enrollment_end,
+            'course_image_url': course_overview.course_image_url,
+            'org': course_overview.org,
+            'course_number': course_overview.number,
+            'role': (
+                'instructor'
+                if course_overview.is_course_instructor or course_overview.is_org_instructor
+                else 'staff'
+            ),
+        }
+        for course_overview in get_instructor_courses(user)
+    ]
+    courses_data.sort(key=_course_sort_key, reverse=True)
+    return courses_data
+
+
+def _get_cache_version(key: str) -> int:
+    """
+    Return the current value of a cache version counter, initializing it if needed.
+    """
+    version = cache.get(key)
+    if version is None:
+        cache.add(key, 1, None)
+        version = cache.get(key, 1)
+    return version
+
+
+def _bump_cache_version(key: str):
+    """
+    Increment a cache version counter, invalidating entries built with the old value.
+    """
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.set(key, 2, None)
+
+
+def get_teaching_courses(user: User) -> List[dict]:
+    """
+    Get the cached projection of the courses the user is teaching.
+
+    Args:
+        user: The user to get courses for
+
+    Returns:
+        List of course data dicts, sorted by start date (most recent first)
+    """
+    cache_key = TEACHING_COURSES_CACHE_KEY.format(
+        user_id=user.id,
+        global_version=_get_cache_version(TEACHING_COURSES_GLOBAL_VERSION_KEY),
+        user_version=_get_cache_version(TEACHING_COURSES_USER_VERSION_KEY.format(user_id=user.id)),
+    )
+    courses_data = cache.get(cache_key)
+    if courses_data is None:
+        courses_data = _build_teaching_courses(user)
+        cache.set(cache_key, courses_data, TEACHING_COURSES_CACHE_TIMEOUT)
+    return courses_data
+
+
+def invalidate_teaching_courses(user_id: Optional[int] = None):
+    """
+    Invalidate the cached teaching courses of one user, or of all users if no user is given.
+    """
+    if user_id is None:
+        _bump_cache_version(TEACHING_COURSES_GLOBAL_VERSION_KEY)
+    else:
+        _bump_cache_version(TEACHING_COURSES_USER_VERSION_KEY.format(user_id=user_id))
+
+
+def paginate_teaching_courses(courses_data: List[dict], cursor: Optional[str], page_size: int):
+    """
+    Return one page of the projection, starting after the course encoded in `cursor`.
+
+    Args:
+        courses_data: The sorted teaching courses projection
+        cursor: Opaque cursor returned with a previous page, or None for the first page
+        page_size: Maximum number of courses in the page
+
+    Returns:
+        Tuple of the courses in the page and the cursor of the next page (None on the last page)
+
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    start = 0
+    if cursor:
+        last_course_id = urlsafe_b64decode(cursor.encode('ascii')).decode('utf-8')
+        course_ids = [course_data['id'] for course_data in courses_data]
+        # A course that vanished since the previous page restarts the listing
+        # rather than failing the request.
+        start = course_ids.index(last_course_id) + 1 if last_course_id in course_ids else 0
+
+    page = courses_data[start:start + page_size]
+    next_cursor = None
+    if start + page_size < len(courses_data):
+        next_cursor = urlsafe_b64encode(page[-1]['id'].encode('utf-8')).decode('ascii')
+    return page, next_cursor
+
+
+def get_enrollment_counts(course_ids: List[str]) -> Dict[str, int]:
+    """
+    Count active enrollments of the given courses in a single aggregate query.
+    """
+    counts = CourseEnrollment.objects.filter(
+        course_id__in=[CourseKey.from_string(course_id) for course_id in course_ids],
+        is_active=True,
+    ).values('course_id').annotate(count=Count('id'))
+    return {str(row['course_id']): row['count'] for row in counts}
 
 
 def format_course_schedule(course_data: dict) -> str:
@@ -4,21 +4,21 @@ Views for Teacher Dashboard.
 
 import logging
 from django.contrib.auth.decorators import login_required
-from django.http import Http404
+from django.http import Http404, JsonResponse
 from django.shortcuts import render
 from django.views.decorators.cache import cache_control
 from django.views.decorators.csrf import ensure_csrf_cookie
 
 from common.djangoapps.edxmako.shortcuts import render_to_response
-from common.djangoapps.student.roles import (
-    CourseInstructorRole,
-    CourseStaffRole,
-)
-from lms.djangoapps.courseware.access import has_access
-from openedx.core.lib.courses import get_courses
-from xmodule.modulestore.django import modulestore
 
-from .utils import get_instructor_courses
+from .utils import (
+    DEFAULT_PAGE_SIZE,
+    MAX_PAGE_SIZE,
+    get_enrollment_counts,
+    get_teaching_courses,
+    paginate_teaching_courses,
+    user_has_teaching_role,
+)
 
 log = logging.getLogger(__name__)
 
@@ -33,45 +33,11 @@ def teacher_dashboard_view(request):
     user = request.user
 
     # Check if user has any instructor or staff roles
-    if not (CourseInstructorRole.user_has_role(user) or CourseStaffRole.user_has_role(user)):
+    if not user_has_teaching_role(user):
         raise Http404("You don't have permission to access the teacher dashboard.")
 
     # Get all courses where the user is an instructor or staff member
-    instructor_courses = get_instructor_courses(user)
-
-    # Prepare course data for template
-    courses_data = []
-    for course_overview in instructor_courses:
-        try:
-            course = modulestore().get_course(course_overview.id)
-            if course:
-                # Check user's role in this specific course
-                is_instructor = has_access(user, 'instructor', course)
-                is_staff = has_access(user, 'staff', course)
-
-                if is_instructor or is_staff:
-                    course_data = {
-                        'id': str(course_overview.id),
-                        'display_name': course_overview.display_name,
-                        'short_description': getattr(course_overview, 'short_description', ''),
-                        'start': course_overview.start,
-                        'end': course_overview.end,
-                        'enrollment_start': course_overview.enrollment_start,
-                        'enrollment_end': course_overview.enrollment_end,
-                        'course_image_url': course_overview.course_image_url,
-                        'org': course_overview.org,
-                        'course_number': course_overview.number,
-                        'role': 'instructor' if is_instructor else 'staff',
-                        'has_started': course_overview.has_started(),
-                        'has_ended': course_overview.has_ended(),
-                    }
-                    courses_data.append(course_data)
-        except Exception as e:
-            log.warning(f"Could not load course {course_overview.id}: {e}")
-            continue
-
-    # Sort courses by start date (most recent first)
-    courses_data.sort(key=lambda x: x['start'] or x['enrollment_start'], reverse=True)
+    courses_data = get_teaching_courses(user)
 
     context = {
         'user': user,
@@ -80,3 +46,58 @@ def teacher_dashboard_view(request):
     }
 
     return render_to_response('teacher_dashboard/teacher_dashboard.html', context)
+
+
+@cache_control(no_cache=True, no_store=True, must_revalidate=True)
+@login_required
+def teacher_courses_api_view(request):
+    """
+    Return one page of the courses the user is teaching as JSON.
+
+    Query parameters:
+        cursor: The `next` cursor returned with the previous page
+        page_size: Number of courses per page (default 20, max 100)
+    """
+    user = request.user
+
+    if not user_has_teaching_role(user):
+        raise Http404("You don't have permission to access the teacher dashboard.")
+
+    try:
+        page_size = min(int(request.GET.get('page_size', DEFAULT_PAGE_SIZE)), MAX_PAGE_SIZE)
+    except ValueError:
+        page_size = DEFAULT_PAGE_SIZE
+    page_size = max(page_size, 1)
+
+    courses_data = get_teaching_courses(user)
+    try:
+        page, next_cursor = paginate_teaching_courses(courses_data, request.GET.get('cursor'), page_size)
+    except ValueError:
+        return JsonResponse({'error': 'Invalid cursor.'}, status=400)
+
+    enrollment_counts = get_enrollment_counts([course_data['id'] for course_data in page])
+
+    results = []
+    for course_data in page:
+        results.append({
+            'id': course_data['id'],
+            'display_name': course_data['display_name'],
+            'short_description': course_data['short_description'],
+            'start': course_data['start'].isoformat() if course_data['start'] else None,
+            'end': course_data['end'].isoformat() if course_data['end'] else None,
+            'enrollment_start': (
+                course_data['enrollment_start'].isoformat() if course_data['enrollment_start'] else None
+            ),
+            'enrollment_end': course_data['enrollment_end'].isoformat() if course_data['enrollment_end'] else None,
+            'course_image_url': course_data['course_image_url'],
+            'org': course_data['org'],
+            'course_number': course_data['course_number'],
+            'role': course_data['role'],
+            'enrollment_count': enrollment_counts.get(course_data['id'], 0),
+        })
+
+    return JsonResponse({
+        'results': results,
+        'next': next_cursor,
+        'count': len(courses_data),
+    })
@@ -1726,6 +1726,18 @@ CONTENTSTORE = {
     'DOC_STORE_CONFIG': DOC_STORE_CONFIG
 }
 
+# .. setting_name: COURSE_ASSETS_DISK_CACHE_DIR
+# .. setting_default: None
+# .. setting_description: Directory on local disk where the contentserver caches course assets too large
+#   to be cached in memory, so that they are served from a file rather than streamed from the contentstore.
+#   None disables the disk cache.
+COURSE_ASSETS_DISK_CACHE_DIR = None
+# .. setting_name: COURSE_ASSETS_DISK_CACHE_MAX_BYTES
+# .. setting_default: 1073741824
+# .. setting_description: Maximum total size of the files in COURSE_ASSETS_DISK_CACHE_DIR. The least
+#   recently used files are removed beyond it.
+COURSE_ASSETS_DISK_CACHE_MAX_BYTES = 1024 ** 3
+
 MODULESTORE = {
     'default': {
         'ENGINE': 'xmodule.modulestore.mixed.MixedModuleStore',
@@ -1936,6 +1948,18 @@ STATICFILES_DIRS = [
     XMODULE_ROOT / "static",
 ]
 
+# .. setting_name: STATIC_REPLACE_CACHE_TIMEOUT
+# .. setting_default: 0
+# .. setting_description: Number of seconds the course asset urls and the rewritten HTML of static url
+#   replacement are cached in memory of each process. Changes to assets, like locking one or uploading a
+#   new version, show up in rendered content once the entries expire. 0 disables the caches.
+STATIC_REPLACE_CACHE_TIMEOUT = 0
+# .. setting_name: STATIC_REPLACE_CACHE_MAX_ENTRIES
+# .. setting_default: 1000
+# .. setting_description: Maximum number of entries in each of the in-memory caches of static url
+#   replacement, see STATIC_REPLACE_CACHE_TIMEOUT.
+STATIC_REPLACE_CACHE_MAX_ENTRIES = 1000
+
 FAVICON_PATH = 'images/favicon.ico'
 DEFAULT_COURSE_ABOUT_IMAGE_URL = 'images/pencils.jpg'
 
@@ -2326,6 +2350,7 @@ MIDDLEWARE = [
     # to redirected unenrolled students to the course info page
     'lms.djangoapps.courseware.middleware.CacheCourseIdMiddleware',
     'lms.djangoapps.courseware.middleware.RedirectMiddleware',
+    'lms.djangoapps.courseware.middleware.UserStateWriteBehindMiddleware',
 
     'lms.djangoapps.course_wiki.middleware.WikiAccessMiddleware',
 
@@ -2959,6 +2984,13 @@ BLOCK_STRUCTURES_SETTINGS = dict(
     #   For more information, check https://github.com/openedx/edx-platform/pull/13388 and
     #   https://github.com/openedx/edx-platform/pull/14571.
     TASK_MAX_RETRIES=5,
+
+    # .. setting_name: BLOCK_STRUCTURES_SETTINGS['LOCAL_CACHE_MAX_BYTES']
+    # .. setting_default: 64 * 1024 * 1024
+    # .. setting_description: Maximum total size, in bytes of serialized data, of the collected
+    #   block structures kept in memory by each process, so that requests for recently used
+    #   courses skip fetching and deserializing them from the cache. Set to 0 to disable.
+    LOCAL_CACHE_MAX_BYTES=64 * 1024 * 1024,
 )
 
 ################################ Bulk Email ###################################
@@ -3005,6 +3037,11 @@ BULK_EMAIL_LOG_SENT_EMAILS = False
 # parallel, and what the SES rate is.
 BULK_EMAIL_RETRY_DELAY_BETWEEN_SENDS = 0.02
 
+# Number of SMTP connections each bulk email task sends messages over concurrently.
+# Messages sent through edx-ace, and tasks retried for rate-related reasons, always
+# use a single connection.
+BULK_EMAIL_SMTP_CONNECTIONS = 1
+
 ############################# Email Opt In ####################################
 
 # Minimum age for organization-wide email opt in
@@ -3119,6 +3156,7 @@ INSTALLED_APPS = [
     'lms.djangoapps.certificates.apps.CertificatesConfig',
     'lms.djangoapps.instructor_task',
     'lms.djangoapps.teacher_dashboard.apps.TeacherDashboardConfig',
+    'lms.djangoapps.course_search.apps.CourseSearchConfig',
     'openedx.core.djangoapps.course_groups',
     'lms.djangoapps.bulk_email',
     'lms.djangoapps.branding',
@@ -3783,6 +3821,14 @@ RECALCULATE_GRADES_ROUTING_KEY = 'edx.lms.core.default'
 
 SOFTWARE_SECURE_VERIFICATION_ROUTING_KEY = 'edx.lms.core.default'
 
+# Number of learners graded by each subtask of a sharded course grade report
+# (see the instructor_task.use_sharded_grade_reporting waffle flag).
+GRADE_REPORT_USERS_PER_SHARD = 2000
+
+# Number of seconds for which the partial reports of a sharded course grade
+# report that did not complete are kept available to resume it from.
+GRADE_REPORT_CHECKPOINT_TIMEOUT = 60 * 60 * 24
+
 GRADES_DOWNLOAD = {
     'STORAGE_CLASS': 'django.core.files.storage.FileSystemStorage',
     'STORAGE_KWARGS': {
@@ -5057,6 +5103,13 @@ PROGRAM_CONSOLE_MICROFRONTEND_URL = None
 # .. setting_default: None
 # .. setting_description: Base URL of the micro-frontend-based courseware page.
 LEARNING_MICROFRONTEND_URL = None
+# .. setting_name: COURSE_HOME_PROGRESS_SNAPSHOT_CACHE_TIMEOUT
+# .. setting_default: 0
+# .. setting_description: Number of seconds the parts of a learner's progress tab data which are derived
+#   from the blocks of the course (the completion summary) are cached for. The cached data is cleared when
+#   the learner completes a block or their score changes, and isn't used for another version of the course.
+#   Changes to the learner's cohort or content gating show up once it expires. 0 disables the cache.
+COURSE_HOME_PROGRESS_SNAPSHOT_CACHE_TIMEOUT = 0
 # .. setting_name: ORA_GRADING_MICROFRONTEND_URL
 # .. setting_default: None
 # .. setting_description: Base URL of the micro-frontend-based openassessment grading page.
@@ -5215,6 +5268,10 @@ FERNET_KEYS = [
 ############### Settings for user-state-client ##################
 # Maximum number of rows to fetch in XBlockUserStateClient calls. Adjust for performance
 USER_STATE_BATCH_SIZE = 5000
+# Block types whose user state writes are coalesced per request and stored in bulk at
+# the end of the request, e.g. ['video']. Block types whose state history is saved
+# (problems) are always written immediately.
+XBLOCK_USER_STATE_WRITE_BEHIND_BLOCK_TYPES = []
 
 ############### Settings for edx-rbac  ###############
 SYSTEM_WIDE_ROLE_CLASSES = []
@@ -5438,6 +5495,16 @@ AVAILABLE_DISCUSSION_TOURS = []
 NOTIFICATIONS_EXPIRY = 60
 EXPIRED_NOTIFICATIONS_DELETE_BATCH_SIZE = 10000
 NOTIFICATION_CREATION_BATCH_SIZE = 76
+# .. setting_name: NOTIFICATION_FANOUT_CHUNK_SIZE
+# .. setting_default: 5000
+# .. setting_description: Notifications to more users than this are split into parallel
+#   send_notifications tasks of at most this many users each. Set to 0 to never split them.
+NOTIFICATION_FANOUT_CHUNK_SIZE = 5000
+# .. setting_name: NOTIFICATION_DIGEST_CHUNK_SIZE
+# .. setting_default: 1000
+# .. setting_description: Number of users whose daily or weekly email digests are sent by a single
+#   send_digest_email_to_users task.
+NOTIFICATION_DIGEST_CHUNK_SIZE = 1000
 NOTIFICATIONS_DEFAULT_FROM_EMAIL = "no-reply@example.com"
 NOTIFICATION_TYPE_ICONS = {}
 DEFAULT_NOTIFICATION_ICON_URL = ""
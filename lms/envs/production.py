@@ -555,6 +555,8 @@ EXPLICIT_QUEUES = {
         'queue': HEARTBEAT_CELERY_ROUTING_KEY},
     'lms.djangoapps.instructor_task.tasks.calculate_grades_csv': {
         'queue': GRADES_DOWNLOAD_ROUTING_KEY},
+    'lms.djangoapps.instructor_task.tasks.calculate_grades_csv_shard': {
+        'queue': GRADES_DOWNLOAD_ROUTING_KEY},
     'lms.djangoapps.instructor_task.tasks.calculate_problem_grade_report': {
         'queue': GRADES_DOWNLOAD_ROUTING_KEY},
     'lms.djangoapps.instructor_task.tasks.generate_certificates': {
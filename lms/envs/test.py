@@ -216,6 +216,9 @@ CACHES = {
     },
 }
 
+# Don't keep collected block structures in memory across tests.
+BLOCK_STRUCTURES_SETTINGS = dict(BLOCK_STRUCTURES_SETTINGS, LOCAL_CACHE_MAX_BYTES=0)
+
 ############################# SECURITY SETTINGS ################################
 # Default to advanced security in common.py, so tests can reset here to use
 # a simpler security model
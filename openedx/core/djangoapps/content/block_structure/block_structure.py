@@ -5,11 +5,14 @@ Module with family of classes for block structures.
     BlockStructureModulestoreData - responsible for xBlock data.
 
 The following internal data structures are implemented:
-    _BlockRelations - Data structure for a single block's relations.
+    _BlockGraph - Data structure for the relations of all blocks.
+    _BlockRelations - Data structure for a single block's relations, only
+        used to read block structures pickled by earlier versions.
     _BlockData - Data structure for a single block's data.
 """
 
 
+from array import array
 from copy import deepcopy
 from functools import partial
 from logging import getLogger
@@ -43,6 +46,319 @@ class _BlockRelations:
         self.children = []
 
 
+class _BlockGraph:
+    """
+    Data structure to encapsulate the parents and children relationships
+    of all the blocks in a block structure.
+
+    Each block's usage key is mapped to a dense integer id, and relations
+    are stored as CSR-style arrays of ids: the children of the block with
+    id i are children[child_offsets[i]:child_offsets[i + 1]], and likewise
+    for parents.  The arrays are never mutated in place.  Blocks whose
+    relations change after the arrays were built keep their relations in
+    per-block lists instead, until the graph is compacted again.
+
+    Traversals work on ids, only mapping them to usage keys for the
+    filter functions and the yielded values.
+    """
+    def __init__(self, keys=(), child_offsets=None, children=None, parent_offsets=None, parents=None):
+        # List of usage keys, indexed by block id. Removed blocks keep
+        # their entry so ids remain stable.
+        # list [UsageKey]
+        self.keys = list(keys)
+
+        # Map of the usage key of each block in the graph to its id.
+        # dict {UsageKey: int}
+        self.ids = {key: block_id for block_id, key in enumerate(self.keys)}
+
+        # Number of blocks whose relations are stored in the arrays.
+        self._array_size = len(self.keys)
+        self._child_offsets = child_offsets if child_offsets is not None else array('I', [0] * (len(self.keys) + 1))
+        self._children = children if children is not None else array('I')
+        self._parent_offsets = parent_offsets if parent_offsets is not None else array('I', [0] * (len(self.keys) + 1))
+        self._parents = parents if parents is not None else array('I')
+
+        # Maps of block ids to the lists of ids that replace their
+        # relations in the arrays.
+        # dict {int: [int]}
+        self._changed_children = {}
+        self._changed_parents = {}
+
+    @classmethod
+    def from_relations(cls, block_relations):
+        """
+        Returns a graph for the given map of usage keys to _BlockRelations.
+        """
+        keys = list(block_relations)
+        ids = {key: block_id for block_id, key in enumerate(keys)}
+        child_lists = [[ids[child] for child in block_relations[key].children] for key in keys]
+        parent_lists = [[ids[parent] for parent in block_relations[key].parents] for key in keys]
+        return cls(keys, *cls._to_csr(child_lists), *cls._to_csr(parent_lists))
+
+    def __contains__(self, usage_key):
+        return usage_key in self.ids
+
+    def __len__(self):
+        return len(self.ids)
+
+    def __iter__(self):
+        return iter(self.ids)
+
+    def __deepcopy__(self, memo):
+        # The arrays are never mutated in place and usage keys are
+        # immutable, so both are shared with the copy.
+        copied = _BlockGraph.__new__(_BlockGraph)
+        memo[id(self)] = copied
+        copied.keys = list(self.keys)
+        copied.ids = dict(self.ids)
+        copied._array_size = self._array_size  # pylint: disable=protected-access
+        copied._child_offsets = self._child_offsets  # pylint: disable=protected-access
+        copied._children = self._children  # pylint: disable=protected-access
+        copied._parent_offsets = self._parent_offsets  # pylint: disable=protected-access
+        copied._parents = self._parents  # pylint: disable=protected-access
+        copied._changed_children = {  # pylint: disable=protected-access
+            block_id: list(ids) for block_id, ids in self._changed_children.items()
+        }
+        copied._changed_parents = {  # pylint: disable=protected-access
+            block_id: list(ids) for block_id, ids in self._changed_parents.items()
+        }
+        return copied
+
+    def child_ids(self, block_id):
+        """
+        Returns the ids of the children of the block with the given id.
+        """
+        changed = self._changed_children.get(block_id)
+        if changed is not None:
+            return changed
+        return self._children[self._child_offsets[block_id]:self._child_offsets[block_id + 1]]
+
+    def parent_ids(self, block_id):
+        """
+        Returns the ids of the parents of the block with the given id.
+        """
+        changed = self._changed_parents.get(block_id)
+        if changed is not None:
+            return changed
+        return self._parents[self._parent_offsets[block_id]:self._parent_offsets[block_id + 1]]
+
+    def get_children(self, usage_key):
+        """
+        Returns the usage keys of the children of the given block.
+        """
+        keys = self.keys
+        return [keys[child_id] for child_id in self.child_ids(self.ids[usage_key])]
+
+    def get_parents(self, usage_key):
+        """
+        Returns the usage keys of the parents of the given block.
+        """
+        keys = self.keys
+        return [keys[parent_id] for parent_id in self.parent_ids(self.ids[usage_key])]
+
+    def clear_parents(self, usage_key):
+        """
+        Removes all parents of the given block, without updating the
+        children of those parents.
+        """
+        self._changed_parents[self.ids[usage_key]] = []
+
+    def add_block(self, usage_key):
+        """
+        Adds the given usage_key to the graph, if not already present,
+        and returns its id.
+        """
+        block_id = self.ids.get(usage_key)
+        if block_id is None:
+            block_id = len(self.keys)
+            self.keys.append(usage_key)
+            self.ids[usage_key] = block_id
+            self._changed_children[block_id] = []
+            self._changed_parents[block_id] = []
+        return block_id
+
+    def add_relation(self, parent_key, child_key):
+        """
+        Adds a parent to child relationship, adding the blocks if needed.
+        """
+        self.add_relation_ids(self.add_block(parent_key), self.add_block(child_key))
+
+    def add_relation_ids(self, parent_id, child_id):
+        """
+        Adds a parent to child relationship between the given block ids.
+        """
+        self._mutable_parent_ids(child_id).append(parent_id)
+        self._mutable_child_ids(parent_id).append(child_id)
+
+    def remove_block(self, usage_key):
+        """
+        Removes the given block and its relations from the graph.
+
+        Returns:
+            tuple ([int], [int]) - The ids of the removed block's parents
+                and children.
+        """
+        block_id = self.ids.pop(usage_key)
+        parent_ids = list(self.parent_ids(block_id))
+        child_ids = list(self.child_ids(block_id))
+
+        for child_id in child_ids:
+            self._mutable_parent_ids(child_id).remove(block_id)
+        for parent_id in parent_ids:
+            self._mutable_child_ids(parent_id).remove(block_id)
+
+        self._changed_children[block_id] = []
+        self._changed_parents[block_id] = []
+        return parent_ids, child_ids
+
+    def pruned(self, root_key):
+        """
+        Returns a compacted copy of this graph with only the blocks
+        reachable from root_key, numbered in post-order.
+        """
+        order = list(self.post_order_ids(self.ids[root_key]))
+        new_ids = {old_id: new_id for new_id, old_id in enumerate(order)}
+        child_lists = []
+        parent_lists = [[] for _ in order]
+        for new_id, old_id in enumerate(order):
+            children = [new_ids[child_id] for child_id in self.child_ids(old_id) if child_id in new_ids]
+            for child_id in children:
+                parent_lists[child_id].append(new_id)
+            child_lists.append(children)
+        return _BlockGraph(
+            [self.keys[old_id] for old_id in order],
+            *self._to_csr(child_lists),
+            *self._to_csr(parent_lists),
+        )
+
+    def to_arrays(self):
+        """
+        Returns a compacted representation of the graph.
+
+        Returns:
+            tuple - The usage keys of the blocks in the graph, followed by
+                the child offsets, children, parent offsets and parents
+                CSR arrays of their relations.
+        """
+        order = list(self.ids.values())
+        new_ids = {old_id: new_id for new_id, old_id in enumerate(order)}
+        child_lists = [[new_ids[child_id] for child_id in self.child_ids(old_id)] for old_id in order]
+        parent_lists = [[new_ids[parent_id] for parent_id in self.parent_ids(old_id)] for old_id in order]
+        return ([self.keys[old_id] for old_id in order], *self._to_csr(child_lists), *self._to_csr(parent_lists))
+
+    def topological_traversal(self, start_key, filter_func, yield_descendants_of_unyielded):
+        """
+        Yields the usage keys of the blocks in topological order.
+
+        See openedx.core.lib.graph_traversals.traverse_topologically,
+        which this mirrors over block ids.
+        """
+        keys = self.keys
+        start_id = self.ids[start_key]
+        stack = [start_id]
+
+        # Map of visited block ids to whether they were yielded.
+        yield_results = {}
+
+        while stack:
+            current_id = stack.pop()
+
+            # Skip the block until all of its parents are visited, and
+            # unless any of them was yielded (if so requested).
+            if current_id != start_id:
+                parent_ids = self.parent_ids(current_id)
+                if not all(parent_id in yield_results for parent_id in parent_ids):
+                    continue
+                elif not yield_descendants_of_unyielded and not any(
+                    yield_results[parent_id] for parent_id in parent_ids
+                ):
+                    continue
+
+            if current_id not in yield_results:
+                # Add the children before filtering the block, since the
+                # filter may remove it from the graph.
+                unvisited_children = list(self.child_ids(current_id))
+                unvisited_children.reverse()
+                stack.extend(unvisited_children)
+
+                should_yield_node = filter_func(keys[current_id])
+                if should_yield_node:
+                    yield keys[current_id]
+
+                yield_results[current_id] = should_yield_node
+
+    def post_order_traversal(self, start_key, filter_func=None):
+        """
+        Yields the usage keys of the blocks in post-order.
+
+        See openedx.core.lib.graph_traversals.traverse_post_order, which
+        this mirrors over block ids.
+        """
+        keys = self.keys
+        id_filter_func = (lambda block_id: filter_func(keys[block_id])) if filter_func else None
+        for block_id in self.post_order_ids(self.ids[start_key], id_filter_func):
+            yield keys[block_id]
+
+    def post_order_ids(self, start_id, filter_func=None):
+        """
+        Yields the ids of the blocks in post-order.
+
+        See openedx.core.lib.graph_traversals.traverse_post_order, which
+        this mirrors over block ids.  Unlike it, filter_func is given
+        block ids.
+        """
+        filter_func = filter_func or (lambda __: True)
+        stack = [(start_id, iter(self.child_ids(start_id)))]
+        visited = set()
+
+        while stack:
+            current_id, children = stack[-1]
+            if current_id in visited or not filter_func(current_id):
+                stack.pop()
+                continue
+
+            try:
+                next_child = next(children)
+            except StopIteration:
+                yield current_id
+                visited.add(current_id)
+                stack.pop()
+            else:
+                stack.append((next_child, iter(self.child_ids(next_child))))
+
+    def _mutable_child_ids(self, block_id):
+        """
+        Returns the list of children ids of the given block, moving them
+        out of the arrays first if needed.
+        """
+        changed = self._changed_children.get(block_id)
+        if changed is None:
+            changed = self._changed_children[block_id] = list(self.child_ids(block_id))
+        return changed
+
+    def _mutable_parent_ids(self, block_id):
+        """
+        Returns the list of parent ids of the given block, moving them
+        out of the arrays first if needed.
+        """
+        changed = self._changed_parents.get(block_id)
+        if changed is None:
+            changed = self._changed_parents[block_id] = list(self.parent_ids(block_id))
+        return changed
+
+    @staticmethod
+    def _to_csr(id_lists):
+        """
+        Returns the offsets and values CSR arrays for the given lists of ids.
+        """
+        offsets = array('I', [0])
+        values = array('I')
+        for ids in id_lists:
+            values.extend(ids)
+            offsets.append(len(values))
+        return offsets, values
+
+
 class BlockStructure:
     """
     Base class for a block structure.  BlockStructures are constructed
@@ -59,14 +375,13 @@ class BlockStructure:
         # UsageKey
         self.root_block_usage_key = root_block_usage_key
 
-        # Map of a block's usage key to its block relations. The
-        # existence of a block in the structure is determined by its
-        # presence in this map.
-        # dict {UsageKey: _BlockRelations}
-        self._block_relations = {}
+        # Graph of the blocks' relations. The existence of a block in
+        # the structure is determined by its presence in this graph.
+        # _BlockGraph
+        self._block_relations = _BlockGraph()
 
         # Add the root block.
-        self._add_block(self._block_relations, root_block_usage_key)
+        self._block_relations.add_block(root_block_usage_key)
 
     def __iter__(self):
         """
@@ -94,7 +409,7 @@ class BlockStructure:
         Returns:
             [UsageKey] - A list of usage keys of the block's parents.
         """
-        return self._block_relations[usage_key].parents if usage_key in self else []
+        return self._block_relations.get_parents(usage_key) if usage_key in self else []
 
     def get_children(self, usage_key):
         """
@@ -108,7 +423,7 @@ class BlockStructure:
         Returns:
             [UsageKey] - A list of usage keys of the block's children.
         """
-        return self._block_relations[usage_key].children if usage_key in self else []
+        return self._block_relations.get_children(usage_key) if usage_key in self else []
 
     def set_root_block(self, usage_key):
         """
@@ -123,7 +438,7 @@ class BlockStructure:
                 new root of the block structure.
         """
         self.root_block_usage_key = usage_key
-        self._block_relations[usage_key].parents = []
+        self._block_relations.clear_parents(usage_key)
 
     def __contains__(self, usage_key):
         """
@@ -148,7 +463,7 @@ class BlockStructure:
             iterator(UsageKey) - An iterator of the usage
             keys of all the blocks in the block structure.
         """
-        return iter(self._block_relations.keys())
+        return iter(self._block_relations)
 
     #--- Block structure traversal methods ---#
 
@@ -170,8 +485,15 @@ class BlockStructure:
             generator - A generator object created from the
                 traverse_topologically method.
         """
+        start_node = start_node or self.root_block_usage_key
+        if start_node in self._block_relations:
+            return self._block_relations.topological_traversal(
+                start_node,
+                filter_func or (lambda __: True),
+                yield_descendants_of_unyielded,
+            )
         return traverse_topologically(
-            start_node=start_node or self.root_block_usage_key,
+            start_node=start_node,
             get_parents=self.get_parents,
             get_children=self.get_children,
             filter_func=filter_func,
@@ -195,8 +517,11 @@ class BlockStructure:
             generator - A generator object created from the
                 traverse_post_order method.
         """
+        start_node = start_node or self.root_block_usage_key
+        if start_node in self._block_relations:
+            return self._block_relations.post_order_traversal(start_node, filter_func)
         return traverse_post_order(
-            start_node=start_node or self.root_block_usage_key,
+            start_node=start_node,
             get_children=self.get_children,
             filter_func=filter_func,
         )
@@ -208,29 +533,12 @@ class BlockStructure:
         """
         Mutates this block structure by removing any unreachable blocks.
         """
-
-        # Create a new block relations map to store only those blocks
-        # that are still linked
-        pruned_block_relations = {}
-        old_block_relations = self._block_relations
-
-        # Build the structure from the leaves up by doing a post-order
-        # traversal of the old structure, thereby encountering only
-        # reachable blocks.
-        for block_key in self.post_order_traversal():
-            # If the block is in the old structure,
-            if block_key in old_block_relations:
-                # Add it to the new pruned structure
-                self._add_block(pruned_block_relations, block_key)
-
-                # Add a relationship to only those old children that
-                # were also added to the new pruned structure.
-                for child in old_block_relations[block_key].children:
-                    if child in pruned_block_relations:
-                        self._add_to_relations(pruned_block_relations, block_key, child)
-
-        # Replace this structure's relations with the newly pruned one.
-        self._block_relations = pruned_block_relations
+        # Rebuild the graph from the leaves up, thereby keeping only
+        # blocks that are reachable from the root.
+        if self.root_block_usage_key in self._block_relations:
+            self._block_relations = self._block_relations.pruned(self.root_block_usage_key)
+        else:
+            self._block_relations = _BlockGraph()
 
     def _add_relation(self, parent_key, child_key):
         """
@@ -240,44 +548,7 @@ class BlockStructure:
             parent_key (UsageKey) - Usage key of the parent block.
             child_key (UsageKey) - Usage key of the child block.
         """
-        self._add_to_relations(self._block_relations, parent_key, child_key)
-
-    @staticmethod
-    def _add_to_relations(block_relations, parent_key, child_key):
-        """
-        Adds a parent to child relationship in the given block
-        relations map.
-
-        Arguments:
-            block_relations (dict({UsageKey: _BlockRelations})) -
-                Internal map of a block's usage key to its
-                parents/children relations.
-
-            parent_key (UsageKey) - Usage key of the parent block.
-
-            child_key (UsageKey) - Usage key of the child block.
-        """
-        BlockStructure._add_block(block_relations, parent_key)
-        BlockStructure._add_block(block_relations, child_key)
-
-        block_relations[child_key].parents.append(parent_key)
-        block_relations[parent_key].children.append(child_key)
-
-    @staticmethod
-    def _add_block(block_relations, usage_key):
-        """
-        Adds the given usage_key to the given block_relations map.
-
-        Arguments:
-            block_relations (dict({UsageKey: _BlockRelations})) -
-                Internal map of a block's usage key to its
-                parents/children relations.
-
-            usage_key (UsageKey) - Usage key of the block that is to
-                be added to the given block_relations.
-        """
-        if usage_key not in block_relations:
-            block_relations[usage_key] = _BlockRelations()
+        self._block_relations.add_relation(parent_key, child_key)
 
 
 class FieldData:
@@ -620,26 +891,16 @@ class BlockStructureBlockData(BlockStructure):
                 removed block's children become children of the
                 removed block's parents.
         """
-        children = self._block_relations[usage_key].children
-        parents = self._block_relations[usage_key].parents
-
-        # Remove block from its children.
-        for child in children:
-            self._block_relations[child].parents.remove(usage_key)
-
-        # Remove block from its parents.
-        for parent in parents:
-            self._block_relations[parent].children.remove(usage_key)
-
-        # Remove block.
-        self._block_relations.pop(usage_key, None)
+        # Remove block, along with its relations to its parents and
+        # children.
+        parent_ids, child_ids = self._block_relations.remove_block(usage_key)
         self._block_data_map.pop(usage_key, None)
 
         # Recreate the graph connections if descendants are to be kept.
         if keep_descendants:
-            for child in children:
-                for parent in parents:
-                    self._add_relation(parent, child)
+            for child_id in child_ids:
+                for parent_id in parent_ids:
+                    self._block_relations.add_relation_ids(parent_id, child_id)
 
     def create_universal_filter(self):
         """
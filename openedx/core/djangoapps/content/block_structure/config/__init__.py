@@ -2,6 +2,7 @@
 This module contains various configuration settings via
 waffle switches for the Block Structure framework.
 """
+from django.conf import settings
 from edx_django_utils.cache import RequestCache
 from edx_toggles.toggles import WaffleSwitch
 
@@ -24,3 +25,11 @@ def cache_timeout_in_seconds():
     Returns and caches the current setting for cache_timeout_in_seconds.
     """
     return BlockStructureConfiguration.current().cache_timeout_in_seconds
+
+
+def local_cache_max_bytes():
+    """
+    Returns the setting for the maximum size of the process-local cache
+    of collected block structures.
+    """
+    return settings.BLOCK_STRUCTURES_SETTINGS.get('LOCAL_CACHE_MAX_BYTES', 0)
@@ -1,7 +1,7 @@
 """
 Module for factory class for BlockStructure objects.
 """
-from .block_structure import BlockStructureBlockData, BlockStructureModulestoreData
+from .block_structure import BlockStructureBlockData, BlockStructureModulestoreData, _BlockGraph
 
 
 class BlockStructureFactory:
@@ -89,7 +89,12 @@ class BlockStructureFactory:
     def create_new(cls, root_block_usage_key, block_relations, transformer_data, block_data_map):
         """
         Returns a new block structure for given the arguments.
+
+        block_relations is either a _BlockGraph or, for block structures
+        pickled by earlier versions, a map of usage keys to _BlockRelations.
         """
+        if not isinstance(block_relations, _BlockGraph):
+            block_relations = _BlockGraph.from_relations(block_relations)
         block_structure = BlockStructureBlockData(root_block_usage_key)
         block_structure._block_relations = block_relations  # pylint: disable=protected-access
         block_structure.transformer_data = transformer_data
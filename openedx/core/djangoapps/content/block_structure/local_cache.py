@@ -0,0 +1,138 @@
+"""
+Process-local cache of collected block structures.
+
+The BlockStructureStore still looks up the BlockStructureModel of a block
+structure on every get, but when this process already deserialized the same
+version of the structure, it is served from memory instead of fetching and
+deserializing it from the django cache (or storage) again.
+
+Entries are keyed by the root block usage key and validated against the
+version data of the model (see BlockStructureStore._version_data_of_block),
+so a structure recollected by another process is never served stale.
+Cached structures are never handed out directly: each hit returns a copy,
+which transformers are then free to mutate.
+
+The cache is bounded by the total size of the serialized data of its
+entries, as configured by BLOCK_STRUCTURES_SETTINGS['LOCAL_CACHE_MAX_BYTES'],
+and is disabled when that setting is 0.
+"""
+
+
+from collections import OrderedDict, namedtuple
+from logging import getLogger
+from threading import Lock
+
+from edx_django_utils import monitoring
+
+from . import config
+
+logger = getLogger(__name__)  # pylint: disable=C0103
+
+_CacheEntry = namedtuple('_CacheEntry', ['version', 'block_structure', 'size'])
+
+
+class BlockStructureLocalCache:
+    """
+    Thread-safe LRU cache of collected block structures, keyed by their
+    root block usage key.
+    """
+
+    def __init__(self):
+        # Map of a root block usage key to its cache entry, least recently
+        # used first.
+        # OrderedDict {UsageKey: _CacheEntry}
+        self._entries = OrderedDict()
+        self._lock = Lock()
+        self._size = 0
+
+        # Hit and miss counts of this process, for debugging.
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, root_block_usage_key, version):
+        """
+        Returns a copy of the cached block structure for the given
+        root_block_usage_key, or None if the given version of it isn't
+        cached.
+        """
+        if not config.local_cache_max_bytes():
+            return None
+
+        with self._lock:
+            entry = self._entries.get(root_block_usage_key)
+            if entry is not None and entry.version == version:
+                self._entries.move_to_end(root_block_usage_key)
+                self.hits += 1
+            else:
+                entry = None
+                self.misses += 1
+
+        # .. custom_attribute_name: block_structure.local_cache_hit
+        # .. custom_attribute_description: Whether the collected block structure
+        #   was served from the process-local cache.
+        monitoring.set_custom_attribute('block_structure.local_cache_hit', entry is not None)
+        monitoring.increment('block_structure.local_cache_hits' if entry else 'block_structure.local_cache_misses')
+
+        return entry.block_structure.copy() if entry else None
+
+    def set(self, root_block_usage_key, version, block_structure, size):
+        """
+        Caches the given block structure, which must not be modified
+        afterwards.  The size of its serialized data is used to keep the
+        cache within its configured bounds.
+
+        Returns:
+            bool - Whether the block structure was cached.
+        """
+        max_bytes = config.local_cache_max_bytes()
+        if not max_bytes or size > max_bytes:
+            return False
+
+        with self._lock:
+            self._pop(root_block_usage_key)
+            self._entries[root_block_usage_key] = _CacheEntry(version, block_structure, size)
+            self._size += size
+            while self._size > max_bytes:
+                evicted_key, evicted_entry = self._entries.popitem(last=False)
+                self._size -= evicted_entry.size
+                logger.info("BlockStructure: Evicted from local cache; %s.", evicted_key)
+        return True
+
+    def delete(self, root_block_usage_key):
+        """
+        Removes the cached block structure for the given root_block_usage_key.
+        """
+        with self._lock:
+            self._pop(root_block_usage_key)
+
+    def delete_course(self, course_key):
+        """
+        Removes all cached block structures of the given course.
+        """
+        with self._lock:
+            for root_block_usage_key in list(self._entries):
+                if getattr(root_block_usage_key, 'course_key', None) == course_key:
+                    self._pop(root_block_usage_key)
+
+    def clear(self):
+        """
+        Removes all cached block structures and resets the hit and miss counts.
+        """
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+            self.hits = 0
+            self.misses = 0
+
+    def _pop(self, root_block_usage_key):
+        """
+        Removes the entry for the given key, if any.  Must be called with
+        the lock held.
+        """
+        entry = self._entries.pop(root_block_usage_key, None)
+        if entry is not None:
+            self._size -= entry.size
+
+
+# The cache shared by all BlockStructureStores of this process.
+local_cache = BlockStructureLocalCache()
@@ -0,0 +1,534 @@
+"""
+Compact serialization format for collected block structures.
+
+Instead of pickling the whole structure as one object graph, the format
+splits a BlockStructureBlockData into independently encoded sections:
+
+    header      - JSON: interned usage keys, section layout and the names of
+                  the collected fields.
+    relations   - CSR-style arrays of block indices for children and parents.
+    transformer - The structure-wide transformer data.
+    columns     - One section per collected xBlock field and one per
+                  transformer's block data, each holding the indices of the
+                  blocks that have a value and the values themselves.
+
+Usage keys are interned as (context, block type, block id) triples so each
+course key is only stored and parsed once.  Columns are only decompressed
+and unpickled when a field or transformer is first accessed, so consumers
+do not pay for data that the transformers they run never read.
+
+Column values are still pickled since collected data may hold arbitrary
+Python objects (datetimes, user partitions, etc.).
+"""
+
+
+import json
+import pickle
+import struct
+import sys
+import zlib
+from abc import abstractmethod
+from array import array
+from copy import deepcopy
+
+from opaque_keys.edx.keys import CourseKey, UsageKey
+
+from .block_structure import (
+    BlockData,
+    BlockStructureBlockData,
+    TransformerData,
+    TransformerDataMap,
+    _BlockGraph,
+)
+
+# Prefix identifying data serialized by this module, as opposed to
+# zpickled data written by earlier versions of the BlockStructureStore.
+FORMAT_MAGIC = b'\x00BSF'
+
+# Increment whenever the layout of the serialized data changes.
+FORMAT_VERSION = 1
+
+_PREAMBLE = struct.Struct('<4sBI')
+_SECTION_LENGTH = struct.Struct('<I')
+
+# Index of the fixed sections, column sections follow them.
+_HEADER_SECTION = 0
+_RELATIONS_SECTION = 1
+_TRANSFORMER_DATA_SECTION = 2
+_FIRST_COLUMN_SECTION = 3
+
+# Marker for usage keys that cannot be rebuilt from their context key and
+# are therefore stored as their full string representation.
+_FULL_KEY = -1
+
+_PICKLE_PROTOCOL = 4
+
+
+class SerializationError(Exception):
+    """
+    Raised when data cannot be (de)serialized in this format.
+    """
+
+
+def is_serialized(data):
+    """
+    Returns whether the given data was serialized by this module.
+    """
+    return bytes(data[:len(FORMAT_MAGIC)]) == FORMAT_MAGIC
+
+
+def serialize(block_structure):
+    """
+    Returns the serialized bytes for the given BlockStructureBlockData.
+    """
+    # pylint: disable=protected-access
+    # The graph's blocks are interned first, so that the ids in its
+    # relation arrays are also their indices in the key table.
+    graph_keys, *relations = block_structure._block_relations.to_arrays()
+    key_table = _KeyTable()
+    for usage_key in graph_keys:
+        key_table.add(usage_key)
+    for usage_key in block_structure._block_data_map:
+        key_table.add(usage_key)
+
+    data_order = array('I')
+    xblock_columns = {}
+    transformer_columns = {}
+    for usage_key, block_data in block_structure._block_data_map.items():
+        index = key_table.index(usage_key)
+        data_order.append(index)
+        for field_name, value in block_data.fields.items():
+            _add_to_column(xblock_columns, field_name, index, value)
+        for transformer_name, transformer_data in block_data.transformer_data.items():
+            _add_to_column(transformer_columns, transformer_name, index, transformer_data.fields)
+
+    header = {
+        'version': BlockStructureBlockData.VERSION,
+        'root': key_table.index(block_structure.root_block_usage_key),
+        'contexts': key_table.contexts,
+        'keys': key_table.keys,
+        'relations': [len(block_array) for block_array in relations],
+        'data_order': len(data_order),
+        'xblock_fields': list(xblock_columns),
+        'transformers': list(transformer_columns),
+    }
+    sections = [
+        zlib.compress(json.dumps(header, separators=(',', ':')).encode('utf-8')),
+        zlib.compress(b''.join(_array_to_bytes(block_array) for block_array in relations + [data_order])),
+        zlib.compress(pickle.dumps(
+            {name: data.fields for name, data in block_structure.transformer_data.items()},
+            _PICKLE_PROTOCOL,
+        )),
+    ]
+    for column in list(xblock_columns.values()) + list(transformer_columns.values()):
+        sections.append(_encode_column(*column))
+
+    return b''.join(
+        [_PREAMBLE.pack(FORMAT_MAGIC, FORMAT_VERSION, len(sections))] +
+        [_SECTION_LENGTH.pack(len(section)) for section in sections] +
+        sections
+    )
+
+
+def deserialize(data, root_block_usage_key):
+    """
+    Returns the BlockStructureBlockData serialized in the given data.
+
+    Only the header, relations and structure-wide transformer data are
+    decoded eagerly; block data columns are decoded on first access.
+
+    Raises:
+        SerializationError if the data is not in a supported format.
+    """
+    # pylint: disable=protected-access
+    sections = _split_sections(data)
+    header = json.loads(zlib.decompress(sections[_HEADER_SECTION]).decode('utf-8'))
+    if header['version'] != BlockStructureBlockData.VERSION:
+        raise SerializationError(f"Unsupported BlockStructureBlockData version {header['version']}")
+
+    usage_keys = _KeyTable.decode(header['contexts'], header['keys'])
+    if usage_keys[header['root']] != root_block_usage_key:
+        raise SerializationError(f'Serialized data is not rooted at {root_block_usage_key}')
+
+    relations_data = zlib.decompress(sections[_RELATIONS_SECTION])
+    child_offsets, children, parent_offsets, parents, data_order = _bytes_to_arrays(
+        relations_data, header['relations'] + [header['data_order']],
+    )
+
+    block_structure = BlockStructureBlockData(root_block_usage_key)
+    block_structure._block_relations = _BlockGraph(
+        usage_keys[:len(child_offsets) - 1], child_offsets, children, parent_offsets, parents,
+    )
+
+    for name, fields in pickle.loads(zlib.decompress(sections[_TRANSFORMER_DATA_SECTION])).items():
+        block_structure.transformer_data.get_or_create(name).fields = fields
+
+    column_sections = iter(sections[_FIRST_COLUMN_SECTION:])
+    columns = _LazyColumns(
+        blocks={},
+        xblock_columns=dict(zip(header['xblock_fields'], column_sections)),
+        transformer_columns=dict(zip(header['transformers'], column_sections)),
+    )
+    block_data_map = {}
+    for index in data_order:
+        block_data = BlockData(usage_keys[index])
+        block_data.fields = _LazyFieldDict(columns)
+        block_data.transformer_data = _LazyTransformerDataMap(columns)
+        block_data_map[block_data.location] = block_data
+        columns.blocks[index] = block_data
+    block_structure._block_data_map = block_data_map
+
+    return block_structure
+
+
+class _KeyTable:
+    """
+    Interns the usage keys of a block structure, assigning each a dense index.
+    """
+    def __init__(self):
+        self.contexts = []
+        self.keys = []
+        self._context_indices = {}
+        self._key_indices = {}
+
+    def add(self, usage_key):
+        """
+        Adds the given usage key to the table, if not already present.
+        """
+        if usage_key in self._key_indices:
+            return
+        if not isinstance(usage_key, UsageKey):
+            raise SerializationError(f'Cannot serialize block key {usage_key!r}')
+
+        self._key_indices[usage_key] = len(self.keys)
+        context_key = usage_key.context_key
+        if self._can_intern(usage_key):
+            if context_key not in self._context_indices:
+                self._context_indices[context_key] = len(self.contexts)
+                self.contexts.append(str(context_key))
+            self.keys.append([self._context_indices[context_key], usage_key.block_type, usage_key.block_id])
+        else:
+            self.keys.append([_FULL_KEY, str(usage_key)])
+
+    def index(self, usage_key):
+        """
+        Returns the index of the given usage key.
+        """
+        return self._key_indices[usage_key]
+
+    @staticmethod
+    def _can_intern(usage_key):
+        """
+        Returns whether the usage key can be rebuilt from its context key,
+        block type and block id.
+        """
+        context_key = usage_key.context_key
+        try:
+            return (
+                isinstance(context_key, CourseKey) and
+                CourseKey.from_string(str(context_key)) == context_key and
+                context_key.make_usage_key(usage_key.block_type, usage_key.block_id) == usage_key
+            )
+        except Exception:  # pylint: disable=broad-except
+            return False
+
+    @staticmethod
+    def decode(contexts, keys):
+        """
+        Returns the list of usage keys, in index order, for the given
+        encoded contexts and keys.
+        """
+        context_keys = [CourseKey.from_string(context) for context in contexts]
+        return [
+            UsageKey.from_string(key[1]) if key[0] == _FULL_KEY
+            else context_keys[key[0]].make_usage_key(key[1], key[2])
+            for key in keys
+        ]
+
+
+def _add_to_column(columns, name, index, value):
+    """
+    Appends the value of the block at the given index to the named column.
+    """
+    if name not in columns:
+        columns[name] = (array('I'), [])
+    indices, values = columns[name]
+    indices.append(index)
+    values.append(value)
+
+
+def _encode_column(indices, values):
+    """
+    Returns the encoded section for a column.
+    """
+    return zlib.compress(
+        _SECTION_LENGTH.pack(len(indices)) + _array_to_bytes(indices) + pickle.dumps(values, _PICKLE_PROTOCOL)
+    )
+
+
+def _decode_column(section):
+    """
+    Returns an iterable of (block index, value) pairs for an encoded column.
+    """
+    data = zlib.decompress(section)
+    count, = _SECTION_LENGTH.unpack_from(data)
+    indices_end = _SECTION_LENGTH.size + count * 4
+    indices, = _bytes_to_arrays(data[_SECTION_LENGTH.size:indices_end], [count])
+    return zip(indices, pickle.loads(data[indices_end:]))
+
+
+def _split_sections(data):
+    """
+    Returns the list of sections of the given serialized data.
+    """
+    data = memoryview(data)
+    try:
+        magic, version, count = _PREAMBLE.unpack_from(data)
+    except struct.error as error:
+        raise SerializationError('Truncated block structure data') from error
+    if magic != FORMAT_MAGIC or version != FORMAT_VERSION:
+        raise SerializationError(f'Unsupported block structure format {magic!r} v{version}')
+
+    offset = _PREAMBLE.size + count * _SECTION_LENGTH.size
+    sections = []
+    for section_index in range(count):
+        length, = _SECTION_LENGTH.unpack_from(data, _PREAMBLE.size + section_index * _SECTION_LENGTH.size)
+        sections.append(data[offset:offset + length])
+        offset += length
+    if offset != len(data):
+        raise SerializationError('Block structure data length does not match its sections')
+    return sections
+
+
+def _array_to_bytes(block_array):
+    """
+    Returns the little-endian bytes of the given array of unsigned ints.
+    """
+    if sys.byteorder == 'big':
+        block_array = array(block_array.typecode, block_array)
+        block_array.byteswap()
+    return block_array.tobytes()
+
+
+def _bytes_to_arrays(data, lengths):
+    """
+    Splits little-endian bytes into arrays of unsigned ints of the given lengths.
+    """
+    arrays = []
+    offset = 0
+    for length in lengths:
+        block_array = array('I')
+        block_array.frombytes(data[offset:offset + length * block_array.itemsize])
+        if sys.byteorder == 'big':
+            block_array.byteswap()
+        arrays.append(block_array)
+        offset += length * block_array.itemsize
+    if offset != len(data):
+        raise SerializationError('Block structure relations do not match their declared sizes')
+    return arrays
+
+
+class _LazyColumns:
+    """
+    The not yet decoded block data columns of a deserialized block structure.
+
+    Decoding a column assigns its values to every block that has one, so a
+    column is decoded at most once per block structure.
+    """
+    def __init__(self, blocks, xblock_columns, transformer_columns):
+        # Map of a block's index to its BlockData.
+        self.blocks = blocks
+
+        # Maps of a field or transformer name to its encoded column.
+        self._xblock_columns = xblock_columns
+        self._transformer_columns = transformer_columns
+
+    def load_xblock_field(self, field_name):
+        """
+        Decodes the column of the given xBlock field, if not yet decoded.
+        """
+        section = self._xblock_columns.pop(field_name, None) if self._xblock_columns else None
+        if section is not None:
+            for index, value in _decode_column(section):
+                dict.__setitem__(self.blocks[index].fields, field_name, value)
+
+    def load_transformer(self, transformer_name):
+        """
+        Decodes the column of the given transformer's block data, if not yet decoded.
+        """
+        section = self._transformer_columns.pop(transformer_name, None) if self._transformer_columns else None
+        if section is not None:
+            for index, fields in _decode_column(section):
+                transformer_data = TransformerData()
+                transformer_data.fields = fields
+                dict.__setitem__(self.blocks[index].transformer_data, transformer_name, transformer_data)
+
+    def load_all_xblock_fields(self):
+        """
+        Decodes all remaining xBlock field columns.
+        """
+        for field_name in list(self._xblock_columns):
+            self.load_xblock_field(field_name)
+
+    def load_all_transformers(self):
+        """
+        Decodes all remaining transformer columns.
+        """
+        for transformer_name in list(self._transformer_columns):
+            self.load_transformer(transformer_name)
+
+    def __deepcopy__(self, memo):
+        # Encoded columns are immutable and shared; decoded values live in
+        # the blocks, which are copied along with the rest of the structure.
+        copied = _LazyColumns.__new__(_LazyColumns)
+        memo[id(self)] = copied
+        copied._xblock_columns = dict(self._xblock_columns)  # pylint: disable=protected-access
+        copied._transformer_columns = dict(self._transformer_columns)  # pylint: disable=protected-access
+        copied.blocks = deepcopy(self.blocks, memo)
+        return copied
+
+
+class _LazyDictMixin:
+    """
+    Mixin for dicts whose entries are decoded from _LazyColumns on first access.
+
+    Every per-key operation first decodes the key's column, and every
+    operation on the dict as a whole first decodes all columns, so the dict
+    behaves exactly as if it was fully decoded upfront.
+    """
+    __slots__ = ()
+
+    # The class a fully decoded copy of the dict is pickled as.
+    plain_class = dict
+
+    def __init__(self, columns):
+        super().__init__()
+        self._columns = columns
+
+    @abstractmethod
+    def _load(self, key):
+        """
+        Decodes the column of the given key, if not yet decoded.
+        """
+
+    @abstractmethod
+    def _load_all(self):
+        """
+        Decodes all remaining columns.
+        """
+
+    def __getitem__(self, key):
+        self._load(key)
+        return super().__getitem__(key)
+
+    def __setitem__(self, key, value):
+        self._load(key)
+        super().__setitem__(key, value)
+
+    def __delitem__(self, key):
+        self._load(key)
+        super().__delitem__(key)
+
+    def __contains__(self, key):
+        self._load(key)
+        return super().__contains__(key)
+
+    def get(self, key, default=None):
+        self._load(key)
+        return super().get(key, default)
+
+    def pop(self, key, *args):
+        self._load(key)
+        return super().pop(key, *args)
+
+    def setdefault(self, key, default=None):
+        self._load(key)
+        return super().setdefault(key, default)
+
+    def __iter__(self):
+        self._load_all()
+        return super().__iter__()
+
+    def __len__(self):
+        self._load_all()
+        return super().__len__()
+
+    def __eq__(self, other):
+        self._load_all()
+        return super().__eq__(other)
+
+    def __ne__(self, other):
+        self._load_all()
+        return super().__ne__(other)
+
+    __hash__ = None
+
+    def __repr__(self):
+        self._load_all()
+        return super().__repr__()
+
+    def keys(self):
+        self._load_all()
+        return super().keys()
+
+    def values(self):
+        self._load_all()
+        return super().values()
+
+    def items(self):
+        self._load_all()
+        return super().items()
+
+    def copy(self):
+        self._load_all()
+        return self.plain_class(super().items())
+
+    def update(self, *args, **kwargs):
+        for key, value in dict(*args, **kwargs).items():
+            self[key] = value
+
+    def popitem(self):
+        self._load_all()
+        return super().popitem()
+
+    def clear(self):
+        self._load_all()
+        super().clear()
+
+    def __reduce__(self):
+        return (self.plain_class, (dict(self.items()),))
+
+    def __deepcopy__(self, memo):
+        copied = type(self)(deepcopy(self._columns, memo))
+        memo[id(self)] = copied
+        for key, value in dict.items(self):
+            dict.__setitem__(copied, key, deepcopy(value, memo))
+        return copied
+
+
+class _LazyFieldDict(_LazyDictMixin, dict):
+    """
+    The xBlock fields of a deserialized BlockData.
+    """
+    __slots__ = ('_columns',)
+
+    def _load(self, key):
+        self._columns.load_xblock_field(key)
+
+    def _load_all(self):
+        self._columns.load_all_xblock_fields()
+
+
+class _LazyTransformerDataMap(_LazyDictMixin, TransformerDataMap):
+    """
+    The transformer data of a deserialized BlockData.
+    """
+    __slots__ = ('_columns',)
+
+    plain_class = TransformerDataMap
+
+    def _load(self, key):
+        self._columns.load_transformer(self._translate_key(key))
+
+    def _load_all(self):
+        self._columns.load_all_transformers()
@@ -11,6 +11,7 @@ from opaque_keys.edx.locator import LibraryLocator
 from xmodule.modulestore.django import SignalHandler
 
 from .api import clear_course_from_cache
+from .local_cache import local_cache
 from .tasks import update_course_in_cache_v2
 
 log = logging.getLogger(__name__)
@@ -26,6 +27,10 @@ def update_block_structure_on_course_publish(sender, course_key, **kwargs):  # p
     if isinstance(course_key, LibraryLocator):
         return
 
+    # Other processes detect the new version once it is collected, but free
+    # this process's copy of the outdated structure right away.
+    local_cache.delete_course(course_key)
+
     update_course_in_cache_v2.apply_async(
         kwargs=dict(course_id=str(course_key)),
         countdown=settings.BLOCK_STRUCTURES_SETTINGS['COURSE_PUBLISH_TASK_DELAY'],
@@ -7,12 +7,13 @@ Module for the Storage of BlockStructure objects.
 from logging import getLogger
 
 
-from openedx.core.lib.cache_utils import zpickle, zunpickle
+from openedx.core.lib.cache_utils import zunpickle
 
-from . import config
+from . import config, serialization
 from .block_structure import BlockStructureBlockData
 from .exceptions import BlockStructureNotFound
 from .factory import BlockStructureFactory
+from .local_cache import local_cache
 from .models import BlockStructureModel
 from .transformer_registry import TransformerRegistry
 
@@ -37,8 +38,8 @@ class BlockStructureStore:
 
     def add(self, block_structure):
         """
-        Stores and caches a compressed and pickled serialization of
-        the given block structure.
+        Stores and caches a compact serialization of the given block
+        structure (see the serialization module).
 
         The data stored includes the structure's
         block relations, transformer data, and block data.
@@ -51,12 +52,17 @@ class BlockStructureStore:
 
         bs_model = self._update_or_create_model(block_structure, serialized_data)
         self._add_to_cache(serialized_data, bs_model)
+        local_cache.delete(block_structure.root_block_usage_key)
 
     def get(self, root_block_usage_key):
         """
         Deserializes and returns the block structure starting at
         root_block_usage_key, if found in the cache or storage.
 
+        If the same version of the block structure was already
+        deserialized by this process, a copy of it is returned from the
+        process-local cache instead (see the local_cache module).
+
         The given root_block_usage_key must equate the
         root_block_usage_key previously passed to the `add` method.
 
@@ -74,6 +80,11 @@ class BlockStructureStore:
             found.
         """
         bs_model = self._get_model(root_block_usage_key)
+        version = self._encode_root_cache_key(bs_model)
+
+        block_structure = local_cache.get(root_block_usage_key, version)
+        if block_structure is not None:
+            return block_structure
 
         try:
             serialized_data = self._get_from_cache(bs_model)
@@ -81,7 +92,12 @@ class BlockStructureStore:
             serialized_data = self._get_from_store(bs_model)
             self._add_to_cache(serialized_data, bs_model)
 
-        return self._deserialize(serialized_data, root_block_usage_key)
+        block_structure = self._deserialize(serialized_data, root_block_usage_key)
+
+        # The cached instance is kept pristine, so callers get a copy.
+        if local_cache.set(root_block_usage_key, version, block_structure, len(serialized_data)):
+            return block_structure.copy()
+        return block_structure
 
     def delete(self, root_block_usage_key):
         """
@@ -92,6 +108,7 @@ class BlockStructureStore:
             root_block_usage_key (UsageKey) - The usage_key for the root
                 of the block structure that is to be removed.
         """
+        local_cache.delete(root_block_usage_key)
         bs_model = self._get_model(root_block_usage_key)
         self._cache.delete(self._encode_root_cache_key(bs_model))
         bs_model.delete()
@@ -176,19 +193,19 @@ class BlockStructureStore:
         """
         Serializes the data for the given block_structure.
         """
-        data_to_cache = (
-            block_structure._block_relations,
-            block_structure.transformer_data,
-            block_structure._block_data_map,
-        )
-        return zpickle(data_to_cache)
+        return serialization.serialize(block_structure)
 
     def _deserialize(self, serialized_data, root_block_usage_key):
         """
         Deserializes the given data and returns the parsed block_structure.
+
+        Data zpickled by earlier versions of this store is still supported
+        until it is replaced on the next collect.
         """
 
         try:
+            if serialization.is_serialized(serialized_data):
+                return serialization.deserialize(serialized_data, root_block_usage_key)
             block_relations, transformer_data, block_data_map = zunpickle(serialized_data)
         except Exception:
             # Somehow failed to de-serialized the data, assume it's corrupt.
@@ -14,7 +14,7 @@ import ddt
 
 from openedx.core.lib.graph_traversals import traverse_post_order
 
-from ..block_structure import BlockStructure, BlockStructureModulestoreData
+from ..block_structure import BlockStructure, BlockStructureModulestoreData, _BlockGraph, _BlockRelations
 from ..exceptions import TransformerException
 from .helpers import ChildrenMapTestMixin, MockTransformer, MockXBlock
 
@@ -47,6 +47,36 @@ class TestBlockStructure(TestCase, ChildrenMapTestMixin):
             assert node in block_structure
         assert (len(children_map) + 1) not in block_structure
 
+    @ddt.data(
+        ChildrenMapTestMixin.SIMPLE_CHILDREN_MAP,
+        ChildrenMapTestMixin.DAG_CHILDREN_MAP,
+    )
+    def test_graph_from_legacy_relations(self, children_map):
+        block_relations = {}
+        for block, children in enumerate(children_map):
+            block_relations.setdefault(block, _BlockRelations()).children = list(children)
+            for child in children:
+                block_relations.setdefault(child, _BlockRelations()).parents.append(block)
+
+        graph = _BlockGraph.from_relations(block_relations)
+        assert list(graph) == list(block_relations)
+        for block, relations in block_relations.items():
+            assert graph.get_children(block) == relations.children
+            assert graph.get_parents(block) == relations.parents
+
+    def test_graph_copy_shares_arrays(self):
+        block_structure = self.create_block_structure(ChildrenMapTestMixin.DAG_CHILDREN_MAP, BlockStructure)
+        block_structure._prune_unreachable()
+        graph = block_structure._block_relations
+        graph_copy = deepcopy(graph)
+        assert graph_copy._children is graph._children
+
+        graph_copy.remove_block(1)
+        assert 1 not in graph_copy
+        assert 1 in graph
+        assert 1 in graph.get_children(0)
+        assert 1 not in graph_copy.get_children(0)
+
 
 @ddt.ddt
 class TestBlockStructureData(TestCase, ChildrenMapTestMixin):
@@ -0,0 +1,99 @@
+"""
+Tests for block_structure/serialization.py
+"""
+# pylint: disable=protected-access
+
+import pickle
+from datetime import datetime
+
+import pytest
+from django.test import TestCase
+from pytz import UTC
+
+from ..block_structure import BlockStructureBlockData
+from ..serialization import SerializationError, deserialize, is_serialized, serialize
+from .helpers import ChildrenMapTestMixin, MockTransformer, UsageKeyFactoryMixin
+
+
+class TestBlockStructureSerialization(UsageKeyFactoryMixin, ChildrenMapTestMixin, TestCase):
+    """
+    Tests for serializing and deserializing BlockStructureBlockData.
+    """
+    def setUp(self):
+        super().setUp()
+        self.children_map = self.DAG_CHILDREN_MAP
+        self.block_structure = self.create_block_structure(self.children_map)
+        self.block_structure._add_transformer(MockTransformer)
+        self.due = datetime(2020, 1, 1, tzinfo=UTC)
+        self.block_structure.override_xblock_field(self.block_key_factory(1), 'due', self.due)
+        self.block_structure.override_xblock_field(self.block_key_factory(2), 'display_name', 'Block 2')
+        self.block_structure.set_transformer_block_field(self.block_key_factory(3), MockTransformer, 'test', 3)
+
+    def _round_trip(self, block_structure=None):
+        data = serialize(block_structure or self.block_structure)
+        assert is_serialized(data)
+        return deserialize(data, self.block_key_factory(0))
+
+    def _pending_columns(self, block_structure):
+        columns = block_structure[self.block_key_factory(0)].fields._columns
+        return set(columns._xblock_columns), set(columns._transformer_columns)
+
+    def test_round_trip(self):
+        block_structure = self._round_trip()
+        self.assert_block_structure(block_structure, self.children_map)
+        assert list(block_structure) == list(self.block_structure)
+        assert list(block_structure._block_data_map) == list(self.block_structure._block_data_map)
+        assert block_structure.get_parents(self.block_key_factory(3)) ==\
+            self.block_structure.get_parents(self.block_key_factory(3))
+        assert block_structure.get_xblock_field(self.block_key_factory(1), 'due') == self.due
+        assert block_structure.get_xblock_field(self.block_key_factory(1), 'display_name') is None
+        assert block_structure.get_xblock_field(self.block_key_factory(2), 'display_name') == 'Block 2'
+        assert block_structure.get_transformer_block_field(self.block_key_factory(3), MockTransformer, 'test') == 3
+        assert block_structure._get_transformer_data_version(MockTransformer) == MockTransformer.WRITE_VERSION
+
+    def test_columns_decoded_on_first_access(self):
+        block_structure = self._round_trip()
+        assert self._pending_columns(block_structure) == ({'due', 'display_name'}, {MockTransformer.name()})
+
+        block_structure.get_xblock_field(self.block_key_factory(4), 'due')
+        assert self._pending_columns(block_structure) == ({'display_name'}, {MockTransformer.name()})
+
+        block_structure.get_transformer_block_field(self.block_key_factory(3), MockTransformer, 'test')
+        assert self._pending_columns(block_structure) == ({'display_name'}, set())
+
+    def test_write_before_decode(self):
+        block_structure = self._round_trip()
+        block_structure.override_xblock_field(self.block_key_factory(2), 'display_name', 'Changed')
+        block_structure.remove_transformer_block_field(self.block_key_factory(3), MockTransformer, 'test')
+        assert block_structure.get_xblock_field(self.block_key_factory(2), 'display_name') == 'Changed'
+        assert block_structure.get_transformer_block_field(self.block_key_factory(3), MockTransformer, 'test') is None
+
+    def test_copy_is_independent(self):
+        block_structure = self._round_trip()
+        copied = block_structure.copy()
+        copied.override_xblock_field(self.block_key_factory(2), 'display_name', 'Changed')
+        assert copied.get_xblock_field(self.block_key_factory(1), 'due') == self.due
+        assert block_structure.get_xblock_field(self.block_key_factory(2), 'display_name') == 'Block 2'
+        assert self._pending_columns(block_structure)[0] == {'due'}
+
+    def test_pickle_and_reserialize_decode_everything(self):
+        block_structure = self._round_trip()
+        block_data_map = pickle.loads(pickle.dumps(block_structure._block_data_map))
+        assert block_data_map[self.block_key_factory(1)].fields == {'due': self.due}
+
+        block_structure = self._round_trip(self._round_trip())
+        assert block_structure.get_xblock_field(self.block_key_factory(2), 'display_name') == 'Block 2'
+
+    def test_invalid_data(self):
+        assert not is_serialized(b'\x78\x9c')
+        data = serialize(self.block_structure)
+        with pytest.raises(SerializationError):
+            deserialize(data[:-1], self.block_key_factory(0))
+        with pytest.raises(SerializationError):
+            deserialize(data, self.block_key_factory(1))
+
+    def test_non_usage_key(self):
+        block_structure = BlockStructureBlockData(root_block_usage_key=0)
+        block_structure._add_relation(0, 1)
+        with pytest.raises(SerializationError):
+            serialize(block_structure)
@@ -4,11 +4,16 @@ Tests for block_structure/cache.py
 
 import pytest
 import ddt
+from django.conf import settings
+from django.test import override_settings
 
 from openedx.core.djangolib.testing.utils import CacheIsolationTestCase
+from openedx.core.lib.cache_utils import zpickle
 
+from ..block_structure import _BlockRelations
 from ..config.models import BlockStructureConfiguration
 from ..exceptions import BlockStructureNotFound
+from ..local_cache import local_cache
 from ..store import BlockStructureStore
 from .helpers import ChildrenMapTestMixin, MockCache, MockTransformer, UsageKeyFactoryMixin
 
@@ -30,6 +35,9 @@ class TestBlockStructureStore(UsageKeyFactoryMixin, ChildrenMapTestMixin, CacheI
         self.mock_cache = MockCache()
         self.store = BlockStructureStore(self.mock_cache)
 
+        local_cache.clear()
+        self.addCleanup(local_cache.clear)
+
     def add_transformers(self):
         """
         Add each registered transformer to the block structure.
@@ -76,3 +84,78 @@ class TestBlockStructureStore(UsageKeyFactoryMixin, ChildrenMapTestMixin, CacheI
         assert self.mock_cache.timeout_from_last_call == 0
         self.store.add(self.block_structure)
         assert self.mock_cache.timeout_from_last_call == timeout
+
+    def test_get_legacy_pickled_data(self):
+        self.store.add(self.block_structure)
+        legacy_block_relations = {}
+        for block_key in self.block_structure:
+            legacy_block_relations[block_key] = _BlockRelations()
+            legacy_block_relations[block_key].children = self.block_structure.get_children(block_key)
+            legacy_block_relations[block_key].parents = self.block_structure.get_parents(block_key)
+        legacy_data = zpickle((
+            legacy_block_relations,
+            self.block_structure.transformer_data,
+            self.block_structure._block_data_map,  # pylint: disable=protected-access
+        ))
+        for key in self.mock_cache.map:
+            self.mock_cache.map[key] = legacy_data
+        stored_value = self.store.get(self.block_structure.root_block_usage_key)
+        self.assert_block_structure(stored_value, self.children_map)
+        assert stored_value.get_transformer_block_field(
+            self.block_key_factory(0), MockTransformer, 'test'
+        ) == f'{MockTransformer.name()} val'
+
+    def test_get_corrupt_data(self):
+        self.store.add(self.block_structure)
+        for key in self.mock_cache.map:
+            self.mock_cache.map[key] = self.mock_cache.map[key][:-1]
+        with pytest.raises(BlockStructureNotFound):
+            self.store.get(self.block_structure.root_block_usage_key)
+
+    def _local_cache_settings(self, max_bytes):
+        """
+        Returns a settings override enabling the local cache with the given size.
+        """
+        return override_settings(
+            BLOCK_STRUCTURES_SETTINGS=dict(settings.BLOCK_STRUCTURES_SETTINGS, LOCAL_CACHE_MAX_BYTES=max_bytes),
+        )
+
+    def test_local_cache_hit(self):
+        root_block_usage_key = self.block_structure.root_block_usage_key
+        with self._local_cache_settings(1024 * 1024):
+            self.store.add(self.block_structure)
+            first_value = self.store.get(root_block_usage_key)
+            self.mock_cache.map.clear()
+
+            # Changes to a returned structure don't affect the cached one.
+            first_value.remove_block(self.block_key_factory(1), keep_descendants=False)
+            stored_value = self.store.get(root_block_usage_key)
+
+        assert (local_cache.hits, local_cache.misses) == (1, 1)
+        assert stored_value is not first_value
+        self.assert_block_structure(stored_value, self.children_map)
+
+    def test_local_cache_add_and_delete(self):
+        root_block_usage_key = self.block_structure.root_block_usage_key
+        with self._local_cache_settings(1024 * 1024):
+            self.store.add(self.block_structure)
+            self.store.get(root_block_usage_key)
+            self.store.add(self.block_structure)
+            self.store.get(root_block_usage_key)
+            assert (local_cache.hits, local_cache.misses) == (0, 2)
+
+            self.store.delete(root_block_usage_key)
+            with pytest.raises(BlockStructureNotFound):
+                self.store.get(root_block_usage_key)
+
+    @ddt.data(0, 1)
+    def test_local_cache_disabled_or_full(self, max_bytes):
+        root_block_usage_key = self.block_structure.root_block_usage_key
+        with self._local_cache_settings(max_bytes):
+            self.store.add(self.block_structure)
+            self.store.get(root_block_usage_key)
+            self.mock_cache.map.clear()
+            stored_value = self.store.get(root_block_usage_key)
+
+        assert local_cache.hits == 0
+        self.assert_block_structure(stored_value, self.children_map)
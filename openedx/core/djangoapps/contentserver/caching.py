@@ -5,7 +5,7 @@ from django.core.cache import caches
 from django.core.cache.backends.base import InvalidCacheBackendError
 from opaque_keys import InvalidKeyError
 
-from xmodule.contentstore.content import STATIC_CONTENT_VERSION
+from xmodule.contentstore.content import STATIC_CONTENT_VERSION, StaticContent
 
 # See if there's a "course_assets" cache configured, and if not, fallback to the default cache.
 CONTENT_CACHE = caches['default']
@@ -29,6 +29,38 @@ def get_cached_content(location):
     return CONTENT_CACHE.get(str(location).encode("utf-8"), version=STATIC_CONTENT_VERSION)
 
 
+def _metadata_key(location):
+    """
+    Returns the cache key of the metadata of the content at the given location.
+    """
+    return f'{location}:metadata'.encode("utf-8")
+
+
+def set_cached_content_metadata(content):
+    """
+    Stores everything about the given piece of content but its data in the cache.
+
+    This is used for content too large to be cached as a whole, so that serving
+    it doesn't need a contentstore lookup before the data is streamed, and none
+    at all for requests answered without data (e.g. Not Modified responses).
+    """
+    metadata = StaticContent(
+        content.location, content.name, content.content_type, None,
+        last_modified_at=content.last_modified_at, thumbnail_location=content.thumbnail_location,
+        import_path=content.import_path, length=content.length, locked=content.locked,
+        content_digest=content.content_digest,
+    )
+    CONTENT_CACHE.set(_metadata_key(content.location), metadata, version=STATIC_CONTENT_VERSION)
+
+
+def get_cached_content_metadata(location):
+    """
+    Retrieves the metadata of the given piece of content by its location if cached.
+    The data of the returned content is None.
+    """
+    return CONTENT_CACHE.get(_metadata_key(location), version=STATIC_CONTENT_VERSION)
+
+
 def del_cached_content(location):
     """
     Delete content for the given location, as well versions of the content without a run.
@@ -40,11 +72,12 @@ def del_cached_content(location):
         """Force the location to a Unicode string."""
         return str(loc).encode("utf-8")
 
-    locations = [location_str(location)]
+    locations = [location]
     try:
-        locations.append(location_str(location.replace(run=None)))
+        locations.append(location.replace(run=None))
     except InvalidKeyError:
         # although deprecated keys allowed run=None, new keys don't if there is no version.
         pass
 
-    CONTENT_CACHE.delete_many(locations, version=STATIC_CONTENT_VERSION)
+    keys = [location_str(loc) for loc in locations] + [_metadata_key(loc) for loc in locations]
+    CONTENT_CACHE.delete_many(keys, version=STATIC_CONTENT_VERSION)
@@ -0,0 +1,178 @@
+"""
+Size-bounded cache of course assets on local disk.
+
+Assets too large to be cached in memory are streamed from the contentstore
+on every request.  When COURSE_ASSETS_DISK_CACHE_DIR is set, the data of
+such an asset is written to a file in that directory while it is streamed
+in full, and later requests are served from the file, which lets the WSGI
+server send it without copying it through Python (see FileResponse).
+
+Files are named after the location and version of the asset, so a changed
+asset is never served from the file of its previous version.  The least
+recently used files are removed when the total size of the files exceeds
+COURSE_ASSETS_DISK_CACHE_MAX_BYTES.
+"""
+
+
+import hashlib
+import logging
+import os
+import tempfile
+import time
+
+from django.conf import settings
+
+log = logging.getLogger(__name__)
+
+TEMP_FILE_PREFIX = '.tmp-'
+
+# Temporary files older than this (in seconds) were left behind by interrupted
+# processes, and are removed during eviction.
+STALE_TEMP_FILE_AGE = 3600
+
+
+def _cache_dir():
+    """
+    Returns the directory of the cache, or None if the cache is disabled.
+    """
+    return getattr(settings, 'COURSE_ASSETS_DISK_CACHE_DIR', None)
+
+
+def _max_bytes():
+    """
+    Returns the maximum total size of the cached files.
+    """
+    return getattr(settings, 'COURSE_ASSETS_DISK_CACHE_MAX_BYTES', 1024 ** 3)
+
+
+def _file_path(cache_dir, content):
+    """
+    Returns the path of the cache file of the given content.
+    """
+    version = content.content_digest or content.last_modified_at
+    file_name = hashlib.sha1(f'{content.location}@{version}'.encode('utf-8')).hexdigest()
+    return os.path.join(cache_dir, file_name)
+
+
+def open_cached_file(content):
+    """
+    Returns the cache file of the given content opened for binary reading,
+    or None if it isn't cached.
+    """
+    cache_dir = _cache_dir()
+    if not cache_dir:
+        return None
+
+    path = _file_path(cache_dir, content)
+    try:
+        cached_file = open(path, 'rb')  # pylint: disable=consider-using-with
+    except OSError:
+        return None
+
+    try:
+        # Mark the file as recently used.
+        os.utime(path)
+    except OSError:
+        pass
+    return cached_file
+
+
+def read_file_range(cached_file, first_byte, last_byte, chunk_size):
+    """
+    Yields the data of the given file between first_byte and last_byte
+    (included), and closes the file.
+    """
+    with cached_file:
+        cached_file.seek(first_byte)
+        remaining = last_byte - first_byte + 1
+        while remaining > 0:
+            chunk = cached_file.read(min(chunk_size, remaining))
+            if not chunk:
+                break
+            remaining -= len(chunk)
+            yield chunk
+
+
+def cache_while_streaming(content, chunks):
+    """
+    Yields the given chunks of the data of the given content, writing them to
+    a cache file, which is added to the cache once all of them were yielded.
+
+    Nothing is cached if the cache is disabled, the content is larger than the
+    cache, or the stream is closed before it ends (e.g. the client went away).
+    """
+    cache_dir = _cache_dir()
+    max_bytes = _max_bytes()
+    if not cache_dir or content.length is None or content.length > max_bytes:
+        yield from chunks
+        return
+
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+        temp_fd, temp_path = tempfile.mkstemp(dir=cache_dir, prefix=TEMP_FILE_PREFIX)
+    except OSError:
+        log.exception('Unable to create a file in the course assets disk cache %s', cache_dir)
+        yield from chunks
+        return
+
+    temp_file = os.fdopen(temp_fd, 'wb')
+    try:
+        for chunk in chunks:
+            if temp_file is not None:
+                try:
+                    temp_file.write(chunk)
+                except OSError:
+                    log.exception('Unable to write %s to the course assets disk cache', content.location)
+                    temp_file.close()
+                    temp_file = None
+            yield chunk
+
+        if temp_file is not None:
+            temp_file.close()
+            temp_file = None
+            os.replace(temp_path, _file_path(cache_dir, content))
+            _evict(cache_dir, max_bytes)
+    finally:
+        if temp_file is not None:
+            temp_file.close()
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+
+
+def _evict(cache_dir, max_bytes):
+    """
+    Removes the least recently used files until the cache is within its
+    bounds, and removes stale temporary files.
+    """
+    now = time.time()
+    files = []
+    total_bytes = 0
+    with os.scandir(cache_dir) as entries:
+        for entry in entries:
+            try:
+                stat = entry.stat()
+            except OSError:
+                continue
+            if entry.name.startswith(TEMP_FILE_PREFIX):
+                if now - stat.st_mtime > STALE_TEMP_FILE_AGE:
+                    _remove(entry.path)
+                continue
+            files.append((stat.st_mtime, stat.st_size, entry.path))
+            total_bytes += stat.st_size
+
+    files.sort()
+    for _, size, path in files:
+        if total_bytes <= max_bytes:
+            break
+        _remove(path)
+        total_bytes -= size
+
+
+def _remove(path):
+    """
+    Removes the given file, which another process may have removed already.
+    """
+    try:
+        os.remove(path)
+    except OSError:
+        pass
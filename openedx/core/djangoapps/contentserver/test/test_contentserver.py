@@ -6,6 +6,8 @@ Tests for content server.
 import copy
 import datetime
 import logging
+import os
+import tempfile
 import unittest
 from unittest.mock import patch
 from uuid import uuid4
@@ -367,6 +369,57 @@ class ContentStoreToyCourseTest(SharedModuleStoreTestCase):
             first=(self.length_unlocked), last=(self.length_unlocked)))
         assert resp.status_code == 416
 
+    def test_etag_not_modified(self):
+        """
+        Test that a request with a matching If-None-Match header gets a Not Modified response.
+        """
+        resp = self.client.get(self.url_unlocked)
+        assert resp.status_code == 200
+        etag = resp['ETag']
+
+        resp = self.client.get(self.url_unlocked, HTTP_IF_NONE_MATCH=etag)
+        assert resp.status_code == 304
+        assert resp['ETag'] == etag
+
+        resp = self.client.get(self.url_unlocked, HTTP_IF_NONE_MATCH=f'"{FAKE_MD5_HASH}"')
+        assert resp.status_code == 200
+
+    def test_etag_locked_asset_not_logged_in(self):
+        """
+        Test that a matching If-None-Match header doesn't bypass the access checks of locked assets.
+        """
+        self.client.login(username=self.staff_usr, password=self.TEST_PASSWORD)
+        etag = self.client.get(self.url_locked)['ETag']
+        self.client.logout()
+
+        resp = self.client.get(self.url_locked, HTTP_IF_NONE_MATCH=etag)
+        assert resp.status_code == 403
+
+    @patch('openedx.core.djangoapps.contentserver.views.MAX_IN_MEMORY_CONTENT_LENGTH', 0)
+    @patch('openedx.core.djangoapps.contentserver.views.get_cached_content', return_value=None)
+    def test_streamed_asset_disk_cache(self, _mock_get_cached_content):
+        """
+        Test that assets too large to be cached in memory are streamed, and then served from the disk cache.
+        """
+        with tempfile.TemporaryDirectory() as cache_dir, override_settings(COURSE_ASSETS_DISK_CACHE_DIR=cache_dir):
+            resp = self.client.get(self.url_unlocked)
+            assert resp.status_code == 200
+            assert resp['Content-Length'] == str(self.length_unlocked)
+            data = b''.join(resp.streaming_content)
+            assert len(data) == self.length_unlocked
+            assert len(os.listdir(cache_dir)) == 1
+
+            with patch('openedx.core.djangoapps.contentserver.views.AssetManager.find') as mock_find:
+                resp = self.client.get(self.url_unlocked)
+                assert resp.status_code == 200
+                assert b''.join(resp.streaming_content) == data
+                resp.close()
+
+                resp = self.client.get(self.url_unlocked, HTTP_RANGE='bytes=1-4')
+                assert resp.status_code == 206
+                assert b''.join(resp.streaming_content) == data[1:5]
+            assert not mock_find.called
+
     def test_vary_header_sent(self):
         """
         Tests that we're properly setting the Vary header to ensure browser requests don't get
@@ -9,13 +9,16 @@ import datetime
 import logging
 
 from django.http import (
+    FileResponse,
     HttpResponse,
     HttpResponseBadRequest,
     HttpResponseForbidden,
     HttpResponseNotFound,
     HttpResponseNotModified,
-    HttpResponsePermanentRedirect
+    HttpResponsePermanentRedirect,
+    StreamingHttpResponse
 )
+from django.utils.http import parse_etags, quote_etag
 from django.views.decorators.http import require_safe
 from edx_django_utils.monitoring import set_custom_attribute
 from opaque_keys import InvalidKeyError
@@ -26,13 +29,14 @@ from common.djangoapps.student.models import CourseEnrollment
 from openedx.core.djangoapps.header_control import force_header_for_response
 from openedx.core.djangoapps.waffle_utils import CourseWaffleFlag
 from xmodule.assetstore.assetmgr import AssetManager
-from xmodule.contentstore.content import XASSET_LOCATION_TAG, StaticContent
+from xmodule.contentstore.content import XASSET_LOCATION_TAG, StaticContent, StaticContentStream
 from xmodule.exceptions import NotFoundError
 from xmodule.modulestore import InvalidLocationError
 from xmodule.modulestore.exceptions import ItemNotFoundError
 from xmodule.util.sandboxing import course_code_library_asset_name
 
-from .caching import get_cached_content, set_cached_content
+from . import disk_cache
+from .caching import get_cached_content, get_cached_content_metadata, set_cached_content, set_cached_content_metadata
 from .models import CdnUserAgentsConfig, CourseAssetCacheTtlConfig
 
 
@@ -51,6 +55,14 @@ log = logging.getLogger(__name__)
 
 HTTP_DATE_FORMAT = "%a, %d %b %Y %H:%M:%S GMT"
 
+# Size of the chunks assets are streamed in, which matches the default chunk size of GridFS.
+STREAMING_CHUNK_SIZE = 255 * 1024
+
+# Content smaller than this is cached as a whole. We cap this at 1MB because it's the
+# default for memcached and also we don't want to do too much buffering in memory when
+# we're serving an actual request.
+MAX_IN_MEMORY_CONTENT_LENGTH = 1048576
+
 
 def is_asset_request(request):
     """Determines whether the given request is an asset request"""
@@ -124,9 +136,19 @@ def process_request(request):
             return HttpResponseForbidden('Unauthorized')
 
         # Figure out if the client sent us a conditional request, and let them know
-        # if this asset has changed since then.
+        # if this asset has changed since then.  If-None-Match takes precedence over
+        # If-Modified-Since.
+        etag = quote_etag(actual_digest) if actual_digest else None
         last_modified_at_str = content.last_modified_at.strftime(HTTP_DATE_FORMAT)
-        if 'HTTP_IF_MODIFIED_SINCE' in request.META:
+        if 'HTTP_IF_NONE_MATCH' in request.META:
+            if etag is not None:
+                if_none_match = parse_etags(request.META['HTTP_IF_NONE_MATCH'])
+                if '*' in if_none_match or etag in if_none_match:
+                    set_custom_attribute('contentserver.not_modified', True)
+                    response = HttpResponseNotModified()
+                    response['ETag'] = etag
+                    return response
+        elif 'HTTP_IF_MODIFIED_SINCE' in request.META:
             if_modified_since = request.META['HTTP_IF_MODIFIED_SINCE']
             if if_modified_since == last_modified_at_str:
                 return HttpResponseNotModified()
@@ -139,10 +161,6 @@ def process_request(request):
         # http://www.w3.org/Protocols/rfc2616/rfc2616-sec14.html#sec14.35
         response = None
         if request.META.get('HTTP_RANGE'):
-            # If we have a StaticContent, get a StaticContentStream.  Can't manipulate the bytes otherwise.
-            if isinstance(content, StaticContent):
-                content = AssetManager.find(loc, as_stream=True)
-
             header_value = request.META['HTTP_RANGE']
             try:
                 unit, ranges = parse_range_header(header_value, content.length)
@@ -168,7 +186,10 @@ def process_request(request):
 
                     if 0 <= first <= last < content.length:
                         # If the byte range is satisfiable
-                        response = HttpResponse(content.stream_data_in_range(first, last))
+                        try:
+                            response = get_content_range_response(content, loc, first, last)
+                        except (ItemNotFoundError, NotFoundError):
+                            return HttpResponseNotFound()
                         response['Content-Range'] = 'bytes {first}-{last}/{length}'.format(
                             first=first, last=last, length=content.length
                         )
@@ -185,7 +206,10 @@ def process_request(request):
 
         # If Range header is absent or syntactically invalid return a full content response.
         if response is None:
-            response = HttpResponse(content.stream_data())
+            try:
+                response = get_content_response(content, loc)
+            except (ItemNotFoundError, NotFoundError):
+                return HttpResponseNotFound()
             response['Content-Length'] = content.length
 
         set_custom_attribute('contentserver.content_len', content.length)
@@ -194,6 +218,8 @@ def process_request(request):
         # "Accept-Ranges: bytes" tells the user that only "bytes" ranges are allowed
         response['Accept-Ranges'] = 'bytes'
         response['Content-Type'] = content.content_type
+        if etag is not None:
+            response['ETag'] = etag
         response['X-Frame-Options'] = 'ALLOW'
 
         # Set any caching headers, and do any response cleanup needed.  Based on how much
@@ -205,6 +231,69 @@ def process_request(request):
         return response
 
 
+def get_content_response(content, location):
+    """
+    Returns a response with all the data of the given content.
+
+    Content that isn't in memory is served from the disk cache, or else streamed
+    from the contentstore (and written to the disk cache on the way).
+    """
+    if not _is_streamed(content):
+        return HttpResponse(content.data)
+
+    cached_file = disk_cache.open_cached_file(content)
+    if cached_file is not None:
+        set_custom_attribute('contentserver.disk_cache_hit', True)
+        response = FileResponse(cached_file)
+        # FileResponse names the file after the cache file otherwise.
+        if 'Content-Disposition' in response:
+            del response['Content-Disposition']
+        return response
+
+    set_custom_attribute('contentserver.disk_cache_hit', False)
+    stream = _open_stream(content, location)
+    return StreamingHttpResponse(
+        disk_cache.cache_while_streaming(content, stream.stream_data(STREAMING_CHUNK_SIZE))
+    )
+
+
+def get_content_range_response(content, location, first, last):
+    """
+    Returns a partial content response with the data of the given content
+    between the first and last byte (included).
+
+    Only the requested range is read, from memory, the disk cache or the
+    chunks of the asset in the contentstore.
+    """
+    if not _is_streamed(content):
+        return HttpResponse(content.data[first:last + 1])
+
+    cached_file = disk_cache.open_cached_file(content)
+    if cached_file is not None:
+        chunks = disk_cache.read_file_range(cached_file, first, last, STREAMING_CHUNK_SIZE)
+    else:
+        chunks = _open_stream(content, location).stream_data_in_range(first, last, STREAMING_CHUNK_SIZE)
+    return StreamingHttpResponse(chunks)
+
+
+def _is_streamed(content):
+    """
+    Returns whether the data of the given content has to be streamed, rather
+    than being in memory.
+    """
+    return isinstance(content, StaticContentStream) or content.data is None
+
+
+def _open_stream(content, location):
+    """
+    Returns a StaticContentStream of the given content, loading it from the
+    contentstore if only its metadata is at hand.
+    """
+    if isinstance(content, StaticContentStream):
+        return content
+    return AssetManager.find(location, as_stream=True)
+
+
 def set_caching_headers(content, location, response):
     """
     Sets caching headers based on whether or not the asset is restricted.
@@ -330,18 +419,21 @@ def load_asset_from_location(location):
     or loading it directly from the contentstore.
     """
 
-    # See if we can load this item from cache.
+    # See if we can load this item, or at least its metadata, from cache.
     content = get_cached_content(location)
+    if content is None:
+        content = get_cached_content_metadata(location)
     if content is None:
         # Not in cache, so just try and load it from the asset manager.
         content = AssetManager.find(location, as_stream=True)
 
-        # Now that we fetched it, let's go ahead and try to cache it. We cap this at 1MB
-        # because it's the default for memcached and also we don't want to do too much
-        # buffering in memory when we're serving an actual request.
-        if content.length is not None and content.length < 1048576:
+        # Now that we fetched it, let's go ahead and try to cache it.
+        if content.length is not None and content.length < MAX_IN_MEMORY_CONTENT_LENGTH:
             content = content.copy_to_in_mem()
             set_cached_content(content)
+        else:
+            # Only cache the metadata of larger content, whose data is streamed when served.
+            set_cached_content_metadata(content)
 
     return content
 
@@ -1,14 +1,19 @@
 """
 Celery tasks for sending email notifications
 """
+import datetime
+from collections import defaultdict
+from itertools import groupby
+
 from bs4 import BeautifulSoup
 from celery import shared_task
 from celery.utils.log import get_task_logger
+from django.conf import settings
 from django.contrib.auth import get_user_model
 from django.utils.translation import gettext as _, override as translation_override
 from edx_ace import ace
 from edx_ace.recipient import Recipient
-from edx_django_utils.monitoring import set_code_owner_attribute
+from edx_django_utils.monitoring import set_code_owner_attribute, set_custom_attribute
 
 from openedx.core.djangoapps.notifications.config.waffle import ENABLE_ACCOUNT_LEVEL_PREFERENCES
 from openedx.core.djangoapps.notifications.email_notifications import EmailCadence
@@ -60,31 +65,67 @@ def get_user_preferences_for_courses(course_ids, user):
     """
     Returns updated user preference for course_ids
     """
+    return get_preferences_for_user_courses({user.id: course_ids})[user.id]
+
+
+def get_preferences_for_user_courses(user_course_ids):
+    """
+    Returns updated course preferences of many users at once, as a mapping of
+    user_id to the list of its preferences for the course_ids in user_course_ids.
+    Missing preferences are created and outdated ones are updated to the latest
+    config version in bulk.
+    user_course_ids: Dictionary of user_id and its list of course_ids
+    """
+    course_ids = {course_id for user_courses in user_course_ids.values() for course_id in user_courses}
+    preferences = list(CourseNotificationPreference.objects.filter(
+        user_id__in=user_course_ids.keys(), course_id__in=course_ids
+    ))
+    existing = {(preference.user_id, preference.course_id) for preference in preferences}
     # Create new preferences
-    new_preferences = []
-    preferences = CourseNotificationPreference.objects.filter(user=user, course_id__in=course_ids)
-    preferences = list(preferences)
-    for course_id in course_ids:
-        if not any(preference.course_id == course_id for preference in preferences):
-            pref = CourseNotificationPreference(user=user, course_id=course_id)
-            new_preferences.append(pref)
+    new_preferences = [
+        CourseNotificationPreference(user_id=user_id, course_id=course_id)
+        for user_id, user_courses in user_course_ids.items()
+        for course_id in user_courses
+        if (user_id, course_id) not in existing
+    ]
     if new_preferences:
         CourseNotificationPreference.objects.bulk_create(new_preferences, ignore_conflicts=True)
     # Update preferences to latest config version
-    current_version = get_course_notification_preference_config_version()
-    for preference in preferences:
-        if preference.config_version != current_version:
-            preference = preference.get_user_course_preference(user.id, preference.course_id)
-        new_preferences.append(preference)
-    return new_preferences
+    CourseNotificationPreference.update_config_versions(preferences)
+
+    user_preferences = {user_id: [] for user_id in user_course_ids}
+    for preference in new_preferences + preferences:
+        if preference.course_id in user_course_ids[preference.user_id]:
+            user_preferences[preference.user_id].append(preference)
+    return user_preferences
+
+
+def get_digest_notifications_for_users(user_ids, start_date, end_date):
+    """
+    Returns a mapping of user_id and the list of email notifications of the user
+    created between start_date and end_date. Notifications are streamed ordered
+    by user and grouped in memory.
+    """
+    notifications = Notification.objects.filter(
+        user_id__in=user_ids, email=True, created__gte=start_date, created__lte=end_date
+    ).order_by('user_id', '-created')
+    return {
+        user_id: list(user_notifications)
+        for user_id, user_notifications in groupby(
+            notifications.iterator(chunk_size=2000), key=lambda notification: notification.user_id
+        )
+    }
 
 
-def send_digest_email_to_user(user, cadence_type, start_date, end_date, user_language='en', courses_data=None):
+def send_digest_email_to_user(user, cadence_type, start_date, end_date, user_language='en', courses_data=None,
+                              notifications=None, preferences=None):
     """
     Send [cadence_type] email to user.
     Cadence Type can be EmailCadence.DAILY or EmailCadence.WEEKLY
     start_date: Datetime object
     end_date: Datetime object
+    notifications: Email notifications of the user in the cadence window, if already fetched
+    preferences: Course or account level preferences of the user, if already fetched
     """
     if cadence_type not in [EmailCadence.DAILY, EmailCadence.WEEKLY]:
         raise ValueError('Invalid cadence_type')
@@ -95,20 +136,23 @@ def send_digest_email_to_user(user, cadence_type, start_date, end_date, user_lan
     if not is_email_notification_flag_enabled(user):
         logger.info(f'<Email Cadence> Flag disabled for {user.username} ==Temp Log==')
         return
-    notifications = Notification.objects.filter(user=user, email=True,
-                                                created__gte=start_date, created__lte=end_date)
+    if notifications is None:
+        notifications = Notification.objects.filter(user=user, email=True,
+                                                    created__gte=start_date, created__lte=end_date)
     if not notifications:
         logger.info(f'<Email Cadence> No notification for {user.username} ==Temp Log==')
         return
 
     with translation_override(user_language):
         if ENABLE_ACCOUNT_LEVEL_PREFERENCES.is_enabled():
-            preferences = NotificationPreference.objects.filter(user=user)
+            if preferences is None:
+                preferences = NotificationPreference.objects.filter(user=user)
             notifications = filter_email_enabled_notifications(notifications, preferences, user,
                                                                cadence_type=cadence_type)
         else:
-            course_ids = get_unique_course_ids(notifications)
-            preferences = get_user_preferences_for_courses(course_ids, user)
+            if preferences is None:
+                course_ids = get_unique_course_ids(notifications)
+                preferences = get_user_preferences_for_courses(course_ids, user)
             notifications = filter_notification_with_email_enabled_preferences(notifications, preferences, cadence_type)
 
         if not notifications:
@@ -132,18 +176,58 @@ def send_digest_email_to_user(user, cadence_type, start_date, end_date, user_lan
 @set_code_owner_attribute
 def send_digest_email_to_all_users(cadence_type):
     """
-    Send email digest to all eligible users
+    Send email digest to all eligible users, by sharding them across
+    send_digest_email_to_users tasks of NOTIFICATION_DIGEST_CHUNK_SIZE users
     """
     logger.info(f'<Email Cadence> Sending cadence email of type {cadence_type}')
     users = get_audience_for_cadence_email(cadence_type)
-    language_prefs = get_language_preference_for_users([user.id for user in users])
-    courses_data = {}
     start_date, end_date = get_start_end_date(cadence_type)
-    logger.info(f'<Email Cadence> Email Cadence Audience {len(users)}')
+    chunk_size = getattr(settings, 'NOTIFICATION_DIGEST_CHUNK_SIZE', 1000)
+    user_ids = list(users.order_by('id').values_list('id', flat=True))
+    logger.info(f'<Email Cadence> Email Cadence Audience {len(user_ids)}')
+    # .. custom_attribute_name: notifications.digest_audience_size
+    # .. custom_attribute_description: Number of users that are sent a daily or weekly email digest.
+    set_custom_attribute('notifications.digest_audience_size', len(user_ids))
+    for index in range(0, len(user_ids), chunk_size):
+        send_digest_email_to_users.delay(
+            user_ids[index:index + chunk_size], cadence_type, start_date.isoformat(), end_date.isoformat()
+        )
+
+
+@shared_task(ignore_result=True)
+@set_code_owner_attribute
+def send_digest_email_to_users(user_ids, cadence_type, start_date, end_date):
+    """
+    Send email digest to a chunk of users. The notifications, preferences and
+    language of all the users are fetched at once.
+    start_date: ISO formatted start datetime of the cadence window
+    end_date: ISO formatted end datetime of the cadence window
+    """
+    start_date = datetime.datetime.fromisoformat(start_date)
+    end_date = datetime.datetime.fromisoformat(end_date)
+    user_notifications = get_digest_notifications_for_users(user_ids, start_date, end_date)
+    users = User.objects.filter(id__in=user_notifications.keys()).order_by('id')
+    language_prefs = get_language_preference_for_users(list(user_notifications))
+
+    if ENABLE_ACCOUNT_LEVEL_PREFERENCES.is_enabled():
+        user_preferences = defaultdict(list)
+        for preference in NotificationPreference.objects.filter(user_id__in=user_notifications.keys()):
+            user_preferences[preference.user_id].append(preference)
+    else:
+        user_preferences = get_preferences_for_user_courses({
+            user_id: get_unique_course_ids(notifications)
+            for user_id, notifications in user_notifications.items()
+        })
+
+    courses_data = {}
     for user in users:
-        user_language = language_prefs.get(user.id, 'en')
-        send_digest_email_to_user(user, cadence_type, start_date, end_date, user_language=user_language,
-                                  courses_data=courses_data)
+        send_digest_email_to_user(
+            user, cadence_type, start_date, end_date,
+            user_language=language_prefs.get(user.id, 'en'),
+            courses_data=courses_data,
+            notifications=user_notifications[user.id],
+            preferences=user_preferences[user.id],
+        )
 
 
 def send_immediate_cadence_email(email_notification_mapping, course_key):
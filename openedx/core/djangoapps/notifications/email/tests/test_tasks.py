@@ -6,6 +6,7 @@ import ddt
 
 from unittest.mock import patch
 
+from django.test import override_settings
 from edx_toggles.toggles.testutils import override_waffle_flag
 
 from common.djangoapps.student.tests.factories import UserFactory
@@ -16,11 +17,16 @@ from openedx.core.djangoapps.notifications.tasks import send_notifications
 from openedx.core.djangoapps.notifications.email_notifications import EmailCadence
 from openedx.core.djangoapps.notifications.email.tasks import (
     get_audience_for_cadence_email,
+    get_preferences_for_user_courses,
     send_digest_email_to_all_users,
     send_digest_email_to_user
 )
 from openedx.core.djangoapps.notifications.email.utils import get_start_end_date
-from openedx.core.djangoapps.notifications.models import CourseNotificationPreference, NotificationPreference
+from openedx.core.djangoapps.notifications.models import (
+    CourseNotificationPreference,
+    NotificationPreference,
+    get_course_notification_preference_config_version
+)
 from xmodule.modulestore.tests.django_utils import ModuleStoreTestCase
 from xmodule.modulestore.tests.factories import CourseFactory
 
@@ -288,6 +294,29 @@ class TestEmailDigestAudience(ModuleStoreTestCase):
             audience = get_audience_for_cadence_email(EmailCadence.DAILY)
             list(audience)   # evaluating queryset
 
+    @override_settings(NOTIFICATION_DIGEST_CHUNK_SIZE=2)
+    @patch('edx_ace.ace.send')
+    def test_audience_is_sharded_across_tasks(self, mock_func):
+        """
+        Tests users are sent their digest by one task per chunk of users
+        """
+        users = [self.user, UserFactory(), UserFactory()]
+        created_date = datetime.datetime.now() - datetime.timedelta(days=1)
+        for user in users:
+            create_notification(user, self.course.id, created=created_date)
+            create_notification(user, self.course.id, created=created_date)
+        with patch(
+            'openedx.core.djangoapps.notifications.email.tasks.send_digest_email_to_users.delay'
+        ) as mock_delay, override_waffle_flag(ENABLE_EMAIL_NOTIFICATIONS, True):
+            send_digest_email_to_all_users(EmailCadence.DAILY)
+        assert [call_args[0][0] for call_args in mock_delay.call_args_list] == [
+            [users[0].id, users[1].id], [users[2].id]
+        ]
+
+        with override_waffle_flag(ENABLE_EMAIL_NOTIFICATIONS, True):
+            send_digest_email_to_all_users(EmailCadence.DAILY)
+        assert mock_func.call_count == 3
+
     @ddt.data(True, False)
     @patch('edx_ace.ace.send')
     def test_digest_should_contain_email_enabled_notifications(self, email_value, mock_func):
@@ -349,6 +378,24 @@ class TestPreferences(ModuleStoreTestCase):
             send_digest_email_to_user(self.user, EmailCadence.DAILY, start_date, end_date)
         assert mock_func.called is pref_value
 
+    def test_preferences_for_user_courses(self):
+        """
+        Tests preferences of many users are created and updated in bulk
+        """
+        other_user = UserFactory()
+        other_course = CourseFactory.create(display_name='other course', run="Other_course")
+        self.preference.config_version = 0
+        self.preference.save()
+        preferences = get_preferences_for_user_courses({
+            self.user.id: [self.course.id],
+            other_user.id: [self.course.id, other_course.id],
+        })
+        assert [preference.course_id for preference in preferences[self.user.id]] == [self.course.id]
+        assert {preference.course_id for preference in preferences[other_user.id]} == {self.course.id, other_course.id}
+        assert CourseNotificationPreference.objects.filter(user=other_user).count() == 2
+        self.preference.refresh_from_db()
+        assert self.preference.config_version == get_course_notification_preference_config_version()
+
     @patch('edx_ace.ace.send')
     def test_email_not_send_if_different_digest_preference(self, mock_func):
         """
@@ -6,6 +6,8 @@ from typing import Dict
 
 from django.contrib.auth import get_user_model
 from django.db import models
+from django.db.models import Count, Max, Min
+from django.utils import timezone
 from model_utils.models import TimeStampedModel
 from opaque_keys.edx.django.models import CourseKeyField
 
@@ -254,6 +256,59 @@ class CourseNotificationPreference(TimeStampedModel):
 
         return preferences
 
+    @staticmethod
+    def get_user_notification_preferences_version(user):
+        """
+        Returns a version of the active preferences of the user, which changes whenever
+        any of them is created, saved, deactivated or updated to a new config version.
+        It is computed with a single aggregate query, without loading the preferences.
+        """
+        version = CourseNotificationPreference.objects.filter(user=user, is_active=True).aggregate(
+            count=Count('id'),
+            modified=Max('modified'),
+            min_config_version=Min('config_version'),
+            max_config_version=Max('config_version'),
+        )
+        return (
+            version['count'],
+            version['modified'].isoformat() if version['modified'] else None,
+            version['min_config_version'],
+            version['max_config_version'],
+        )
+
+    @staticmethod
+    def update_config_versions(preferences):
+        """
+        Updates the given preferences of any users to the current config version,
+        with a single query for email opt-outs and a single bulk update.
+        Returns the preferences.
+        """
+        current_config_version = get_course_notification_preference_config_version()
+        outdated = [preference for preference in preferences if preference.config_version != current_config_version]
+        if not outdated:
+            return preferences
+
+        opted_out_user_ids = set(UserPreference.objects.filter(
+            user_id__in={preference.user_id for preference in outdated},
+            key=ONE_CLICK_EMAIL_UNSUB_KEY,
+        ).values_list('user_id', flat=True))
+        # bulk_update doesn't run the auto_now of 'modified', so it is set here like save() would.
+        modified = timezone.now()
+        try:
+            for preference in outdated:
+                preference.notification_preference_config = NotificationPreferenceSyncManager.update_preferences(
+                    preference.notification_preference_config, preference.user_id in opted_out_user_ids
+                )
+                preference.config_version = current_config_version
+                preference.modified = modified
+            CourseNotificationPreference.objects.bulk_update(
+                outdated,
+                ['config_version', 'notification_preference_config', 'modified']
+            )
+        except Exception as e:  # pylint: disable=broad-exception-caught
+            log.error(f'Unable to update notification preference to new config: {str(e)}')
+        return preferences
+
     @staticmethod
     def get_updated_user_course_preferences(user, course_id):
         return CourseNotificationPreference.get_user_course_preference(user.id, course_id)
@@ -9,7 +9,7 @@ from celery.utils.log import get_task_logger
 from django.conf import settings
 from django.core.exceptions import ValidationError
 from django.db import transaction
-from edx_django_utils.monitoring import set_code_owner_attribute
+from edx_django_utils.monitoring import set_code_owner_attribute, set_custom_attribute
 from opaque_keys.edx.keys import CourseKey
 from pytz import UTC
 
@@ -37,10 +37,10 @@ from openedx.core.djangoapps.notifications.grouping_notifications import (
     group_user_notifications
 )
 from openedx.core.djangoapps.notifications.models import (
+    NOTIFICATION_CHANNELS,
     CourseNotificationPreference,
     Notification,
-    NotificationPreference,
-    get_course_notification_preference_config_version
+    NotificationPreference
 )
 from openedx.core.djangoapps.notifications.push.tasks import send_ace_msg_to_push_channel
 from openedx.core.djangoapps.notifications.utils import clean_arguments, get_list_in_batches
@@ -144,6 +144,25 @@ def send_notifications(user_ids, course_key: str, app_name, notification_type, c
     account_level_pref_enabled = ENABLE_ACCOUNT_LEVEL_PREFERENCES.is_enabled()
 
     user_ids = list(set(user_ids))
+    fanout_chunk_size = settings.NOTIFICATION_FANOUT_CHUNK_SIZE
+    if fanout_chunk_size and len(user_ids) > fanout_chunk_size:
+        # Large audiences are split between parallel tasks, each of which
+        # sends the notification to its own chunk of users.
+        chunks = list(get_list_in_batches(user_ids, fanout_chunk_size))
+        # .. custom_attribute_name: notifications.fanout_chunks
+        # .. custom_attribute_description: Number of tasks that a notification
+        #   to a large audience was split into.
+        set_custom_attribute('notifications.fanout_chunks', len(chunks))
+        logger.info(
+            f'Splitting {notification_type} notification to {len(user_ids)} users in {course_key} '
+            f'into {len(chunks)} tasks'
+        )
+        for chunk_user_ids in chunks:
+            send_notifications.delay(
+                chunk_user_ids, str(course_key), app_name, notification_type, dict(context), content_url
+            )
+        return
+
     batch_size = settings.NOTIFICATION_CREATION_BATCH_SIZE
     group_by_id = context.pop('group_by_id', '')
     grouping_function = NotificationRegistry.get_grouper(notification_type)
@@ -164,7 +183,8 @@ def send_notifications(user_ids, course_key: str, app_name, notification_type, c
             f"Group by ID: {group_by_id} ==Temp Log=="
         )
 
-    for batch_user_ids in get_list_in_batches(user_ids, batch_size):
+    created_count = 0
+    for batch_index, batch_user_ids in enumerate(get_list_in_batches(user_ids, batch_size)):
         logger.debug(f'Sending notifications to {len(batch_user_ids)} users in {course_key}')
         batch_user_ids = NotificationFilter().apply_filters(batch_user_ids, course_key, notification_type)
         logger.info(f'After applying filters, sending notifications to {len(batch_user_ids)} users in {course_key}')
@@ -199,17 +219,15 @@ def send_notifications(user_ids, course_key: str, app_name, notification_type, c
         if not preferences:
             continue
 
+        if not account_level_pref_enabled:
+            # Bring outdated preferences of the whole batch to the current config version at once.
+            preferences = CourseNotificationPreference.update_config_versions(preferences)
+
         notifications = []
         for preference in preferences:
             user_id = preference.user_id
-            if not account_level_pref_enabled:
-                preference = update_user_preference(preference, user_id, course_key)
-
-            if (
-                preference and
-                preference.is_enabled_for_any_channel(app_name, notification_type)
-            ):
-                notification_preferences = preference.get_channels_for_notification_type(app_name, notification_type)
+            notification_preferences = preference.get_channels_for_notification_type(app_name, notification_type)
+            if any(channel in notification_preferences for channel in NOTIFICATION_CHANNELS):
                 email_enabled = 'email' in notification_preferences
                 email_cadence = preference.get_email_cadence_for_notification_type(app_name, notification_type)
                 push_notification = is_push_notification_enabled and 'push' in notification_preferences
@@ -243,6 +261,19 @@ def send_notifications(user_ids, course_key: str, app_name, notification_type, c
 
         # send notification to users but use bulk_create
         Notification.objects.bulk_create(notifications)
+        created_count += len(notifications)
+        logger.debug(
+            f'Batch {batch_index + 1} of {notification_type} notification in {course_key}: '
+            f'created {len(notifications)} notifications, {created_count} so far'
+        )
+
+    # .. custom_attribute_name: notifications.audience_size
+    # .. custom_attribute_description: Number of users that a notification task was sent for.
+    set_custom_attribute('notifications.audience_size', len(user_ids))
+    # .. custom_attribute_name: notifications.created_count
+    # .. custom_attribute_description: Number of new notifications created by a
+    #   notification task, not counting notifications grouped with existing ones.
+    set_custom_attribute('notifications.created_count', created_count)
 
     if email_notification_mapping:
         send_immediate_cadence_email(email_notification_mapping, course_key)
@@ -269,16 +300,6 @@ def is_notification_valid(notification_type, context):
     return True
 
 
-def update_user_preference(preference: CourseNotificationPreference, user_id, course_id):
-    """
-    Update user preference if config version is changed.
-    """
-    current_version = get_course_notification_preference_config_version()
-    if preference.config_version != current_version:
-        return preference.get_user_course_preference(user_id, course_id)
-    return preference
-
-
 def update_account_user_preference(user_id: int) -> None:
     """
     Update account level user preferences to ensure all notification types are present.
@@ -360,9 +381,10 @@ def create_notification_pref_if_not_exists(user_ids: List, preferences: List, co
     Create notification preference if not exist.
     """
     new_preferences = []
+    existing_user_ids = {preference.user_id for preference in preferences}
 
     for user_id in user_ids:
-        if not any(preference.user_id == int(user_id) for preference in preferences):
+        if int(user_id) not in existing_user_ids:
             new_preferences.append(CourseNotificationPreference(
                 user_id=user_id,
                 course_id=course_id,
@@ -380,9 +402,10 @@ def create_account_notification_pref_if_not_exists(user_ids: List, preferences:
     Create account level notification preference if not exist.
     """
     new_preferences = []
+    existing_user_ids = {preference.user_id for preference in preferences}
 
     for user_id in user_ids:
-        if not any(preference.user_id == int(user_id) for preference in preferences):
+        if int(user_id) not in existing_user_ids:
             new_preferences.append(create_notification_preference(
                 user_id=int(user_id),
                 notification_type=notification_type,
@@ -8,6 +8,7 @@ from unittest.mock import patch
 import ddt
 from django.conf import settings
 from django.core.exceptions import ValidationError
+from django.test import override_settings
 from edx_toggles.toggles.testutils import override_waffle_flag
 
 from common.djangoapps.student.models import CourseEnrollment
@@ -16,12 +17,11 @@ from xmodule.modulestore.tests.django_utils import ModuleStoreTestCase
 from xmodule.modulestore.tests.factories import CourseFactory
 
 from ..config.waffle import ENABLE_NOTIFICATION_GROUPING, ENABLE_NOTIFICATIONS, ENABLE_PUSH_NOTIFICATIONS
-from ..models import CourseNotificationPreference, Notification
+from ..models import CourseNotificationPreference, Notification, get_course_notification_preference_config_version
 from ..tasks import (
     create_notification_pref_if_not_exists,
     delete_notifications,
-    send_notifications,
-    update_user_preference
+    send_notifications
 )
 from .utils import create_notification
 
@@ -62,17 +62,20 @@ class TestNotificationsTasks(ModuleStoreTestCase):
             config_version=1,
         )
 
-    def test_update_user_preference(self):
+    def test_update_config_versions(self):
         """
-        Test whether update_user_preference updates the preference with the latest config version.
+        Test whether update_config_versions brings outdated preferences to the latest config version.
         """
-        # Test whether update_user_preference updates the preference with a different config version
-        updated_preference = update_user_preference(self.preference_v1, self.user, self.course_1.id)
-        self.assertEqual(updated_preference.config_version, 1)
+        preference_v2_modified = self.preference_v2.modified
+        preferences = CourseNotificationPreference.update_config_versions([self.preference_v1, self.preference_v2])
+        self.assertEqual([preference.config_version for preference in preferences], [1, 1])
 
-        # Test whether update_user_preference does not update the preference if the config version is the same
-        updated_preference = update_user_preference(self.preference_v2, self.user, self.course_2.id)
-        self.assertEqual(updated_preference.config_version, 1)
+        self.preference_v1.refresh_from_db()
+        self.preference_v2.refresh_from_db()
+        self.assertEqual(self.preference_v1.config_version, 1)
+        self.assertGreater(self.preference_v1.modified, self.preference_v1.created)
+        # Up-to-date preferences are not written.
+        self.assertEqual(self.preference_v2.modified, preference_v2_modified)
 
     @override_waffle_flag(ENABLE_NOTIFICATIONS, active=True)
     def test_create_notification_pref_if_not_exists(self):
@@ -346,6 +349,65 @@ class SendBatchNotificationsTest(ModuleStoreTestCase):
                     send_notifications(user_ids, str(self.course.id), notification_app, notification_type,
                                        context, "http://test.url")
 
+    @override_waffle_flag(ENABLE_NOTIFICATIONS, active=True)
+    def test_outdated_preferences_are_updated_in_bulk(self):
+        """
+        Tests that outdated preferences of a batch are updated to the current
+        config version with a single bulk update
+        """
+        notification_app = "discussion"
+        notification_type = "new_comment"
+        users = self._create_users(20)
+        user_ids = [user.id for user in users]
+        context = {
+            "post_title": "Test Post",
+            "author_name": "Test Author",
+            "replier_name": "Replier Name"
+        }
+        for user_id in user_ids:
+            CourseNotificationPreference.objects.create(user_id=user_id, course_id=self.course.id, config_version=0)
+
+        with patch.object(
+            CourseNotificationPreference.objects, 'bulk_update', wraps=CourseNotificationPreference.objects.bulk_update
+        ) as mock_bulk_update:
+            send_notifications(user_ids, str(self.course.id), notification_app, notification_type,
+                               context, "http://test.url")
+
+        mock_bulk_update.assert_called_once()
+        assert len(mock_bulk_update.call_args[0][0]) == 20
+
+        current_version = get_course_notification_preference_config_version()
+        assert not CourseNotificationPreference.objects.exclude(config_version=current_version).exists()
+        assert Notification.objects.filter(user_id__in=user_ids).count() == 20
+
+    @override_settings(NOTIFICATION_FANOUT_CHUNK_SIZE=8)
+    @override_waffle_flag(ENABLE_NOTIFICATIONS, active=True)
+    def test_large_audience_is_split_into_tasks(self):
+        """
+        Tests that notifications to more users than the fan-out chunk size are
+        sent by one task per chunk
+        """
+        users = self._create_users(20)
+        user_ids = [user.id for user in users]
+        context = {
+            "post_title": "Test Post",
+            "author_name": "Test Author",
+            "replier_name": "Replier Name",
+            "sender_id": users[0].id,
+        }
+        with patch('openedx.core.djangoapps.notifications.tasks.send_notifications.delay') as mock_delay:
+            send_notifications(user_ids, str(self.course.id), "discussion", "new_comment", context, "http://test.url")
+
+        chunks = [call_args[0][0] for call_args in mock_delay.call_args_list]
+        assert [len(chunk) for chunk in chunks] == [8, 8, 4]
+        assert sorted(sum(chunks, [])) == sorted(user_ids)
+        # Each task gets the complete context.
+        assert all(call_args[0][4] == context for call_args in mock_delay.call_args_list)
+        assert not Notification.objects.exists()
+
+        send_notifications(user_ids, str(self.course.id), "discussion", "new_comment", context, "http://test.url")
+        assert Notification.objects.filter(user_id__in=user_ids).count() == 20
+
     def _update_user_preference(self, user_id, pref_exists):
         """
         Removes or creates user preference based on pref_exists
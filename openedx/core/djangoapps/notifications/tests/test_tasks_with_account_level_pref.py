@@ -20,8 +20,7 @@ from ..models import CourseNotificationPreference, Notification, NotificationPre
 from ..tasks import (
     create_notification_pref_if_not_exists,
     delete_notifications,
-    send_notifications,
-    update_user_preference
+    send_notifications
 )
 from .utils import create_notification
 
@@ -63,18 +62,6 @@ class TestNotificationsTasks(ModuleStoreTestCase):
             config_version=1,
         )
 
-    def test_update_user_preference(self):
-        """
-        Test whether update_user_preference updates the preference with the latest config version.
-        """
-        # Test whether update_user_preference updates the preference with a different config version
-        updated_preference = update_user_preference(self.preference_v1, self.user, self.course_1.id)
-        self.assertEqual(updated_preference.config_version, 1)
-
-        # Test whether update_user_preference does not update the preference if the config version is the same
-        updated_preference = update_user_preference(self.preference_v2, self.user, self.course_2.id)
-        self.assertEqual(updated_preference.config_version, 1)
-
     @override_waffle_flag(ENABLE_NOTIFICATIONS, active=True)
     def test_create_notification_pref_if_not_exists(self):
         """
@@ -14,6 +14,7 @@ from django.contrib.auth import get_user_model
 from django.test.utils import override_settings
 from django.urls import reverse
 from edx_toggles.toggles.testutils import override_waffle_flag
+from opaque_keys.edx.keys import CourseKey
 from openedx_events.learning.data import CourseData, CourseEnrollmentData, UserData, UserPersonalData
 from openedx_events.learning.signals import COURSE_ENROLLMENT_CREATED
 from pytz import UTC
@@ -46,7 +47,7 @@ from xmodule.modulestore.tests.factories import CourseFactory
 
 from ..base_notification import COURSE_NOTIFICATION_APPS, COURSE_NOTIFICATION_TYPES, NotificationAppManager, \
     NotificationTypeManager
-from ..utils import get_notification_types_with_visibility_settings
+from ..utils import aggregate_notification_configs, get_notification_types_with_visibility_settings
 
 User = get_user_model()
 
@@ -1390,6 +1391,35 @@ class GetAggregateNotificationPreferencesTest(APITestCase):
         self.assertEqual(response.data['message'], 'Notification preferences retrieved')
         self.assertDictEqual(response.data['data'], {'mocked': {'notification_types': {}, 'non_editable': {}}})
 
+    def test_aggregated_preferences_are_cached(self):
+        """
+        Test case: Preferences are only aggregated again after they change
+        """
+        preference = CourseNotificationPreference.objects.create(user=self.user, is_active=True)
+        CourseNotificationPreference.objects.create(
+            user=self.user, course_id=CourseKey.from_string('course-v1:edX+Other+Course'), is_active=True
+        )
+        with patch(
+            'openedx.core.djangoapps.notifications.views.aggregate_notification_configs',
+            wraps=aggregate_notification_configs
+        ) as mock_aggregate:
+            response = self.client.get(self.url)
+            cached_response = self.client.get(self.url)
+            self.assertEqual(mock_aggregate.call_count, 1)
+            self.assertEqual(cached_response.data, response.data)
+
+            preference.notification_preference_config['updates']['notification_types']['course_updates']['push'] = True
+            preference.save()
+            response = self.client.get(self.url)
+            self.assertEqual(mock_aggregate.call_count, 2)
+            self.assertTrue(response.data['data']['updates']['notification_types']['course_updates']['push'])
+
+            preference.is_active = False
+            preference.save()
+            response = self.client.get(self.url)
+            self.assertEqual(mock_aggregate.call_count, 3)
+            self.assertFalse(response.data['data']['updates']['notification_types']['course_updates']['push'])
+
     def test_unauthenticated_user(self):
         """
         Test case: Request without authentication
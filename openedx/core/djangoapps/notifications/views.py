@@ -5,6 +5,7 @@ import copy
 from datetime import datetime, timedelta
 
 from django.conf import settings
+from django.core.cache import cache
 from django.db import transaction
 from django.db.models import Count
 from django.shortcuts import get_object_or_404
@@ -52,6 +53,9 @@ from .utils import (
     get_show_notifications_tray
 )
 
+AGGREGATED_PREFERENCES_CACHE_KEY = 'notifications.aggregated_preferences.{user_id}'
+AGGREGATED_PREFERENCES_CACHE_TIMEOUT = 60 * 60 * 24
+
 
 @allow_any_authenticated_user()
 class CourseEnrollmentListView(generics.ListAPIView):
@@ -596,18 +600,38 @@ class AggregatedNotificationPreferences(APIView):
     def get(self, request):
         """
         API view for getting the aggregate notification preferences for the current user.
+
+        The aggregated config is cached per user along with the version of the
+        preferences it was aggregated from, so it is only aggregated again after
+        the preferences of the user changed.
         """
-        notification_preferences = CourseNotificationPreference.get_user_notification_preferences(request.user)
-        if not notification_preferences.exists():
+        cache_key = AGGREGATED_PREFERENCES_CACHE_KEY.format(user_id=request.user.id)
+        version = CourseNotificationPreference.get_user_notification_preferences_version(request.user)
+        count, __, min_config_version, max_config_version = version
+        current_config_version = get_course_notification_preference_config_version()
+        if not count:
             return Response({
                 'status': 'error',
                 'message': 'No active notification preferences found'
             }, status=status.HTTP_404_NOT_FOUND)
-        notification_configs = notification_preferences.values_list('notification_preference_config', flat=True)
-        notification_configs = aggregate_notification_configs(
-            notification_configs
-        )
-        course_ids = notification_preferences.values_list('course_id', flat=True)
+
+        aggregated = cache.get(cache_key)
+        if (
+            aggregated is None or aggregated['version'] != version or
+            min_config_version != current_config_version or max_config_version != current_config_version
+        ):
+            notification_preferences = CourseNotificationPreference.get_user_notification_preferences(request.user)
+            notification_configs = notification_preferences.values_list('notification_preference_config', flat=True)
+            aggregated = {
+                # Outdated preferences have been updated, which changes their version.
+                'version': CourseNotificationPreference.get_user_notification_preferences_version(request.user),
+                'configs': aggregate_notification_configs(notification_configs),
+                'course_ids': list(notification_preferences.values_list('course_id', flat=True)),
+            }
+            cache.set(cache_key, aggregated, AGGREGATED_PREFERENCES_CACHE_TIMEOUT)
+
+        notification_configs = aggregated['configs']
+        course_ids = aggregated['course_ids']
 
         filter_out_visible_preferences_by_course_ids(
             request.user,
@@ -14,12 +14,14 @@ This is used by capa_block.
 """
 
 
+import hashlib
 import logging
 import os.path
 import re
-from collections import OrderedDict
+from collections import OrderedDict, namedtuple
 from copy import deepcopy
 from datetime import datetime
+from threading import Lock
 from typing import Optional
 from xml.sax.saxutils import unescape
 
@@ -77,6 +79,83 @@ html_problem_semantics = [
 
 log = logging.getLogger(__name__)
 
+# Default number of compiled problems kept by each process, see CompiledProblemCache.
+COMPILED_PROBLEM_CACHE_SIZE = 1000
+
+# The parsed tree of a problem, with the IDs of its responses and their entries
+# assigned.  `responses` lists (response index, responsetype_id, input indices)
+# for each response, where indices refer to elements in `tree.iter()` order; it
+# is None for problems with <include> tags, whose files are read per problem.
+CompiledProblem = namedtuple('CompiledProblem', ['tree', 'responses'])
+
+
+class CompiledProblemCache:
+    """
+    Thread-safe LRU cache of compiled problems, keyed by problem id and a
+    digest of the problem XML.
+
+    Compiled trees are shared by all problems created from them, so they are
+    never handed out for modification: LoncapaProblem works on a copy.
+
+    The number of cached problems is bounded by the CAPA_COMPILED_PROBLEM_CACHE_SIZE
+    setting, and caching is disabled when it is 0.
+    """
+
+    def __init__(self):
+        # OrderedDict {(problem_id, digest): CompiledProblem}, least recently used first.
+        self._entries = OrderedDict()
+        self._lock = Lock()
+
+        # Hit and miss counts of this process, for debugging.
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def max_size():
+        """
+        Returns the maximum number of cached problems.
+        """
+        return getattr(settings, 'CAPA_COMPILED_PROBLEM_CACHE_SIZE', COMPILED_PROBLEM_CACHE_SIZE)
+
+    def get(self, key):
+        """
+        Returns the compiled problem for the given key, or None if it isn't cached.
+        """
+        with self._lock:
+            compiled = self._entries.get(key)
+            if compiled is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+            else:
+                self.misses += 1
+        return compiled
+
+    def set(self, key, compiled):
+        """
+        Caches the given compiled problem, which must not be modified afterwards.
+        """
+        max_size = self.max_size()
+        if not max_size:
+            return
+        with self._lock:
+            self._entries[key] = compiled
+            self._entries.move_to_end(key)
+            while len(self._entries) > max_size:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        """
+        Removes all compiled problems and resets the hit and miss counts.
+        """
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+
+# The cache shared by all problems of this process.
+compiled_problems = CompiledProblemCache()
+
 #-----------------------------------------------------------------------------
 # main class for this module
 
@@ -189,23 +268,10 @@ class LoncapaProblem(object):
         problem_text = re.sub(r"endouttext\s*/", "/text", problem_text)
         self.problem_text = problem_text
 
-        # parse problem XML file into an element tree
-        if isinstance(problem_text, str):
-            # etree chokes on Unicode XML with an encoding declaration
-            problem_text = problem_text.encode('utf-8')
-        self.tree = XML(problem_text)
-
-        try:
-            self.make_xml_compatible(self.tree)
-        except Exception:
-            capa_block = self.capa_block
-            log.exception(
-                "CAPAProblemError: %s, id:%s, data: %s",
-                capa_block.display_name,
-                self.problem_id,
-                capa_block.data
-            )
-            raise
+        # parse problem XML file into an element tree, reusing the tree compiled
+        # for an identical problem when this process has seen one
+        compiled = self._compile(problem_text)
+        self.tree = deepcopy(compiled.tree)
 
         # handle any <include file="foo"> tags
         self._process_includes()
@@ -220,7 +286,7 @@ class LoncapaProblem(object):
         # transformations.  This also creates the dict (self.responders) of Response
         # instances for each question in the problem. The dict has keys = xml subtree of
         # Response, values = Response instance
-        self.problem_data = self._preprocess_problem(self.tree, minimal_init)
+        self.problem_data = self._preprocess_problem(self.tree, minimal_init, compiled)
 
         if not minimal_init:
             if not self.student_answers:  # True when student_answers is an empty dict
@@ -250,6 +316,48 @@ class LoncapaProblem(object):
         """
         return settings.FEATURES.get('ENABLE_GRADING_METHOD_IN_PROBLEMS', False)
 
+    def _compile(self, problem_text):
+        """
+        Returns the CompiledProblem for the given problem XML, from the
+        process-local cache when possible.
+
+        Compiling parses the XML, makes it compatible (see make_xml_compatible)
+        and assigns IDs to responses and their entries.  None of this depends on
+        the learner or seed, so only the per-learner steps (running scripts,
+        creating responders, rendering) are left to each problem instance.
+        """
+        key = (self.problem_id, hashlib.sha1(problem_text.encode('utf-8')).hexdigest())
+        compiled = compiled_problems.get(key)
+        if compiled is not None:
+            return compiled
+
+        # etree chokes on Unicode XML with an encoding declaration
+        tree = XML(problem_text.encode('utf-8'))
+
+        try:
+            self.make_xml_compatible(tree)
+        except Exception:
+            capa_block = self.capa_block
+            log.exception(
+                "CAPAProblemError: %s, id:%s, data: %s",
+                capa_block.display_name,
+                self.problem_id,
+                capa_block.data
+            )
+            raise
+
+        responses = None
+        if tree.find('.//include') is None:
+            indices = {element: index for index, element in enumerate(tree.iter())}
+            responses = tuple(
+                (indices[response], responsetype_id, tuple(indices[entry] for entry in inputfields))
+                for response, responsetype_id, inputfields in self._assign_ids(tree)
+            )
+
+        compiled = CompiledProblem(tree, responses)
+        compiled_problems.set(key, compiled)
+        return compiled
+
     def make_xml_compatible(self, tree):
         """
         Adjust tree xml in-place for compatibility before creating
@@ -1099,20 +1207,17 @@ class LoncapaProblem(object):
 
         return tree
 
-    def _preprocess_problem(self, tree, minimal_init):  # private
+    def _assign_ids(self, tree):
         """
         Assign IDs to all the responses
         Assign sub-IDs to all entries (textline, schematic, etc.)
-        Annoted correctness and value
         In-place transformation
 
-        Also create capa Response instances for each responsetype and save as self.responders
-
-        Obtain all responder answers and save as self.responder_answers dict (key = response)
+        Yields (response, responsetype_id, inputfields) for each response, once
+        its IDs are assigned.
         """
         response_id = 1
-        problem_data = {}
-        self.responders = {}
+        input_tags = inputtypes.registry.registered_tags()
         for response in tree.xpath('//' + "|//".join(responsetypes.registry.registered_tags())):
             responsetype_id = self.problem_id + "_" + str(response_id)
             # create and save ID for this response
@@ -1120,7 +1225,6 @@ class LoncapaProblem(object):
             response_id += 1
 
             answer_id = 1
-            input_tags = inputtypes.registry.registered_tags()
             inputfields = tree.xpath(
                 "|".join(['//' + response.tag + '[@id=$id]//' + x for x in input_tags]),
                 id=responsetype_id
@@ -1133,6 +1237,31 @@ class LoncapaProblem(object):
                 entry.attrib['id'] = "%s_%i_%i" % (self.problem_id, response_id, answer_id)
                 answer_id = answer_id + 1
 
+            yield response, responsetype_id, inputfields
+
+    def _preprocess_problem(self, tree, minimal_init, compiled=None):  # private
+        """
+        Assign IDs to all the responses, unless they were assigned when compiling
+        the problem (see _compile)
+        Annoted correctness and value
+        In-place transformation
+
+        Also create capa Response instances for each responsetype and save as self.responders
+
+        Obtain all responder answers and save as self.responder_answers dict (key = response)
+        """
+        problem_data = {}
+        self.responders = {}
+        if compiled is not None and compiled.responses is not None:
+            elements = list(tree.iter())
+            responses = [
+                (elements[response], responsetype_id, [elements[entry] for entry in inputfields])
+                for response, responsetype_id, inputfields in compiled.responses
+            ]
+        else:
+            responses = self._assign_ids(tree)
+
+        for response, responsetype_id, inputfields in responses:
             self.response_a11y_data(response, inputfields, responsetype_id, problem_data)
 
             # instantiate capa Response
@@ -4,10 +4,13 @@ Helper methods related to safe exec.
 
 import json
 import logging
+from functools import lru_cache
 from importlib import import_module
 import requests
 
 from codejail.safe_exec import SafeExecException, json_safe
+from codejail.safe_exec import not_safe_exec as codejail_not_safe_exec
+from codejail.safe_exec import safe_exec as codejail_safe_exec
 from django.conf import settings
 from edx_toggles.toggles import SettingToggle
 from requests.exceptions import RequestException, HTTPError
@@ -76,6 +79,15 @@ def get_codejail_rest_service_endpoint():
     return f"{settings.CODE_JAIL_REST_SERVICE_HOST}/api/v0/code-exec"
 
 
+@lru_cache(maxsize=1)
+def get_codejail_rest_service_session():
+    """
+    Returns the session used for all requests to the codejail api service, so
+    that connections to it are kept alive and reused across executions.
+    """
+    return requests.Session()
+
+
 def send_safe_exec_request_v0(data):
     """
     Sends a request to a codejail api service forwarding required code and files.
@@ -107,7 +119,7 @@ def send_safe_exec_request_v0(data):
     payload = json.dumps(data_send)
 
     try:
-        response = requests.post(
+        response = get_codejail_rest_service_session().post(
             codejail_service_endpoint,
             files=extra_files,
             data={'payload': payload},
@@ -143,3 +155,35 @@ def send_safe_exec_request_v0(data):
     globals_dict.update(response_json.get("globals_dict"))
 
     return emsg, exception
+
+
+def local_safe_exec_request_v0(data):
+    """
+    Stand-in for send_safe_exec_request_v0 that executes the code with the
+    installed codejail library instead of the codejail api service.
+
+    Globals go through the same JSON round trip as with the service, so this
+    can be set as CODE_JAIL_REST_SERVICE_REMOTE_EXEC to exercise the remote
+    execution path in tests and development without running the service.
+    """
+    globals_dict = data["globals_dict"]
+    remote_globals = json.loads(json.dumps(json_safe(globals_dict)))
+    exec_fn = codejail_not_safe_exec if data.get("unsafely") else codejail_safe_exec
+
+    emsg = None
+    exception = None
+    try:
+        exec_fn(
+            data["code"],
+            remote_globals,
+            python_path=data.get("python_path"),
+            extra_files=data.get("extra_files"),
+            limit_overrides_context=data.get("limit_overrides_context"),
+            slug=data.get("slug"),
+        )
+    except SafeExecException as err:
+        emsg = str(err)
+        exception = SafeExecException(f"{emsg}. For more information check Codejail Service logs.")
+
+    globals_dict.update(json.loads(json.dumps(json_safe(remote_globals))))
+    return emsg, exception
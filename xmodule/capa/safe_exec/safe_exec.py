@@ -3,6 +3,7 @@ import copy
 import hashlib
 import logging
 import re
+import time
 from functools import lru_cache
 from typing import assert_type
 
@@ -12,7 +13,7 @@ from codejail.safe_exec import safe_exec as codejail_safe_exec
 from django.conf import settings
 from django.dispatch import receiver
 from django.test.signals import setting_changed
-from edx_django_utils.monitoring import function_trace, record_exception, set_custom_attribute
+from edx_django_utils.monitoring import accumulate, function_trace, record_exception, set_custom_attribute
 
 from . import lazymod
 from .remote_exec import get_remote_exec, is_codejail_in_darklaunch, is_codejail_rest_service_enabled
@@ -105,6 +106,21 @@ def update_hash(hasher, obj):
         hasher.update(repr(obj).encode())
 
 
+def _record_exec_time(slug, seconds):
+    """
+    Records how long executing the code of `slug` took.
+    """
+    # .. custom_attribute_name: codejail.exec_seconds
+    # .. custom_attribute_description: Total time spent executing code in
+    #   codejail (or the codejail service) during the request.
+    accumulate('codejail.exec_seconds', seconds)
+    # .. custom_attribute_name: codejail.exec_count
+    # .. custom_attribute_description: Number of code executions during the
+    #   request.
+    accumulate('codejail.exec_count', 1)
+    log.debug("safe_exec: Executed code of %s in %.3fs", slug, seconds)
+
+
 @function_trace('safe_exec')
 def safe_exec(
     code,
@@ -169,6 +185,7 @@ def safe_exec(
 
     # Create the complete code we'll run.
     code_prolog = CODE_PROLOG % random_seed
+    start = time.perf_counter()
 
     if is_codejail_rest_service_enabled():
         data = {
@@ -280,6 +297,8 @@ def safe_exec(
                 log.exception("Error occurred while trying to report codejail darklaunch data.")
                 record_exception()
 
+    _record_exec_time(slug, time.perf_counter() - start)
+
     # Put the result back in the cache.  This is complicated by the fact that
     # the globals dict might not be entirely serializable.
     if cache and cacheable:
@@ -18,7 +18,7 @@ class TestRemoteExec(TestCase):
         ENABLE_CODEJAIL_REST_SERVICE=True,
         CODE_JAIL_REST_SERVICE_HOST='http://localhost',
     )
-    @patch('requests.post')
+    @patch('requests.Session.post')
     def test_json_encode(self, mock_post):
         get_remote_exec({
             'code': "out = 1 + 1",
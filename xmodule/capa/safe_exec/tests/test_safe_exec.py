@@ -22,7 +22,11 @@ from six.moves import range
 
 from openedx.core.djangolib.testing.utils import skip_unless_lms
 from xmodule.capa.safe_exec import safe_exec, update_hash
-from xmodule.capa.safe_exec.remote_exec import is_codejail_in_darklaunch, is_codejail_rest_service_enabled
+from xmodule.capa.safe_exec.remote_exec import (
+    is_codejail_in_darklaunch,
+    is_codejail_rest_service_enabled,
+    local_safe_exec_request_v0
+)
 from xmodule.capa.safe_exec.safe_exec import emsg_normalizers, normalize_error_message
 from xmodule.capa.tests.test_util import use_unsafe_codejail
 
@@ -603,6 +607,29 @@ class TestSafeExecCaching(unittest.TestCase):
                 self.fail("Tried executing code with non-ASCII unicode: {0}".format(code))
 
 
+@use_unsafe_codejail()
+class TestLocalRemoteExec(unittest.TestCase):
+    """Test executing code through the local stand-in for the codejail service."""
+
+    @override_settings(
+        ENABLE_CODEJAIL_REST_SERVICE=True,
+        CODE_JAIL_REST_SERVICE_REMOTE_EXEC='xmodule.capa.safe_exec.remote_exec.local_safe_exec_request_v0',
+    )
+    def test_remote_exec(self):
+        with patch(
+            'xmodule.capa.safe_exec.remote_exec.local_safe_exec_request_v0', wraps=local_safe_exec_request_v0,
+        ) as mock_remote_exec:
+            g = {'c': 3}
+            safe_exec("a = int(math.pi) + c", g)
+            assert g['a'] == 6
+
+            with pytest.raises(SafeExecException) as raised:
+                safe_exec("a = 1/0", {})
+            assert 'ZeroDivisionError' in str(raised.value)
+
+        assert mock_remote_exec.call_count == 2
+
+
 class TestUpdateHash(unittest.TestCase):
     """Test the safe_exec.update_hash function to be sure it canonicalizes properly."""
 
@@ -12,6 +12,7 @@ import ddt
 from lxml import etree
 from markupsafe import Markup
 
+from xmodule.capa import capa_problem
 from xmodule.capa.correctmap import CorrectMap
 from xmodule.capa.responsetypes import LoncapaProblemError
 from xmodule.capa.tests.helpers import new_loncapa_problem
@@ -843,3 +844,75 @@ class CAPAProblemReportHelpersTest(unittest.TestCase):
             with self.assertRaises(Exception):
                 problem.get_grade_from_current_answers(None, correct_map)
             responder_mock.evaluate_answers.assert_not_called()
+
+
+class CompiledProblemCacheTest(unittest.TestCase):
+    """ TestCase for the process-local cache of compiled problems """
+
+    xml = textwrap.dedent("""
+        <problem>
+            <multiplechoiceresponse>
+                <label>Which is a color?</label>
+                <choicegroup type="MultipleChoice" shuffle="true">
+                    <choice correct="false">Apple</choice>
+                    <choice correct="true">Blue</choice>
+                    <choice correct="false">Chair</choice>
+                    <choice correct="false">Dog</choice>
+                </choicegroup>
+            </multiplechoiceresponse>
+            <stringresponse answer="blue">
+                <additional_answer>navy</additional_answer>
+                <textline/>
+            </stringresponse>
+        </problem>
+    """)
+
+    def setUp(self):
+        super().setUp()
+        capa_problem.compiled_problems.clear()
+        self.addCleanup(capa_problem.compiled_problems.clear)
+
+    def test_compiled_problem_is_reused(self):
+        with patch('xmodule.capa.capa_problem.XML', wraps=capa_problem.XML) as mock_xml:
+            first = new_loncapa_problem(self.xml, seed=1)
+            second = new_loncapa_problem(self.xml, seed=1)
+        assert mock_xml.call_count == 1
+        assert capa_problem.compiled_problems.hits == 1
+        assert second.get_html() == first.get_html()
+        assert second.problem_data == first.problem_data
+        assert first.tree is not second.tree
+        assert second.tree.xpath('//additional_answer/@answer') == ['navy']
+
+    def test_problems_do_not_share_trees(self):
+        answers = new_loncapa_problem(self.xml).get_question_answers()
+        html_by_seed = {}
+        for seed in (1, 2, 3, 4, 5, 1):
+            problem = new_loncapa_problem(self.xml, seed=seed)
+            html = problem.get_html()
+            # shuffling with the same seed gives the same order
+            assert html_by_seed.setdefault(seed, html) == html
+            assert problem.get_question_answers() == answers
+        assert len(set(html_by_seed.values())) > 1
+
+    def test_ids_depend_on_problem_id(self):
+        first = new_loncapa_problem(self.xml, problem_id='first')
+        second = new_loncapa_problem(self.xml, problem_id='second')
+        assert 'first_2_1' in first.problem_data
+        assert 'second_2_1' in second.problem_data
+        assert capa_problem.compiled_problems.hits == 0
+
+    @override_settings(CAPA_COMPILED_PROBLEM_CACHE_SIZE=0)
+    def test_cache_disabled(self):
+        new_loncapa_problem(self.xml)
+        new_loncapa_problem(self.xml)
+        assert capa_problem.compiled_problems.hits == 0
+        assert capa_problem.compiled_problems.misses == 2
+
+    @override_settings(CAPA_COMPILED_PROBLEM_CACHE_SIZE=1)
+    def test_least_recently_used_problem_is_evicted(self):
+        new_loncapa_problem(self.xml, problem_id='first')
+        new_loncapa_problem(self.xml, problem_id='second')
+        new_loncapa_problem(self.xml, problem_id='first')
+        assert capa_problem.compiled_problems.hits == 0
+        new_loncapa_problem(self.xml, problem_id='first')
+        assert capa_problem.compiled_problems.hits == 1
@@ -22,6 +22,7 @@ from xmodule.modulestore.inheritance import InheritanceMixin, inheriting_field_d
 from xmodule.modulestore.split_mongo import BlockKey, CourseEnvelope
 from xmodule.modulestore.split_mongo.definition_lazy_loader import DefinitionLazyLoader
 from xmodule.modulestore.split_mongo.id_manager import SplitMongoIdManager
+from xmodule.modulestore.split_mongo.mongo_connection import iter_block_children
 from xmodule.modulestore.split_mongo.split_mongo_kvs import SplitMongoKVS
 from xmodule.util.misc import get_library_or_course_attribute
 from xmodule.x_module import XModuleMixin
@@ -86,8 +87,8 @@ class CachingDescriptorSystem(MakoDescriptorSystem, EditInfoRuntimeMixin):  # li
     @lazy
     def _parent_map(self):  # lint-amnesty, pylint: disable=missing-function-docstring
         parent_map = {}
-        for block_key, block in self.course_entry.structure['blocks'].items():
-            for child in block.fields.get('children', []):
+        for block_key, children in iter_block_children(self.course_entry.structure['blocks']):
+            for child in children:
                 parent_map[child] = block_key
         return parent_map
 
@@ -3,16 +3,22 @@ Segregation of pymongo functions from the data modeling mechanisms for split mod
 """
 
 
+import bz2
+import copy
 import datetime
+import hashlib
 import logging
+import lzma
 import math
 import pickle
 import re
 import zlib
+from collections.abc import MutableMapping
 from contextlib import contextmanager
 from time import time
 
 from ccx_keys.locator import CCXLocator
+from django.conf import settings
 from django.core.cache import caches, InvalidCacheBackendError
 from django.db.transaction import TransactionManagementError
 import pymongo
@@ -140,6 +146,129 @@ class QueryTimer:
 TIMER = QueryTimer(__name__, 0.01)
 
 
+class _MongoBlock:
+    """
+    A block of a structure as read from Mongo, not yet converted to BlockData.
+    """
+    __slots__ = ('doc', 'shared', '_children')
+
+    def __init__(self, doc):
+        self.doc = doc
+        # Whether the doc is shared by the block maps of several structures,
+        # in which case it must not be modified.
+        self.shared = False
+        # The children converted to BlockKeys, computed on first use. The doc
+        # is never modified while it is wrapped (BlockMap replaces the entry
+        # with a BlockData when the block is read), so the cache stays valid.
+        self._children = None
+
+    def children(self):
+        """
+        Returns the children of the block as BlockKeys.
+
+        The returned list is cached, and shared by the copies of the block map,
+        so it must not be modified.
+        """
+        if self._children is None:
+            self._children = [BlockKey(*child) for child in self.doc['fields'].get('children', [])]
+        return self._children
+
+    def to_block_data(self):
+        """
+        Converts the block to BlockData, which takes over the values of the doc
+        unless it is shared.
+        """
+        doc = copy.deepcopy(self.doc) if self.shared else dict(self.doc)
+        doc.pop('block_id')
+        if 'children' in doc['fields']:
+            doc['fields'] = dict(doc['fields'], children=list(self.children()))
+        return BlockData(**doc)
+
+
+class BlockMap(MutableMapping):
+    """
+    The 'blocks' of a structure read from Mongo: a map {BlockKey: BlockData}
+    which only converts blocks to BlockData when they are read.
+
+    Blocks that were never read keep their Mongo documents, which are shared
+    with the copies of the map (see version_structure) instead of being
+    deep-copied, and are written back to Mongo as is by structure_to_mongo.
+    Blocks that were read, and so may have been modified, are deep-copied and
+    converted back from BlockData like any other block.
+    """
+    def __init__(self, docs=()):
+        # {BlockKey: BlockData or _MongoBlock}, in the order of the Mongo document.
+        self._entries = {
+            BlockKey(doc['block_type'], doc['block_id']): _MongoBlock(doc)
+            for doc in docs
+        }
+
+    def __getitem__(self, block_key):
+        block = self._entries[block_key]
+        if isinstance(block, _MongoBlock):
+            block = self._entries[block_key] = block.to_block_data()
+        return block
+
+    def __setitem__(self, block_key, block):
+        self._entries[block_key] = block
+
+    def __delitem__(self, block_key):
+        del self._entries[block_key]
+
+    def __contains__(self, block_key):
+        return block_key in self._entries
+
+    def __iter__(self):
+        return iter(self._entries)
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __repr__(self):
+        return f'{self.__class__.__name__}({len(self)} blocks)'
+
+    def __deepcopy__(self, memo):
+        copied = self.__class__()
+        for block_key, block in self._entries.items():
+            if isinstance(block, _MongoBlock):
+                block.shared = True
+            else:
+                block = copy.deepcopy(block, memo)
+            copied._entries[block_key] = block  # pylint: disable=protected-access
+        return copied
+
+    def iter_children(self):
+        """
+        Yields (block_key, children) for each block, without converting
+        blocks to BlockData.
+        """
+        for block_key, block in self._entries.items():
+            if isinstance(block, _MongoBlock):
+                yield block_key, block.children()
+            else:
+                yield block_key, block.fields.get('children', [])
+
+    def mongo_doc(self, block_key):
+        """
+        Returns the Mongo document of the given block if it was never
+        converted to BlockData, or None.
+        """
+        block = self._entries[block_key]
+        return block.doc if isinstance(block, _MongoBlock) else None
+
+
+def iter_block_children(blocks):
+    """
+    Yields (block_key, children) for each block of the 'blocks' of a
+    structure, which may be a BlockMap or a plain dict of BlockData.
+    """
+    if isinstance(blocks, BlockMap):
+        yield from blocks.iter_children()
+    else:
+        for block_key, block in blocks.items():
+            yield block_key, block.fields.get('children', [])
+
+
 def structure_from_mongo(structure, course_context=None):
     """
     Converts the 'blocks' key from a list [block_data] to a map
@@ -148,6 +277,8 @@ def structure_from_mongo(structure, course_context=None):
     Converts 'blocks.*.fields.children' from [[block_type, block_id]] to [BlockKey].
     N.B. Does not convert any other ReferenceFields (because we don't know which fields they are at this level).
 
+    The blocks are only converted when they are read, see BlockMap.
+
     Arguments:
         structure: The document structure to convert
         course_context (CourseKey): For metrics gathering, the CourseKey
@@ -157,12 +288,7 @@ def structure_from_mongo(structure, course_context=None):
         tagger.measure('blocks', len(structure['blocks']))
 
         structure['root'] = BlockKey(*structure['root'])
-        new_blocks = {}
-        for block in structure['blocks']:
-            if 'children' in block['fields']:
-                block['fields']['children'] = [BlockKey(*child) for child in block['fields']['children']]
-            new_blocks[BlockKey(block['block_type'], block.pop('block_id'))] = BlockData(**block)
-        structure['blocks'] = new_blocks
+        structure['blocks'] = BlockMap(structure['blocks'])
 
         return structure
 
@@ -174,30 +300,61 @@ def structure_to_mongo(structure, course_context=None):
         and BlockKey.id as 'block_id'.
     Doesn't convert 'root', since namedtuple's can be inserted
         directly into mongo.
+
+    Blocks of a BlockMap that were never read are written from their
+    original Mongo documents.
     """
     with TIMER.timer('structure_to_mongo', course_context) as tagger:
-        tagger.measure('blocks', len(structure['blocks']))
+        blocks = structure['blocks']
+        tagger.measure('blocks', len(blocks))
 
         new_structure = dict(structure)
         new_structure['blocks'] = []
 
-        for block_key, block in structure['blocks'].items():
-            new_block = dict(block.to_storable())
-            new_block.setdefault('block_type', block_key.type)
-            new_block['block_id'] = block_key.id
+        converted = 0
+        for block_key in blocks:
+            new_block = blocks.mongo_doc(block_key) if isinstance(blocks, BlockMap) else None
+            if new_block is None:
+                converted += 1
+                new_block = dict(blocks[block_key].to_storable())
+                new_block.setdefault('block_type', block_key.type)
+                new_block['block_id'] = block_key.id
             new_structure['blocks'].append(new_block)
+        tagger.measure('converted_blocks', converted)
 
         return new_structure
 
 
+# Codecs that CourseStructureCache can compress structures with, by name.
+# zlib level 1 is the fastest, with slightly larger results.
+COURSE_STRUCTURE_CACHE_CODECS = {
+    'zlib': (lambda data: zlib.compress(data, 1), zlib.decompress),
+    'lzma': (lzma.compress, lzma.decompress),
+    'bz2': (bz2.compress, bz2.decompress),
+}
+
+# Largest value CourseStructureCache writes to a single cache key; larger
+# structures are split into chunks of at most this size.
+COURSE_STRUCTURE_CACHE_CHUNK_SIZE = 2 * 1024 * 1024
+
+
 class CourseStructureCache:
     """
     Wrapper around django cache object to cache course structure objects.
     The course structures are pickled and compressed when cached.
 
+    Compressed structures smaller than the chunk size are stored under their
+    key as is.  Larger ones are split into chunks stored under keys derived
+    from their content, and a manifest listing the chunks, the codec and a
+    digest of the compressed data is stored under the structure's key.  All
+    chunks are fetched with a single get_many, and the digest is checked
+    before the structure is used.
+
     If the 'course_structure_cache' doesn't exist, then don't do anything for
     for set and get.
     """
+    MANIFEST_VERSION = 1
+
     def __init__(self):
         self.cache = None
         try:
@@ -205,6 +362,37 @@ class CourseStructureCache:
         except InvalidCacheBackendError:
             pass
 
+    @staticmethod
+    def _codec():
+        """
+        Returns the name of the codec that structures are compressed with.
+        """
+        # .. setting_name: COURSE_STRUCTURE_CACHE_CODEC
+        # .. setting_default: 'zlib'
+        # .. setting_description: Codec used to compress split modulestore structures in the
+        #   course_structure_cache: 'zlib' (fastest), 'lzma' or 'bz2' (smaller, slower).
+        #   Cached structures record their codec, so it can be changed without clearing the cache.
+        return getattr(settings, 'COURSE_STRUCTURE_CACHE_CODEC', 'zlib')
+
+    @staticmethod
+    def _chunk_size():
+        """
+        Returns the largest value written to a single cache key.
+        """
+        # .. setting_name: COURSE_STRUCTURE_CACHE_CHUNK_SIZE
+        # .. setting_default: 2097152
+        # .. setting_description: Maximum size in bytes of a single value written to the
+        #   course_structure_cache.  Compressed structures larger than this are stored in
+        #   chunks of this size, so it must not exceed the item size limit of the cache backend.
+        return getattr(settings, 'COURSE_STRUCTURE_CACHE_CHUNK_SIZE', COURSE_STRUCTURE_CACHE_CHUNK_SIZE)
+
+    @staticmethod
+    def _chunk_key(chunk):
+        """
+        Returns the content-addressed cache key of a chunk of a structure.
+        """
+        return 'course_structure_chunk.' + hashlib.sha256(chunk).hexdigest()
+
     def get(self, key, course_context=None):
         """Pull the compressed, pickled struct data from cache and deserialize."""
         if self.cache is None:
@@ -212,17 +400,30 @@ class CourseStructureCache:
 
         with TIMER.timer("CourseStructureCache.get", course_context) as tagger:
             try:
-                compressed_pickled_data = self.cache.get(key)
-                tagger.tag(from_cache=str(compressed_pickled_data is not None).lower())
+                cached = self.cache.get(key)
+                tagger.tag(from_cache=str(cached is not None).lower())
 
-                if compressed_pickled_data is None:
+                if cached is None:
                     # Always log cache misses, because they are unexpected
                     tagger.sample_rate = 1
                     return None
 
+                if isinstance(cached, dict):
+                    compressed_pickled_data = self._read_chunks(cached, tagger)
+                    if compressed_pickled_data is None:
+                        # Some chunks were evicted; the structure has to be cached again.
+                        tagger.sample_rate = 1
+                        self.cache.delete(key)
+                        return None
+                    decompress = COURSE_STRUCTURE_CACHE_CODECS[cached['codec']][1]
+                else:
+                    # Structures stored under a single key are always zlib-compressed.
+                    compressed_pickled_data = cached
+                    decompress = zlib.decompress
+
                 tagger.measure('compressed_size', len(compressed_pickled_data))
 
-                pickled_data = zlib.decompress(compressed_pickled_data)
+                pickled_data = decompress(compressed_pickled_data)
                 tagger.measure('uncompressed_size', len(pickled_data))
 
                 return pickle.loads(pickled_data, encoding='latin-1')
@@ -232,6 +433,26 @@ class CourseStructureCache:
                 self.cache.delete(key)
                 return None
 
+    def _read_chunks(self, manifest, tagger):
+        """
+        Returns the compressed data of the structure described by the given
+        manifest, or None if any of its chunks is no longer cached.
+        """
+        if manifest.get('version') != self.MANIFEST_VERSION:
+            raise ValueError("Unknown manifest version {}".format(manifest.get('version')))
+
+        chunk_keys = manifest['chunks']
+        tagger.measure('chunks', len(chunk_keys))
+        chunks = self.cache.get_many(set(chunk_keys))
+        tagger.tag(chunks_from_cache=str(len(chunks) == len(set(chunk_keys))).lower())
+        if len(chunks) != len(set(chunk_keys)):
+            return None
+
+        compressed_pickled_data = b''.join(chunks[chunk_key] for chunk_key in chunk_keys)
+        if hashlib.sha256(compressed_pickled_data).hexdigest() != manifest['digest']:
+            raise ValueError("Digest mismatch")
+        return compressed_pickled_data
+
     def set(self, key, structure, course_context=None):
         """Given a structure, will pickle, compress, and write to cache."""
         if self.cache is None:
@@ -241,23 +462,43 @@ class CourseStructureCache:
             pickled_data = pickle.dumps(structure, 4)  # Protocol can't be incremented until cache is cleared
             tagger.measure('uncompressed_size', len(pickled_data))
 
-            # 1 = Fastest (slightly larger results)
-            compressed_pickled_data = zlib.compress(pickled_data, 1)
+            codec = self._codec()
+            compressed_pickled_data = COURSE_STRUCTURE_CACHE_CODECS[codec][0](pickled_data)
             data_size = len(compressed_pickled_data)
             tagger.measure('compressed_size', data_size)
 
             # We rely on the course structure cache default timeout, which should be
             # high by default (~ a few days).
-            total_bytes_in_one_mb = 1024 * 1024
-            if data_size < total_bytes_in_one_mb * 2:  # Only data with a size smaller than 2MB will be cached
+            chunk_size = self._chunk_size()
+            if codec == 'zlib' and data_size < chunk_size:
                 self.cache.set(key, compressed_pickled_data)
-            else:
-                chunk_size_in_mbs = round(data_size / total_bytes_in_one_mb, 2)
-
+                return
+
+            chunks = {}
+            chunk_keys = []
+            for offset in range(0, data_size, chunk_size):
+                chunk = compressed_pickled_data[offset:offset + chunk_size]
+                chunk_key = self._chunk_key(chunk)
+                chunks[chunk_key] = chunk
+                chunk_keys.append(chunk_key)
+            tagger.measure('chunks', len(chunk_keys))
+
+            # Chunks are written first, so that a cached manifest never lists
+            # chunks that weren't cached.
+            self.cache.set_many(chunks)
+            self.cache.set(key, {
+                'version': self.MANIFEST_VERSION,
+                'codec': codec,
+                'digest': hashlib.sha256(compressed_pickled_data).hexdigest(),
+                'chunks': chunk_keys,
+            })
+
+            if len(chunk_keys) > 1:
                 # .. custom_attribute_name: split_mongo_compressed_size_in_mbs
-                # .. custom_attribute_description: contains the data chunk size in MBs. The size on which
-                #   the memcached client failed to store value in course structure cache.
-                monitoring.set_custom_attribute('split_mongo_compressed_size_in_mbs', chunk_size_in_mbs)
+                # .. custom_attribute_description: contains the compressed size in MBs of a course
+                #   structure that was too large to be cached under a single key, and was cached
+                #   in chunks instead.
+                monitoring.set_custom_attribute('split_mongo_compressed_size_in_mbs', round(data_size / 1024 / 1024, 2))
 
 
 class MongoPersistenceBackend:
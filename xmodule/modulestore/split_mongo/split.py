@@ -100,7 +100,11 @@ from xmodule.modulestore.exceptions import (
     VersionConflictError
 )
 from xmodule.modulestore.split_mongo import CourseEnvelope
-from xmodule.modulestore.split_mongo.mongo_connection import DuplicateKeyError, DjangoFlexPersistenceBackend
+from xmodule.modulestore.split_mongo.mongo_connection import (
+    DjangoFlexPersistenceBackend,
+    DuplicateKeyError,
+    iter_block_children
+)
 from xmodule.modulestore.store_utilities import DETACHED_XBLOCK_TYPES
 from xmodule.partitions.partitions_service import PartitionService
 from xmodule.util.misc import get_library_or_course_attribute
@@ -1299,8 +1303,8 @@ class SplitMongoModuleStore(SplitBulkWriteMixin, ModuleStoreWriteBase):
         :return dict: a dictionary containing mapping of block_keys against their parents.
         """
         children_to_parents = defaultdict(list)
-        for parent_key, value in structure['blocks'].items():
-            for child_key in value.fields.get('children', []):
+        for parent_key, children in iter_block_children(structure['blocks']):
+            for child_key in children:
                 children_to_parents[child_key].append(parent_key)
 
         return children_to_parents
@@ -3072,8 +3076,8 @@ class SplitMongoModuleStore(SplitBulkWriteMixin, ModuleStoreWriteBase):
         """
         return [
             parent_block_key
-            for parent_block_key, value in structure['blocks'].items()
-            if block_key in value.fields.get('children', [])
+            for parent_block_key, children in iter_block_children(structure['blocks'])
+            if block_key in children
         ]
 
     def _sync_children(self, source_parent, destination_parent, new_child):
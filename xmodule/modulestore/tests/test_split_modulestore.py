@@ -15,6 +15,7 @@ import pytest
 import ddt
 from ccx_keys.locator import CCXBlockUsageLocator
 from django.core.cache import InvalidCacheBackendError, caches
+from django.test.utils import override_settings
 from opaque_keys.edx.locator import BlockUsageLocator, CourseKey, CourseLocator, LocalId
 from xblock.fields import Reference, ReferenceList, ReferenceValueDict
 
@@ -771,6 +772,7 @@ class SplitModuleCourseTests(SplitModuleTest):
         assert root_block_key.block_id == 'course'
 
 
+@ddt.ddt
 class TestCourseStructureCache(CacheIsolationMixin, SplitModuleTest):
     """Tests for the CourseStructureCache"""
 
@@ -842,23 +844,60 @@ class TestCourseStructureCache(CacheIsolationMixin, SplitModuleTest):
         assert cached_structure == not_cached_structure
 
     @patch('xmodule.modulestore.split_mongo.mongo_connection.monitoring.set_custom_attribute')
-    @patch('django.core.cache.cache.set')
     @patch('xmodule.modulestore.split_mongo.mongo_connection.get_cache')
-    def test_course_structure_cache_with_data_chunk_greater_than_two_mb(self, mock_get_cache, mock_set_cache,
+    def test_course_structure_cache_with_data_chunk_greater_than_two_mb(self, mock_get_cache,
                                                                         mock_set_custom_attribute):
         enabled_cache = caches['default']
         mock_get_cache.return_value = enabled_cache
 
         course_cache = CourseStructureCache()
 
-        size = 3000000000
-        # this data_chunk will be compressed before being cached
-        data_chunk = b'\x00' * size
+        # random data barely compresses, so this is stored in 3 chunks of 2MB
+        data_chunk = os.urandom(5 * 1024 * 1024)
 
         course_cache.set('my_data_chunk', data_chunk)
-        mock_set_cache.assert_not_called()
+        manifest = enabled_cache.get('my_data_chunk')
+        assert manifest['codec'] == 'zlib'
+        assert len(manifest['chunks']) == 3
         mock_set_custom_attribute.assert_called()
 
+        with patch.object(enabled_cache, 'get_many', wraps=enabled_cache.get_many) as mock_get_many:
+            assert course_cache.get('my_data_chunk') == data_chunk
+        mock_get_many.assert_called_once()
+
+    @patch('xmodule.modulestore.split_mongo.mongo_connection.get_cache')
+    def test_course_structure_cache_with_missing_or_corrupt_chunk(self, mock_get_cache):
+        enabled_cache = caches['default']
+        mock_get_cache.return_value = enabled_cache
+        course_cache = CourseStructureCache()
+        data_chunk = os.urandom(5 * 1024 * 1024)
+
+        course_cache.set('my_data_chunk', data_chunk)
+        chunk_keys = enabled_cache.get('my_data_chunk')['chunks']
+        enabled_cache.set(chunk_keys[1], b'bad_data')
+        assert course_cache.get('my_data_chunk') is None
+        assert enabled_cache.get('my_data_chunk') is None
+
+        course_cache.set('my_data_chunk', data_chunk)
+        enabled_cache.delete(chunk_keys[2])
+        assert course_cache.get('my_data_chunk') is None
+        assert enabled_cache.get('my_data_chunk') is None
+
+    @ddt.data('lzma', 'bz2')
+    @patch('xmodule.modulestore.split_mongo.mongo_connection.get_cache')
+    def test_course_structure_cache_codec(self, codec, mock_get_cache):
+        enabled_cache = caches['default']
+        mock_get_cache.return_value = enabled_cache
+        course_cache = CourseStructureCache()
+        structure = self._get_structure(self.new_course)
+
+        with override_settings(COURSE_STRUCTURE_CACHE_CODEC=codec):
+            course_cache.set('my_structure', structure)
+        assert enabled_cache.get('my_structure')['codec'] == codec
+
+        # The codec of cached structures is read from their manifest.
+        assert course_cache.get('my_structure') == structure
+
     @patch('xmodule.modulestore.split_mongo.mongo_connection.monitoring.set_custom_attribute')
     @patch('django.core.cache.cache.set')
     @patch('xmodule.modulestore.split_mongo.mongo_connection.get_cache')
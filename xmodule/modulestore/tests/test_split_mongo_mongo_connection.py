@@ -1,6 +1,7 @@
 """ Test the behavior of split_mongo/MongoPersistenceBackend """
 
 
+import copy
 import unittest
 from unittest.mock import patch
 
@@ -8,7 +9,14 @@ import pytest
 from pymongo.errors import ConnectionFailure
 
 from xmodule.exceptions import HeartbeatFailure
-from xmodule.modulestore.split_mongo.mongo_connection import MongoPersistenceBackend
+from xmodule.modulestore import BlockData
+from xmodule.modulestore.split_mongo import BlockKey
+from xmodule.modulestore.split_mongo.mongo_connection import (
+    MongoPersistenceBackend,
+    iter_block_children,
+    structure_from_mongo,
+    structure_to_mongo
+)
 
 
 class TestHeartbeatFailureException(unittest.TestCase):
@@ -24,3 +32,100 @@ class TestHeartbeatFailureException(unittest.TestCase):
 
             with pytest.raises(HeartbeatFailure):
                 useless_conn.heartbeat()
+
+
+class TestStructureConversion(unittest.TestCase):
+    """ Test converting structures from and to their Mongo documents """
+
+    def mongo_structure(self):
+        """
+        Returns the Mongo document of a structure with a course and two chapters.
+        """
+        def block(block_type, block_id, children=()):
+            fields = {'display_name': block_id}
+            if children:
+                fields['children'] = [list(child) for child in children]
+            return {
+                'block_type': block_type,
+                'block_id': block_id,
+                'definition': f'definition_{block_id}',
+                'defaults': {},
+                'asides': {},
+                'fields': fields,
+                'edit_info': {},
+            }
+
+        return {
+            '_id': 'structure',
+            'root': ['course', 'course'],
+            'blocks': [
+                block('course', 'course', [('chapter', 'one'), ('chapter', 'two')]),
+                block('chapter', 'one'),
+                block('chapter', 'two'),
+            ],
+        }
+
+    def test_blocks_are_converted_when_read(self):
+        structure = structure_from_mongo(self.mongo_structure())
+        blocks = structure['blocks']
+        assert structure['root'] == BlockKey('course', 'course')
+        assert list(blocks) == [BlockKey('course', 'course'), BlockKey('chapter', 'one'), BlockKey('chapter', 'two')]
+        assert BlockKey('chapter', 'one') in blocks
+        assert blocks.mongo_doc(BlockKey('course', 'course')) is not None
+
+        course = blocks[BlockKey('course', 'course')]
+        assert isinstance(course, BlockData)
+        assert course.fields['children'] == [BlockKey('chapter', 'one'), BlockKey('chapter', 'two')]
+        assert blocks.mongo_doc(BlockKey('course', 'course')) is None
+        assert blocks.mongo_doc(BlockKey('chapter', 'one')) is not None
+
+    def test_iter_block_children(self):
+        blocks = structure_from_mongo(self.mongo_structure())['blocks']
+        children = dict(iter_block_children(blocks))
+        assert children[BlockKey('course', 'course')] == [BlockKey('chapter', 'one'), BlockKey('chapter', 'two')]
+        assert children[BlockKey('chapter', 'one')] == []
+        # Reading children doesn't convert blocks.
+        assert all(blocks.mongo_doc(block_key) is not None for block_key in blocks)
+        assert dict(iter_block_children(dict(blocks.items()))) == children
+
+    def test_children_are_converted_once(self):
+        blocks = structure_from_mongo(self.mongo_structure())['blocks']
+        course_key = BlockKey('course', 'course')
+        children = dict(blocks.iter_children())[course_key]
+        assert dict(blocks.iter_children())[course_key] is children
+        # The block converted to BlockData gets its own list of children.
+        course = blocks[course_key]
+        course.fields['children'].append(BlockKey('chapter', 'three'))
+        assert children == [BlockKey('chapter', 'one'), BlockKey('chapter', 'two')]
+
+    def test_copies_share_unread_blocks(self):
+        structure = structure_from_mongo(self.mongo_structure())
+        original_course = structure['blocks'][BlockKey('course', 'course')]
+        new_structure = copy.deepcopy(structure)
+        new_blocks = new_structure['blocks']
+
+        assert new_blocks.mongo_doc(BlockKey('chapter', 'one')) is structure['blocks'].mongo_doc(
+            BlockKey('chapter', 'one')
+        )
+        # Blocks that were read are copied, since they may have been modified.
+        assert new_blocks[BlockKey('course', 'course')] is not original_course
+        assert new_blocks[BlockKey('course', 'course')] == original_course
+
+        # Modifying a shared block in one structure doesn't affect the other.
+        new_blocks[BlockKey('chapter', 'one')].fields['display_name'] = 'changed'
+        assert structure['blocks'][BlockKey('chapter', 'one')].fields['display_name'] == 'one'
+        assert new_structure == copy.deepcopy(new_structure)
+
+    def test_round_trip(self):
+        structure = structure_from_mongo(self.mongo_structure())
+        structure['blocks'][BlockKey('chapter', 'two')].fields['display_name'] = 'changed'
+        del structure['blocks'][BlockKey('chapter', 'one')]
+        structure['blocks'][BlockKey('chapter', 'one')] = BlockData(block_type='chapter', fields={})
+
+        mongo_structure = structure_to_mongo(structure)
+        expected = self.mongo_structure()
+        assert mongo_structure['blocks'][0] == expected['blocks'][0]
+        assert mongo_structure['blocks'][1]['block_id'] == 'two'
+        assert mongo_structure['blocks'][1]['fields'] == {'display_name': 'changed'}
+        assert mongo_structure['blocks'][2]['block_id'] == 'one'
+        assert structure_from_mongo(mongo_structure)['blocks'] == structure['blocks']
@@ -3,6 +3,7 @@ Tests for XML importer.
 """
 
 
+import hashlib
 import importlib
 import os
 import unittest
@@ -15,6 +16,7 @@ from path import Path as path
 from xblock.fields import List, Scope, ScopeIds, String
 from xblock.runtime import DictKeyValueStore, KvsFieldData, Runtime
 
+from xmodule.contentstore.content import StaticContent
 from xmodule.modulestore import ModuleStoreEnum
 from xmodule.modulestore.inheritance import InheritanceMixin
 from xmodule.modulestore.tests.mongo_connection import MONGO_HOST, MONGO_PORT_NUM
@@ -216,6 +218,7 @@ class StaticContentImporterTest(unittest.TestCase):  # lint-amnesty, pylint: dis
     def setUp(self):  # lint-amnesty, pylint: disable=super-method-not-called
         self.course_data_path = path('/path')
         self.mocked_content_store = mock.Mock()
+        self.mocked_content_store.get_all_content_for_course.return_value = ([], 0)
         self.static_content_importer = StaticContentImporter(
             static_content_store=self.mocked_content_store,
             course_data_path=self.course_data_path,
@@ -257,3 +260,32 @@ class StaticContentImporterTest(unittest.TestCase):  # lint-amnesty, pylint: dis
             )
             mock_file.assert_called_with(full_file_path, 'rb')
             self.mocked_content_store.generate_thumbnail.assert_called_once()
+
+    def test_import_unchanged_static_file(self):
+        base_dir = path('/path/to/dir')
+        full_file_path = os.path.join(base_dir, 'static/some_file.txt')
+        asset_key = StaticContent.compute_location(self.static_content_importer.target_id, 'static/some_file.txt')
+        self.mocked_content_store.get_all_content_for_course.return_value = ([{
+            'asset_key': asset_key,
+            'custom_md5': hashlib.md5(b"data").hexdigest(),
+            'displayname': 'some_file.txt',
+            'contentType': 'text/plain',
+            'import_path': 'static/some_file.txt',
+        }], 1)
+        with mock.patch(OPEN_BUILTIN, mock.mock_open(read_data=b"data")):
+            imported_file_attrs = self.static_content_importer.import_static_file(
+                full_file_path=full_file_path,
+                base_dir=base_dir
+            )
+        assert imported_file_attrs == ('static/some_file.txt', asset_key)
+        self.mocked_content_store.generate_thumbnail.assert_not_called()
+        self.mocked_content_store.save.assert_not_called()
+
+        # A changed file is saved again.
+        with mock.patch(OPEN_BUILTIN, mock.mock_open(read_data=b"new data")):
+            self.static_content_importer.import_static_file(
+                full_file_path=full_file_path,
+                base_dir=base_dir
+            )
+        self.mocked_content_store.save.assert_called_once()
+        self.mocked_content_store.get_all_content_for_course.assert_called_once()
@@ -21,12 +21,16 @@ Modulestore virtual   |          XML physical (draft, published)
              (a, b)   |  (a, b) | (x, b) | (x, x) | (x, y) | (a, x)
 """
 
+import hashlib
 import json
 import logging
 import mimetypes
 import os
 import re
+import time
 from abc import abstractmethod
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
 from datetime import datetime, timezone
 
 import xblock
@@ -64,6 +68,9 @@ log = logging.getLogger(__name__)
 
 DEFAULT_STATIC_CONTENT_SUBDIR = 'static'
 
+# Number of threads uploading the static files of a course to the contentstore.
+STATIC_CONTENT_IMPORT_WORKERS = 8
+
 
 class CourseImportException(Exception):
     """
@@ -121,10 +128,11 @@ class LocationMixin(XBlockMixin):
 
 
 class StaticContentImporter:  # lint-amnesty, pylint: disable=missing-class-docstring
-    def __init__(self, static_content_store, course_data_path, target_id):
+    def __init__(self, static_content_store, course_data_path, target_id, max_workers=STATIC_CONTENT_IMPORT_WORKERS):
         self.static_content_store = static_content_store
         self.target_id = target_id
         self.course_data_path = course_data_path
+        self.max_workers = max_workers
         try:
             with open(course_data_path / 'policies/assets.json') as f:
                 self.policy = json.load(f)
@@ -137,10 +145,21 @@ class StaticContentImporter:  # lint-amnesty, pylint: disable=missing-class-docs
         mimetypes.add_type('application/octet-stream', '.srt')
         self.mimetypes_list = list(mimetypes.types_map.values())
 
-    def import_static_content_directory(self, content_subdir=DEFAULT_STATIC_CONTENT_SUBDIR, verbose=False):  # lint-amnesty, pylint: disable=missing-function-docstring
+        # Map of the asset keys (as strings) of the assets the target already
+        # has to their contentstore attributes, fetched on first use.
+        self._existing_assets = None
+
+    def import_static_content_directory(self, content_subdir=DEFAULT_STATIC_CONTENT_SUBDIR, verbose=False):
+        """
+        Import all files of the given subdirectory of the course data into
+        the content store, uploading up to `max_workers` of them at once.
+
+        Returns a dict mapping the subpath of each imported file to its asset key.
+        """
         remap_dict = {}
 
         static_dir = self.course_data_path / content_subdir
+        file_paths = []
         for dirname, _, filenames in os.walk(static_dir):
             for filename in filenames:
 
@@ -151,18 +170,49 @@ class StaticContentImporter:  # lint-amnesty, pylint: disable=missing-class-docs
                         log.debug('skipping static content %s...', file_path)
                     continue
 
-                if verbose:
-                    log.debug('importing static content %s...', file_path)
+                file_paths.append(file_path)
+
+        def import_file(file_path):
+            if verbose:
+                log.debug('importing static content %s...', file_path)
+            return self.import_static_file(file_path, base_dir=static_dir)
 
-                imported_file_attrs = self.import_static_file(file_path, base_dir=static_dir)
+        if self.max_workers > 1 and len(file_paths) > 1:
+            # Fetch the existing assets once, before the threads need them.
+            self._fetch_existing_assets()
+            with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+                imported_files_attrs = list(executor.map(import_file, file_paths))
+        else:
+            imported_files_attrs = [import_file(file_path) for file_path in file_paths]
 
-                if imported_file_attrs:
-                    # store the remapping information which will be needed
-                    # to subsitute in the module data
-                    remap_dict[imported_file_attrs[0]] = imported_file_attrs[1]
+        for imported_file_attrs in imported_files_attrs:
+            if imported_file_attrs:
+                # store the remapping information which will be needed
+                # to subsitute in the module data
+                remap_dict[imported_file_attrs[0]] = imported_file_attrs[1]
 
         return remap_dict
 
+    def get_existing_asset(self, asset_key):
+        """
+        Returns the contentstore attributes of the asset of the target with
+        the given key, or None if the target has no such asset.
+        """
+        return self._fetch_existing_assets().get(str(asset_key))
+
+    def _fetch_existing_assets(self):
+        """
+        Returns the map of the assets the target already has, fetching them
+        from the content store on first use.
+        """
+        if self._existing_assets is None:
+            try:
+                assets, __ = self.static_content_store.get_all_content_for_course(self.target_id)
+            except NotImplementedError:
+                assets = []
+            self._existing_assets = {str(asset['asset_key']): asset for asset in assets}
+        return self._existing_assets
+
     def import_static_file(self, full_file_path, base_dir):  # lint-amnesty, pylint: disable=missing-function-docstring
         filename = os.path.basename(full_file_path)
         try:
@@ -195,6 +245,19 @@ class StaticContentImporter:  # lint-amnesty, pylint: disable=missing-class-docs
         # Check extracted contentType in list of all valid mimetypes
         if not mime_type or mime_type not in self.mimetypes_list:
             mime_type = mimetypes.guess_type(filename)[0]  # Assign guessed mimetype
+
+        # Re-importing a course mostly re-uploads the same files, which (and
+        # their thumbnails) the target already has.
+        existing_asset = self.get_existing_asset(asset_key)
+        if existing_asset and (
+            existing_asset.get('custom_md5') == hashlib.md5(data).hexdigest() and
+            existing_asset.get('displayname') == displayname and
+            existing_asset.get('locked', False) == locked and
+            existing_asset.get('contentType') == mime_type and
+            existing_asset.get('import_path') == file_subpath
+        ):
+            return file_subpath, asset_key
+
         content = StaticContent(
             asset_key, displayname, mime_type, data,
             import_path=file_subpath, locked=locked
@@ -208,6 +271,8 @@ class StaticContentImporter:  # lint-amnesty, pylint: disable=missing-class-docs
 
         # then commit the content
         try:
+            # The existing asset is replaced, so it can't match a later file with the same key.
+            self._fetch_existing_assets().pop(str(asset_key), None)
             self.static_content_store.save(content)
         except Exception as err:  # lint-amnesty, pylint: disable=broad-except
             msg = f'Error importing {file_subpath}, error={err}'
@@ -259,6 +324,10 @@ class ImportManager:
             create this file to implement custom logic in their course.
 
         default_class, load_error_blocks: are arguments for constructing the XMLModuleStore (see its doc)
+
+        stage_timings: If specified, a dict to which the number of seconds spent in each stage of the
+            import (parsing the xml, importing the static content, the asset metadata, the structure,
+            the drafts and the tags) is added, keyed by the name of the stage.
     """
     store_class = XMLModuleStore
 
@@ -270,7 +339,7 @@ class ImportManager:
             do_import_static=True, do_import_python_lib=True,
             create_if_not_present=False, raise_on_failure=False,
             static_content_subdir=DEFAULT_STATIC_CONTENT_SUBDIR,
-            python_lib_filename='python_lib.zip',
+            python_lib_filename='python_lib.zip', stage_timings=None,
     ):
         self.store = store
         self.user_id = user_id
@@ -286,17 +355,33 @@ class ImportManager:
         self.do_import_python_lib = do_import_python_lib
         self.create_if_not_present = create_if_not_present
         self.raise_on_failure = raise_on_failure
-        self.xml_module_store = self.store_class(
-            data_dir,
-            default_class=default_class,
-            source_dirs=source_dirs,
-            load_error_blocks=load_error_blocks,
-            xblock_mixins=store.xblock_mixins,
-            xblock_select=store.xblock_select,
-            target_course_id=target_id,
-        )
+        self.stage_timings = stage_timings if stage_timings is not None else {}
+        with self.timed_stage('parse'):
+            self.xml_module_store = self.store_class(
+                data_dir,
+                default_class=default_class,
+                source_dirs=source_dirs,
+                load_error_blocks=load_error_blocks,
+                xblock_mixins=store.xblock_mixins,
+                xblock_select=store.xblock_select,
+                target_course_id=target_id,
+            )
         self.logger, self.errors = make_error_tracker()
 
+    @contextmanager
+    def timed_stage(self, stage):
+        """
+        Adds the number of seconds spent in the block to the timing of the given stage.
+        """
+        start = time.monotonic()
+        try:
+            yield
+        finally:
+            elapsed = time.monotonic() - start
+            self.stage_timings[stage] = self.stage_timings.get(stage, 0) + elapsed
+            if self.verbose:
+                log.info(f'Course import {self.target_id}: {stage} stage took {elapsed:.2f}s')
+
     def preflight(self):
         """
         Perform any pre-import sanity checks.
@@ -570,27 +655,31 @@ class ImportManager:
             # This bulk operation wraps all the operations to populate the published branch.
             with self.store.bulk_operations(dest_id):
                 # Retrieve the course itself.
-                source_courselike, courselike, data_path = self.get_courselike(courselike_key, runtime, dest_id)
+                with self.timed_stage('structure'):
+                    source_courselike, courselike, data_path = self.get_courselike(courselike_key, runtime, dest_id)
 
                 # Import all static pieces.
-                self.import_static(data_path, dest_id)
+                with self.timed_stage('static_content'):
+                    self.import_static(data_path, dest_id)
 
                 # Import asset metadata stored in XML.
-                self.import_asset_metadata(data_path, dest_id)
+                with self.timed_stage('asset_metadata'):
+                    self.import_asset_metadata(data_path, dest_id)
 
                 # Import all children
-                self.import_children(source_courselike, courselike, courselike_key, dest_id)
+                with self.timed_stage('structure'):
+                    self.import_children(source_courselike, courselike, courselike_key, dest_id)
 
             # This bulk operation wraps all the operations to populate the draft branch with any items
             # from the /drafts subdirectory.
             # Drafts must be imported in a separate bulk operation from published items to import properly,
             # due to the recursive_build() above creating a draft item for each course block
             # and then publishing it.
-            with self.store.bulk_operations(dest_id):
+            with self.timed_stage('drafts'), self.store.bulk_operations(dest_id):
                 # Import all draft items into the courselike.
                 courselike = self.import_drafts(courselike, courselike_key, data_path, dest_id)
 
-            with self.store.bulk_operations(dest_id):
+            with self.timed_stage('tags'), self.store.bulk_operations(dest_id):
                 try:
                     self.import_tags(data_path, dest_id)
                 except FileNotFoundError: